@@ -0,0 +1,30 @@
+# Embedding/__init__.py
+# Public names resolve lazily (PEP 562): langchain_core.embeddings pulls in the
+# runnables stack, so it is imported only when an embedder is first used.
+
+from typing import TYPE_CHECKING
+
+from utils.lazy import lazy_exports
+
+_MODULES = {
+    ".fake": ("HashEmbeddings",),
+    ".cache": ("CachedEmbeddings", "VectorCache", "CacheStats"),
+    ".engine": ("EmbeddingEngine", "EngineStats", "make_batches", "approx_tokens"),
+}
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _MODULES)
+
+if TYPE_CHECKING:  # static analysers and IDEs see the eager imports
+    from .fake import HashEmbeddings
+    from .cache import CachedEmbeddings, VectorCache, CacheStats
+    from .engine import EmbeddingEngine, EngineStats, make_batches, approx_tokens
+
+__all__ = [
+    "HashEmbeddings",
+    "CachedEmbeddings",
+    "VectorCache",
+    "CacheStats",
+    "EmbeddingEngine",
+    "EngineStats",
+    "make_batches",
+    "approx_tokens",
+]
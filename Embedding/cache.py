@@ -0,0 +1,345 @@
+# Embedding/cache.py
+# Persistent embedding cache in front of any LangChain `Embeddings`.
+#
+# Layout of one cache namespace (one model + dimensions):
+#   <cache_dir>/<namespace>/vectors.f32   float32 [capacity, dim], memory-mapped
+#   <cache_dir>/<namespace>/index.json    digest -> [slot, last_used_tick] snapshot
+#   <cache_dir>/<namespace>/index.log     [digest, slot, tick] lines appended since the snapshot
+#
+# A put appends its entries to index.log (O(batch), not O(cache size)); the
+# snapshot is rewritten when the file grows, by flush(), and once the log is
+# longer than the index. Replaying the log in order is idempotent, so a crash
+# between snapshot and log truncation loses nothing.
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import hashlib
+import heapq
+import json
+import os
+import re
+import threading
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from utils import instrument
+
+INDEX_VERSION = 1
+_INITIAL_CAPACITY = 1024
+_MIN_LOG_LINES = 1024       # index.log lines tolerated before a snapshot (at least len(cache))
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class VectorCache:
+    """
+    Size-bounded on-disk store of float32 vectors addressed by a hex digest.
+
+    Vectors live in a memory-mapped array that grows by doubling up to
+    `max_entries`; beyond that the least-recently-used entries are evicted and
+    their slots reused. Not process-safe; thread-safe within one process.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.path = path
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._vec_path = os.path.join(path, "vectors.f32")
+        self._idx_path = os.path.join(path, "index.json")
+        self._log_path = os.path.join(path, "index.log")
+        self._log_lines = 0
+        self._dim: Optional[int] = None
+        self._capacity = 0
+        self._tick = 0
+        self._slots: Dict[str, List[int]] = {}   # digest -> [slot, last_used]
+        self._free: List[int] = []
+        self._mm: Optional[np.memmap] = None
+        os.makedirs(path, exist_ok=True)
+        self._open()
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def _open(self) -> None:
+        if not os.path.exists(self._idx_path) or not os.path.exists(self._vec_path):
+            return
+        try:
+            with open(self._idx_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return  # unreadable index -> behave as an empty cache
+        if data.get("version") != INDEX_VERSION:
+            return
+        self._dim = data["dim"]
+        self._capacity = data["capacity"]
+        self._tick = data["tick"]
+        self._slots = {k: list(v) for k, v in data["entries"].items()}
+        self._free = list(data.get("free", []))
+        self._mm = np.memmap(self._vec_path, dtype=np.float32, mode="r+", shape=(self._capacity, self._dim))
+        if self._replay_log():
+            used = {slot for slot, _ in self._slots.values()}
+            self._free = [slot for slot in range(self._capacity) if slot not in used]
+        # shrink an index written with a larger max_entries
+        if len(self._slots) > self.max_entries:
+            self._evict(len(self._slots) - self.max_entries)
+            self._flush_locked()
+
+    def _replay_log(self) -> bool:
+        """Apply index.log on top of the snapshot; stops at a torn last line. True if anything changed."""
+        if not os.path.exists(self._log_path):
+            return False
+        owner = {slot: digest for digest, (slot, _) in self._slots.items()}
+        changed = False
+        with open(self._log_path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    digest, slot, tick = json.loads(line)
+                except ValueError:
+                    break
+                if not 0 <= slot < self._capacity:
+                    continue
+                previous = owner.get(slot)
+                if previous is not None and previous != digest:
+                    del self._slots[previous]    # slot was reused after an eviction
+                old = self._slots.get(digest)
+                if old is not None and old[0] != slot:
+                    owner.pop(old[0], None)
+                self._slots[digest] = [slot, tick]
+                owner[slot] = digest
+                self._tick = max(self._tick, tick)
+                self._log_lines += 1
+                changed = True
+        return changed
+
+    def flush(self) -> None:
+        """Flush vectors and write the index atomically."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Write the index.json snapshot and start an empty log."""
+        if self._mm is None:
+            return
+        self._mm.flush()
+        tmp = f"{self._idx_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "dim": self._dim,
+                    "capacity": self._capacity,
+                    "tick": self._tick,
+                    "entries": self._slots,
+                    "free": self._free,
+                },
+                fh,
+            )
+        os.replace(tmp, self._idx_path)
+        if os.path.exists(self._log_path):
+            os.remove(self._log_path)
+        self._log_lines = 0
+
+    def _append_log(self, entries: Sequence[Tuple[str, List[int]]]) -> None:
+        self._mm.flush()    # vectors reach the file before the index points at them
+        with open(self._log_path, "a", encoding="utf-8") as fh:
+            fh.write("".join(json.dumps([d, slot, tick]) + "\n" for d, (slot, tick) in entries))
+        self._log_lines += len(entries)
+        if self._log_lines > max(_MIN_LOG_LINES, len(self._slots)):
+            self._flush_locked()
+
+    def _grow(self, needed: int, protect: Optional[set] = None) -> bool:
+        """
+        Make room for `needed` more live entries (grow file, then evict, never
+        a digest in `protect`). Returns True if the file grew.
+        """
+        live = len(self._slots)
+        grew = False
+        target = min(self.max_entries, live + needed)
+        if target > self._capacity:
+            new_cap = max(_INITIAL_CAPACITY, self._capacity)
+            while new_cap < target:
+                new_cap *= 2
+            new_cap = min(new_cap, self.max_entries)
+            if self._mm is not None:
+                self._mm.flush()
+                self._mm = None
+            with open(self._vec_path, "ab") as fh:
+                fh.truncate(new_cap * self._dim * 4)
+            self._free.extend(range(self._capacity, new_cap))
+            self._capacity = new_cap
+            self._mm = np.memmap(self._vec_path, dtype=np.float32, mode="r+", shape=(new_cap, self._dim))
+            grew = True
+        overflow = live + needed - self.max_entries
+        if overflow > 0:
+            self._evict(overflow, protect)
+        return grew
+
+    def _evict(self, n: int, protect: Optional[set] = None) -> None:
+        candidates = self._slots.items() if not protect else (kv for kv in self._slots.items() if kv[0] not in protect)
+        victims = heapq.nsmallest(n, candidates, key=lambda kv: kv[1][1])
+        for digest, (slot, _) in victims:
+            del self._slots[digest]
+            self._free.append(slot)
+        self.stats.evictions += len(victims)
+
+    # ----------------------------
+    # Access
+    # ----------------------------
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._slots
+
+    def get_many(self, digests: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Vectors for `digests` (copies), None where missing. Counts hits/misses."""
+        out: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for d in digests:
+                entry = self._slots.get(d)
+                if entry is None:
+                    self.stats.misses += 1
+                    out.append(None)
+                    continue
+                self._tick += 1
+                entry[1] = self._tick
+                self.stats.hits += 1
+                out.append(np.array(self._mm[entry[0]]))
+        return out
+
+    def put_many(self, items: Sequence[Tuple[str, Sequence[float]]]) -> None:
+        """Store (digest, vector) pairs and persist them (appended to index.log)."""
+        if not items:
+            return
+        with self._lock:
+            # dedupe by digest; a batch larger than the cache keeps its tail
+            unique = list(dict(items).items())[-self.max_entries:]
+            if self._dim is None:
+                self._dim = len(unique[0][1])
+            vectors = []
+            for _, v in unique:
+                vec = np.asarray(v, dtype=np.float32)
+                if vec.shape != (self._dim,):
+                    raise ValueError(f"Vector has dimension {vec.shape}, cache expects ({self._dim},)")
+                vectors.append(vec)
+            # digests of this batch already cached must survive the eviction below
+            batch = {d for d, _ in unique}
+            grew = self._grow(sum(1 for d in batch if d not in self._slots), protect=batch)
+            written = []
+            for (d, _), vec in zip(unique, vectors):
+                self._tick += 1
+                entry = self._slots.get(d)
+                if entry is None:
+                    entry = self._slots[d] = [self._free.pop(), self._tick]
+                entry[1] = self._tick
+                self._mm[entry[0]] = vec
+                written.append((d, entry))
+            if grew:
+                self._flush_locked()
+            else:
+                self._append_log(written)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots.clear()
+            self._free = list(range(self._capacity))
+            self._flush_locked()
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", text).strip("_") or "default"
+
+
+def _model_name(embeddings: Embeddings) -> str:
+    for attr in ("model", "model_name", "deployment"):
+        value = getattr(embeddings, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    return type(embeddings).__name__
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Caching wrapper for any LangChain `Embeddings`.
+
+    Keys are SHA-256 digests of (model name, dimensions, kind, text), so the
+    same text embedded by another model or at another size never collides.
+    Each model/dimension pair also gets its own store directory.
+
+    Example:
+        base = OpenAIEmbeddings(model="text-embedding-3-large", dimensions=1024)
+        embeddings = CachedEmbeddings(base, cache_dir=".embed_cache")
+        embeddings.embed_documents(texts)   # second run: no API calls
+        embeddings.stats                    # hits / misses / evictions
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        cache_dir: str = ".embed_cache",
+        max_entries: int = 100_000,
+        model_name: Optional[str] = None,
+        dimensions: Optional[int] = None,
+        cache_queries: bool = True,
+    ):
+        self.underlying = underlying
+        self.model_name = model_name or _model_name(underlying)
+        self.dimensions = dimensions if dimensions is not None else getattr(underlying, "dimensions", None)
+        self.cache_queries = cache_queries
+        namespace = _slug(f"{self.model_name}-{self.dimensions or 'native'}")
+        self.store = VectorCache(os.path.join(cache_dir, namespace), max_entries=max_entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.store.stats
+
+    def _digest(self, text: str, kind: str) -> str:
+        h = hashlib.sha256()
+        for part in (self.model_name, str(self.dimensions), kind, text):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        digests = [self._digest(t, "doc") for t in texts]
+        cached = self.store.get_many(digests)
+        # embed each distinct missing text once
+        missing: Dict[str, str] = {}
+        for d, t, v in zip(digests, texts, cached):
+            if v is None:
+                missing.setdefault(d, t)
+        fresh: Dict[str, List[float]] = {}
+        instrument.count("embed.cache.misses", len(missing))
+        instrument.count("embed.cache.hits", len(texts) - sum(v is None for v in cached))
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            self.store.put_many(list(fresh.items()))
+        return [v.tolist() if v is not None else list(fresh[d]) for d, v in zip(digests, cached)]
+
+    def embed_query(self, text: str) -> List[float]:
+        if not self.cache_queries:
+            return self.underlying.embed_query(text)
+        digest = self._digest(text, "query")
+        hit = self.store.get_many([digest])[0]
+        if hit is not None:
+            return hit.tolist()
+        vector = self.underlying.embed_query(text)
+        self.store.put_many([(digest, vector)])
+        return list(vector)
@@ -0,0 +1,246 @@
+# Embedding/engine.py
+# Dynamic batching + concurrent embedding engine.
+#
+# - groups texts into batches bounded by count and (approximate) tokens
+# - runs batches on a thread pool with a concurrency limit
+# - retries failed batches with exponential backoff and jitter
+# - optionally coalesces concurrent embed_query() calls (identical queries
+#   share one call; micro-batches for symmetric models)
+# - tracks throughput (texts/s, tokens/s)
+
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import random
+import threading
+import time
+
+from langchain_core.embeddings import Embeddings
+
+from utils import instrument
+
+
+def approx_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English)."""
+    return len(text) // 4 + 1
+
+
+def make_batches(
+    texts: Sequence[str],
+    max_batch_texts: int = 64,
+    max_batch_tokens: int = 8000,
+    token_counter: Callable[[str], int] = approx_tokens,
+) -> List[Tuple[int, int]]:
+    """
+    Greedy, order-preserving batching. Returns [start, end) index ranges such
+    that each batch has at most `max_batch_texts` texts and at most
+    `max_batch_tokens` tokens (a single oversized text gets its own batch).
+    """
+    batches: List[Tuple[int, int]] = []
+    start, tokens = 0, 0
+    for i, text in enumerate(texts):
+        n = token_counter(text)
+        if i > start and (i - start >= max_batch_texts or tokens + n > max_batch_tokens):
+            batches.append((start, i))
+            start, tokens = i, 0
+        tokens += n
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
+
+@dataclass
+class EngineStats:
+    texts: int = 0
+    tokens: int = 0
+    batches: int = 0
+    retries: int = 0
+    failures: int = 0
+    coalesced: int = 0     # embed_query() calls answered by an identical query in the same window
+    seconds: float = 0.0   # wall time spent inside engine calls
+
+    @property
+    def texts_per_s(self) -> float:
+        return self.texts / self.seconds if self.seconds else 0.0
+
+    @property
+    def tokens_per_s(self) -> float:
+        return self.tokens / self.seconds if self.seconds else 0.0
+
+
+class EmbeddingEngine(Embeddings):
+    """
+    Wrap any LangChain `Embeddings` with batching, concurrency, retries and
+    query coalescing. It is itself an `Embeddings`, so it can be stacked with
+    CachedEmbeddings (cache outside, engine inside avoids sending hits at all):
+
+        engine = EmbeddingEngine(OpenAIEmbeddings(...), concurrency=4)
+        embeddings = CachedEmbeddings(engine, model_name="text-embedding-3-large")
+
+    With coalesce_window > 0 (off by default: it adds that delay to every
+    query), concurrent embed_query() calls arriving within the window are
+    flushed together. Identical texts share one underlying call (e.g. many
+    users asking the same question at once); distinct texts each still go
+    through the underlying `embed_query`, side by side on the pool, so
+    without duplicates the window only adds latency. Only with
+    coalesce_as_documents=True are distinct texts sent as one
+    `embed_documents` micro-batch -- use that for symmetric models only,
+    since asymmetric ones (E5, nomic, Cohere input types) embed queries and
+    documents differently.
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        max_batch_texts: int = 64,
+        max_batch_tokens: int = 8000,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+        coalesce_window: float = 0.0,
+        coalesce_as_documents: bool = False,
+        token_counter: Callable[[str], int] = approx_tokens,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.underlying = underlying
+        self.max_batch_texts = max_batch_texts
+        self.max_batch_tokens = max_batch_tokens
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+        self.coalesce_window = coalesce_window
+        self.coalesce_as_documents = coalesce_as_documents
+        self.token_counter = token_counter
+        self.stats = EngineStats()
+        self._stats_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="embed")
+        self._pending: List[Tuple[str, Future]] = []
+        self._pending_lock = threading.Lock()
+
+    # Forward identity so CachedEmbeddings keys on the real model
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self.underlying, "model", None) or getattr(self.underlying, "model_name", None)
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        return getattr(self.underlying, "dimensions", None)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ----------------------------
+    # Internals
+    # ----------------------------
+    def _with_retry(self, fn: Callable, *args):
+        attempt = 0
+        while True:
+            try:
+                return fn(*args)
+            except self.retry_on:
+                if attempt >= self.max_retries:
+                    with self._stats_lock:
+                        self.stats.failures += 1
+                    raise
+                delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+                time.sleep(delay * (0.5 + random.random() / 2))  # jitter
+                attempt += 1
+                with self._stats_lock:
+                    self.stats.retries += 1
+                instrument.count("embed.engine.retries")
+
+    def _record(self, texts: Sequence[str], batches: int, seconds: float) -> None:
+        tokens = sum(self.token_counter(t) for t in texts)
+        with self._stats_lock:
+            self.stats.texts += len(texts)
+            self.stats.tokens += tokens
+            self.stats.batches += batches
+            self.stats.seconds += seconds
+        instrument.count("embed.engine.texts", len(texts))
+        instrument.count("embed.engine.batches", batches)
+
+    # ----------------------------
+    # Embeddings interface
+    # ----------------------------
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        start = time.perf_counter()
+        ranges = make_batches(texts, self.max_batch_texts, self.max_batch_tokens, self.token_counter)
+        futures = [
+            self._pool.submit(self._with_retry, self.underlying.embed_documents, list(texts[a:b]))
+            for a, b in ranges
+        ]
+        out: List[List[float]] = []
+        for fut in futures:  # ordered by batch -> output order matches input
+            out.extend(fut.result())
+        self._record(texts, len(ranges), time.perf_counter() - start)
+        return out
+
+    def _embed_query(self, text: str) -> List[float]:
+        start = time.perf_counter()
+        vector = self._with_retry(self.underlying.embed_query, text)
+        self._record([text], 1, time.perf_counter() - start)
+        return vector
+
+    def embed_query(self, text: str) -> List[float]:
+        if self.coalesce_window <= 0:
+            return self._embed_query(text)
+
+        fut: Future = Future()
+        with self._pending_lock:
+            self._pending.append((text, fut))
+            leader = len(self._pending) == 1
+        if leader:
+            # First caller in the window waits briefly, then flushes everyone queued
+            time.sleep(self.coalesce_window)
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            self._flush_queries(batch)
+        return fut.result()
+
+    def _flush_queries(self, batch: List[Tuple[str, Future]]) -> None:
+        waiters: Dict[str, List[Future]] = {}
+        for text, fut in batch:
+            waiters.setdefault(text, []).append(fut)
+        texts = list(waiters)
+        if len(batch) > len(texts):
+            with self._stats_lock:
+                self.stats.coalesced += len(batch) - len(texts)
+            instrument.count("embed.engine.coalesced", len(batch) - len(texts))
+
+        def settle(text: str, vector=None, exc: Optional[BaseException] = None) -> None:
+            for fut in waiters[text]:
+                if exc is None:
+                    fut.set_result(list(vector))   # each caller gets its own list
+                else:
+                    fut.set_exception(exc)
+
+        if len(texts) > 1 and self.coalesce_as_documents:
+            try:
+                vectors = self.embed_documents(texts)
+            except BaseException as exc:
+                for text in texts:
+                    settle(text, exc=exc)
+                return
+            for text, vec in zip(texts, vectors):
+                settle(text, vec)
+            return
+        # query semantics: one underlying embed_query per distinct text, run concurrently
+        jobs = [self._pool.submit(self._embed_query, text) for text in texts]
+        for text, job in zip(texts, jobs):
+            exc = job.exception()
+            settle(text, None if exc is not None else job.result(), exc)
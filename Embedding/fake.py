@@ -0,0 +1,48 @@
+# Embedding/fake.py
+# Deterministic, offline stand-in embedder (feature hashing).
+# Useful for tests, benchmarks and running the pipeline without API keys.
+
+from __future__ import annotations
+from typing import List
+
+import hashlib
+import re
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class HashEmbeddings(Embeddings):
+    """
+    Hash word unigrams and bigrams into a fixed-size, L2-normalized vector.
+
+    Same text -> same vector on every machine and run, and texts sharing words
+    land close together, so similarity search behaves sensibly in tests.
+    """
+
+    def __init__(self, dimensions: int = 256, model: str = "hash-embedding"):
+        if dimensions < 8:
+            raise ValueError("dimensions must be >= 8")
+        self.dimensions = dimensions
+        self.model = model
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dimensions, dtype=np.float32)
+        words = _TOKEN_RE.findall(text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for feat in features:
+            h = int.from_bytes(hashlib.blake2b(feat.encode("utf-8"), digest_size=8).digest(), "little")
+            vec[h % self.dimensions] += 1.0 if (h >> 63) & 1 else -1.0
+        norm = float(np.linalg.norm(vec))
+        if norm == 0.0:
+            vec[0] = 1.0  # empty / punctuation-only text: fixed unit vector
+            return vec
+        return vec / norm
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._vector(t).tolist() for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text).tolist()
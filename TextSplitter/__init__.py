@@ -1,21 +1,84 @@
 # textSplitter/__init__.py
-from .splitters import (
-    SplitConfig,
-    split_documents_recursive,
-    split_text_character,
-    split_text_by_tokens,
-    split_markdown,
-    split_code,
-    split_pdf,
-    split_html_from_url,
-    split_json_obj,
-    split_json_from_url,
-    split_auto,
-)
-from langchain_text_splitters import Language  # re-export for convenience
+# Public names resolve lazily (PEP 562): langchain_text_splitters, numpy and
+# the span engine are imported on first use of a name that needs them.
+
+from typing import TYPE_CHECKING
+
+from utils.lazy import lazy_exports
+
+_MODULES = {
+    ".splitters": (
+        "SplitConfig",
+        "SPLIT_ENGINES",
+        "split_documents_recursive",
+        "split_text_character",
+        "split_text_by_tokens",
+        "split_markdown",
+        "split_code",
+        "split_pdf",
+        "split_html_from_url",
+        "split_json_obj",
+        "split_json_from_url",
+        "split_auto",
+        "iter_chunks",
+        "iter_batches",
+    ),
+    ".registry": (
+        "recursive_splitter",
+        "splitter_for",
+        "span_splitter",
+        "character_splitter",
+        "token_splitter",
+        "code_splitter",
+        "markdown_splitter",
+        "html_header_splitter",
+        "json_splitter",
+        "registry_size",
+        "clear_registry",
+    ),
+    ".spans": ("TextSpan", "SpanSplitter", "RecursiveSpanSplitter", "CharacterSpanSplitter"),
+    ".dedup": ("NearDuplicateFilter", "DedupStats", "dedup_chunks"),
+    "langchain_text_splitters": ("Language",),
+}
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _MODULES)
+
+if TYPE_CHECKING:  # static analysers and IDEs see the eager imports
+    from .splitters import (
+        SplitConfig,
+        SPLIT_ENGINES,
+        split_documents_recursive,
+        split_text_character,
+        split_text_by_tokens,
+        split_markdown,
+        split_code,
+        split_pdf,
+        split_html_from_url,
+        split_json_obj,
+        split_json_from_url,
+        split_auto,
+        iter_chunks,
+        iter_batches,
+    )
+    from .registry import (
+        recursive_splitter,
+        splitter_for,
+        span_splitter,
+        character_splitter,
+        token_splitter,
+        code_splitter,
+        markdown_splitter,
+        html_header_splitter,
+        json_splitter,
+        registry_size,
+        clear_registry,
+    )
+    from .spans import TextSpan, SpanSplitter, RecursiveSpanSplitter, CharacterSpanSplitter
+    from .dedup import NearDuplicateFilter, DedupStats, dedup_chunks
+    from langchain_text_splitters import Language  # re-export for convenience
 
 __all__ = [
     "SplitConfig",
+    "SPLIT_ENGINES",
     "split_documents_recursive",
     "split_text_character",
     "split_text_by_tokens",
@@ -26,5 +89,25 @@ __all__ = [
     "split_json_obj",
     "split_json_from_url",
     "split_auto",
+    "iter_chunks",
+    "iter_batches",
+    "recursive_splitter",
+    "splitter_for",
+    "span_splitter",
+    "character_splitter",
+    "token_splitter",
+    "code_splitter",
+    "markdown_splitter",
+    "html_header_splitter",
+    "json_splitter",
+    "registry_size",
+    "clear_registry",
+    "TextSpan",
+    "SpanSplitter",
+    "RecursiveSpanSplitter",
+    "CharacterSpanSplitter",
+    "NearDuplicateFilter",
+    "DedupStats",
+    "dedup_chunks",
     "Language",
 ]
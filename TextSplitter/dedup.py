@@ -0,0 +1,236 @@
+# textSplitter/dedup.py
+"""
+Near-duplicate chunk elimination between splitting and embedding.
+
+Boilerplate PDF headers, repeated CSV rows and the same page fetched under
+several URLs all split into (nearly) identical chunks, and each copy costs an
+embedding and an index row. `NearDuplicateFilter` keeps the first chunk of
+every near-duplicate group and drops the rest:
+
+- exact duplicates (after case/whitespace normalisation) by content hash
+- near duplicates by MinHash over character shingles, with LSH banding so a
+  chunk is only compared with the few earlier chunks sharing a band
+
+In "merge" mode the kept chunk records what it stands for in its metadata
+(`duplicates`: count, `duplicate_sources`: other sources, `duplicate_ids`:
+ids of the dropped chunks). `stats.embeddings_avoided` is the number of
+chunks that will not be embedded.
+
+    chunks, stats = dedup_chunks(chunks, threshold=0.9)
+    print(stats.embeddings_avoided)
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import hashlib
+
+import numpy as np
+
+from utils import instrument
+
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE = 5
+DEDUP_MODES = ("merge", "drop")
+
+_BASE = np.uint64(1099511628211)     # FNV prime, multiplier of the rolling shingle hash
+_SHIFT = np.uint64(32)
+_MAX = np.uint64((1 << 32) - 1)
+_BLOCK = 4096                        # shingles per block when computing signatures
+
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows == num_perm whose S-curve threshold
+    (1/bands) ** (1/rows) is the highest one not above `threshold`, so pairs
+    at the threshold are candidates with high probability; candidates are then
+    verified on the full signature.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1.0 / bands) ** (1.0 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+@dataclass
+class DedupStats:
+    seen: int = 0
+    kept: int = 0
+    exact: int = 0       # dropped: identical after normalisation
+    near: int = 0        # dropped: estimated Jaccard >= threshold
+
+    @property
+    def dropped(self) -> int:
+        return self.exact + self.near
+
+    @property
+    def embeddings_avoided(self) -> int:
+        return self.dropped
+
+    @property
+    def drop_rate(self) -> float:
+        return self.dropped / self.seen if self.seen else 0.0
+
+
+class NearDuplicateFilter:
+    """
+    Streaming MinHash-LSH deduplicator; state persists across calls, so the
+    same instance can filter several batches (or sources) against each other.
+
+    Parameters
+    ----------
+    threshold : float
+        Estimated Jaccard similarity of character shingles at or above which a
+        chunk counts as a duplicate of an earlier kept chunk.
+    num_perm : int
+        MinHash permutations (signature length).
+    shingle_size : int
+        Characters per shingle.
+    mode : str
+        "merge": record dropped chunks' provenance on the kept chunk;
+        "drop": just drop them.
+    min_chars : int
+        Chunks shorter than this (normalised) are only checked for exact
+        duplicates; MinHash on a handful of shingles is too noisy.
+    seed : int
+        Seed of the permutation coefficients (signatures are deterministic).
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE,
+        mode: str = "merge",
+        min_chars: int = 32,
+        seed: int = 1,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode {mode!r}; expected one of {DEDUP_MODES}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.mode = mode
+        self.min_chars = min_chars
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        # multiply-shift hashes h(x) = (a*x + b) mod 2**64 >> 32, a odd: no modulo in the hot loop
+        rng = np.random.default_rng(seed)
+        self._a = (rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1))[:, None]
+        self._b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)[:, None]
+        self._exact: Dict[str, object] = {}
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._signatures: List[np.ndarray] = []
+        self._kept: List[object] = []
+        self.stats = DedupStats()
+
+    # ----------------------------
+    # Signatures
+    # ----------------------------
+    def _shingles(self, norm: str) -> np.ndarray:
+        data = np.frombuffer(norm.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+        k = min(self.shingle_size, data.size)
+        n = data.size - k + 1
+        h = np.zeros(n, dtype=np.uint64)
+        for j in range(k):
+            h = h * _BASE + data[j:j + n]
+        return np.unique(h)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature (num_perm uint64 values) of a text's shingle set."""
+        shingles = self._shingles(normalize(text) or " ")
+        sig = np.full(self.num_perm, _MAX, dtype=np.uint64)
+        for i in range(0, shingles.size, _BLOCK):
+            block = shingles[i:i + _BLOCK][None, :]
+            np.minimum(sig, ((self._a * block + self._b) >> _SHIFT).min(axis=1), out=sig)
+        return sig
+
+    # ----------------------------
+    # Filtering
+    # ----------------------------
+    def _near_match(self, sig: np.ndarray) -> Tuple[Optional[int], List[bytes]]:
+        keys = [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+        checked = set()
+        for band, key in zip(self._buckets, keys):
+            for idx in band.get(key, ()):
+                if idx in checked:
+                    continue
+                checked.add(idx)
+                if np.count_nonzero(self._signatures[idx] == sig) >= self.threshold * self.num_perm:
+                    return idx, keys
+        return None, keys
+
+    def _merge(self, kept, dup) -> None:
+        if self.mode != "merge":
+            return
+        meta = kept.metadata
+        meta["duplicates"] = meta.get("duplicates", 0) + 1
+        source = dup.metadata.get("source")
+        if source is not None and source != meta.get("source"):
+            sources = meta.setdefault("duplicate_sources", [])
+            if source not in sources:
+                sources.append(source)
+        if getattr(dup, "id", None):
+            meta.setdefault("duplicate_ids", []).append(dup.id)
+
+    def is_duplicate(self, doc) -> bool:
+        """Check `doc` against the chunks kept so far; if it is new, keep (index) it."""
+        self.stats.seen += 1
+        norm = normalize(doc.page_content)
+        digest = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+        first = self._exact.get(digest)
+        if first is not None:
+            self.stats.exact += 1
+            self._merge(first, doc)
+            return True
+        if len(norm) >= self.min_chars:
+            sig = self.signature(norm)
+            idx, keys = self._near_match(sig)
+            if idx is not None:
+                self.stats.near += 1
+                self._merge(self._kept[idx], doc)
+                return True
+            idx = len(self._signatures)
+            self._signatures.append(sig)
+            self._kept.append(doc)
+            for band, key in zip(self._buckets, keys):
+                band.setdefault(key, []).append(idx)
+        self._exact[digest] = doc
+        self.stats.kept += 1
+        return False
+
+    def iter_filter(self, docs: Iterable) -> Iterator:
+        """
+        Yield the chunks that are not duplicates, in order. In "merge" mode a
+        kept chunk's metadata is updated in place when later duplicates of it
+        arrive, which may be after it was yielded.
+        """
+        before = self.stats.dropped
+        try:
+            for doc in docs:
+                if not self.is_duplicate(doc):
+                    yield doc
+        finally:
+            instrument.count("dedup.dropped", self.stats.dropped - before)
+
+    @instrument.timed("split.dedup")
+    def filter(self, docs: Iterable) -> List:
+        return list(self.iter_filter(docs))
+
+
+def dedup_chunks(docs: Iterable, threshold: float = DEFAULT_THRESHOLD, **kwargs) -> Tuple[List, DedupStats]:
+    """Drop near-duplicate chunks (see NearDuplicateFilter); returns (kept chunks, stats)."""
+    flt = NearDuplicateFilter(threshold, **kwargs)
+    kept = flt.filter(docs)
+    return kept, flt.stats
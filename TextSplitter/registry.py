@@ -0,0 +1,176 @@
+# TextSplitter/registry.py
+"""
+Shared, reusable splitter instances keyed by configuration.
+
+Building a LangChain splitter is not free: TokenTextSplitter loads a tiktoken
+encoding and `from_language` rebuilds its separator table. When thousands of
+small documents are split, that setup dominates. The factories below build
+each distinct configuration once and hand the same instance to every caller.
+
+Splitters are never mutated after construction and their split methods keep
+no per-call state on the instance, so one instance is safe to share across
+threads. Creation is guarded by a lock so a configuration is built only once.
+
+langchain_text_splitters (and the numpy-based span engine) are imported by
+the factories, not at module import, so merely importing TextSplitter stays
+cheap.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Sequence, Tuple, Union
+
+import threading
+
+if TYPE_CHECKING:
+    from langchain_text_splitters import (
+        RecursiveCharacterTextSplitter,
+        CharacterTextSplitter,
+        TokenTextSplitter,
+        MarkdownHeaderTextSplitter,
+        HTMLHeaderTextSplitter,
+        RecursiveJsonSplitter,
+        Language,
+    )
+    from .spans import RecursiveSpanSplitter, CharacterSpanSplitter
+
+DEFAULT_ENCODING = "gpt2"   # TokenTextSplitter's own default
+
+_lock = threading.Lock()
+_instances: Dict[Hashable, Any] = {}
+
+
+def _get(key: Hashable, factory: Callable[[], Any]) -> Any:
+    inst = _instances.get(key)
+    if inst is None:
+        with _lock:
+            inst = _instances.get(key)
+            if inst is None:
+                inst = factory()
+                _instances[key] = inst
+    return inst
+
+
+def _lc(name: str) -> Any:
+    """A class from langchain_text_splitters, imported on first use."""
+    import langchain_text_splitters
+    return getattr(langchain_text_splitters, name)
+
+
+def _spans(name: str) -> Any:
+    """A span-engine class (numpy), imported on first use."""
+    from . import spans
+    return getattr(spans, name)
+
+
+def _headers_key(headers: Sequence[Tuple[str, str]]) -> Tuple[Tuple[str, str], ...]:
+    return tuple((str(tag), str(name)) for tag, name in headers)
+
+
+# ------------------------------
+# Factories
+# ------------------------------
+def recursive_splitter(
+    chunk_size: int,
+    chunk_overlap: int,
+    add_start_index: bool = False,
+) -> RecursiveCharacterTextSplitter:
+    return _get(
+        ("recursive", chunk_size, chunk_overlap, add_start_index),
+        lambda: _lc("RecursiveCharacterTextSplitter")(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap, add_start_index=add_start_index
+        ),
+    )
+
+
+def span_splitter(
+    chunk_size: int,
+    chunk_overlap: int,
+    add_start_index: bool = False,
+) -> RecursiveSpanSplitter:
+    """Span-engine equivalent of recursive_splitter (see TextSplitter.spans)."""
+    return _get(
+        ("span", chunk_size, chunk_overlap, add_start_index),
+        lambda: _spans("RecursiveSpanSplitter")(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap, add_start_index=add_start_index
+        ),
+    )
+
+
+def splitter_for(cfg) -> Union[RecursiveCharacterTextSplitter, RecursiveSpanSplitter]:
+    """Recursive splitter for a SplitConfig (its `engine` picks LangChain or the span engine)."""
+    if getattr(cfg, "engine", "langchain") == "span":
+        return span_splitter(cfg.chunk_size, cfg.chunk_overlap, cfg.add_start_index)
+    return recursive_splitter(cfg.chunk_size, cfg.chunk_overlap, cfg.add_start_index)
+
+
+def character_splitter(
+    separator: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    engine: str = "langchain",
+) -> Union[CharacterTextSplitter, CharacterSpanSplitter]:
+    if engine == "span":
+        return _get(
+            ("character-span", separator, chunk_size, chunk_overlap),
+            lambda: _spans("CharacterSpanSplitter")(
+                separator=separator, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            ),
+        )
+    return _get(
+        ("character", separator, chunk_size, chunk_overlap),
+        lambda: _lc("CharacterTextSplitter")(
+            separator=separator, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        ),
+    )
+
+
+def token_splitter(
+    chunk_size: int,
+    chunk_overlap: int,
+    encoding_name: Optional[str] = None,
+) -> TokenTextSplitter:
+    """Token splitter; the tiktoken encoding is loaded once per encoding name."""
+    encoding_name = encoding_name or DEFAULT_ENCODING
+    return _get(
+        ("token", encoding_name, chunk_size, chunk_overlap),
+        lambda: _lc("TokenTextSplitter")(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap, encoding_name=encoding_name
+        ),
+    )
+
+
+def code_splitter(language: Language, chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    return _get(
+        ("code", language, chunk_size, chunk_overlap),
+        lambda: _lc("RecursiveCharacterTextSplitter").from_language(
+            language=language, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        ),
+    )
+
+
+def markdown_splitter(headers_to_split_on: Sequence[Tuple[str, str]]) -> MarkdownHeaderTextSplitter:
+    headers = _headers_key(headers_to_split_on)
+    return _get(("markdown", headers), lambda: _lc("MarkdownHeaderTextSplitter")(headers_to_split_on=list(headers)))
+
+
+def html_header_splitter(headers_to_split_on: Sequence[Tuple[str, str]]) -> HTMLHeaderTextSplitter:
+    headers = _headers_key(headers_to_split_on)
+    return _get(("html", headers), lambda: _lc("HTMLHeaderTextSplitter")(headers_to_split_on=list(headers)))
+
+
+def json_splitter(max_chunk_size: int) -> RecursiveJsonSplitter:
+    return _get(("json", max_chunk_size), lambda: _lc("RecursiveJsonSplitter")(max_chunk_size=max_chunk_size))
+
+
+# ------------------------------
+# Introspection
+# ------------------------------
+def registry_size() -> int:
+    """Number of cached splitter instances."""
+    return len(_instances)
+
+
+def clear_registry() -> None:
+    """Drop all cached instances (e.g. in long-running processes after a config sweep)."""
+    with _lock:
+        _instances.clear()
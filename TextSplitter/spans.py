@@ -0,0 +1,318 @@
+# TextSplitter/spans.py
+"""
+Span-based splitting engine for very large texts.
+
+Same chunking rules as LangChain's RecursiveCharacterTextSplitter and
+CharacterTextSplitter (length = number of characters, literal separators),
+but the work is done on (start, end) offsets into the original string:
+
+- separator positions are found once per separator (numpy array) and
+  sliced per sub-span, instead of re.split() creating a substring per piece
+- pieces are two offset arrays; merging bisects on their prefix lengths, so
+  the Python-level work is per chunk, not per piece
+- chunk text is sliced only when asked for (`TextSpan.text_of`)
+- `start_index` is the real offset of the chunk, no `text.find()` search
+
+With keep_separator=True (the recursive default) every chunk is a plain
+slice of the input. With keep_separator=False a chunk whose pieces were
+separated by runs of separators is not a slice; only then is its text built
+eagerly (joined with one separator, exactly as LangChain does).
+
+Note: LangChain derives start_index with `text.find(chunk, offset)`, which
+can land on an earlier repeat of the same text; here it is always the true
+position, so the two can differ on highly repetitive input.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from bisect import bisect_left, bisect_right
+
+import copy
+import re
+
+import numpy as np
+from langchain_core.documents import Document
+
+DEFAULT_SEPARATORS = ("\n\n", "\n", " ", "")
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+class TextSpan(NamedTuple):
+    start: int                    # offset of the first character of the chunk
+    end: int                      # offset just past the chunk (for joined chunks: of its last piece)
+    joined: Optional[str] = None  # chunk text when it is not a contiguous slice
+
+    def text_of(self, text: str) -> str:
+        return self.joined if self.joined is not None else text[self.start:self.end]
+
+
+def _has_border(sep: str) -> bool:
+    """True if sep can overlap itself (a proper prefix equals a suffix, e.g. "\\n\\n")."""
+    return any(sep[:k] == sep[-k:] for k in range(1, len(sep)))
+
+
+class _Positions:
+    """Start offsets of a literal separator in one text, computed once."""
+
+    __slots__ = ("text", "sep", "starts", "exact")
+
+    def __init__(self, text: str, sep: str, codes: Optional[np.ndarray] = None):
+        self.text = text
+        self.sep = sep
+        if len(sep) == 1 and codes is not None:
+            self.starts = np.flatnonzero(codes == ord(sep)).astype(np.int64)
+        else:
+            self.starts = np.fromiter((m.start() for m in re.finditer(re.escape(sep), text)), dtype=np.int64)
+        # Occurrences of a border-free separator never overlap, so the global
+        # left-to-right matches are also the matches inside any sub-span.
+        self.exact = not _has_border(sep)
+
+    def within(self, a: int, b: int) -> np.ndarray:
+        """Non-overlapping match starts fully inside [a, b), left to right (as re.split would find them)."""
+        L = len(self.sep)
+        if self.exact or a == 0:
+            # (for a == 0 the global left-to-right matches are also those of any prefix span)
+            lo, hi = np.searchsorted(self.starts, (a, b - L + 1))
+            return self.starts[lo:hi]
+        out, find, pos = [], self.text.find, a
+        while True:
+            pos = find(self.sep, pos, b)
+            if pos < 0:
+                return np.asarray(out, dtype=np.int64)
+            out.append(pos)
+            pos += L
+
+    def any_within(self, a: int, b: int) -> bool:
+        if self.exact:
+            i = int(np.searchsorted(self.starts, a))
+            return i < self.starts.size and int(self.starts[i]) + len(self.sep) <= b
+        return self.text.find(self.sep, a, b) >= 0
+
+
+class SpanSplitter(ABC):
+    """Shared span machinery (piece extraction, merging, stripping, Documents)."""
+
+    def __init__(
+        self,
+        chunk_size: int = 4000,
+        chunk_overlap: int = 200,
+        keep_separator: Union[bool, str] = True,
+        strip_whitespace: bool = True,
+        add_start_index: bool = False,
+    ):
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be > 0, got {chunk_size}")
+        if chunk_overlap < 0:
+            raise ValueError(f"chunk_overlap must be >= 0, got {chunk_overlap}")
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size ({chunk_size}), should be smaller."
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.keep_separator = keep_separator
+        self.strip_whitespace = strip_whitespace
+        self.add_start_index = add_start_index
+
+    # ----------------------------
+    # Primitives
+    # ----------------------------
+    @staticmethod
+    def _codes(text: str) -> np.ndarray:
+        """Code points of `text` as an array (1 byte per char for ASCII, else 4), for separator search."""
+        if text.isascii():
+            return np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+    def _pieces(self, a: int, b: int, sep: str, pos: Optional[_Positions]) -> Tuple[np.ndarray, np.ndarray]:
+        """(starts, ends) of the pieces re.split-with-separator would produce on text[a:b], empties dropped."""
+        if sep == "":
+            starts = np.arange(a, b, dtype=np.int64)
+            return starts, starts + 1
+        at = pos.within(a, b)
+        L = len(sep)
+        if not self.keep_separator:
+            starts = np.concatenate(((a,), at + L))
+            ends = np.concatenate((at, (b,)))
+        elif self.keep_separator == "end":
+            starts = np.concatenate(((a,), at + L))
+            ends = np.concatenate((at + L, (b,)))
+        else:  # True / "start": the separator begins the following piece
+            starts = np.concatenate(((a,), at))
+            ends = np.concatenate((at, (b,)))
+        keep = ends > starts
+        if not keep.all():
+            starts, ends = starts[keep], ends[keep]
+        return starts, ends
+
+    def _strip(self, text: str, s: int, e: int) -> Tuple[int, int]:
+        if self.strip_whitespace:
+            while s < e and text[s].isspace():
+                s += 1
+            while e > s and text[e - 1].isspace():
+                e -= 1
+        return s, e
+
+    def _join(self, text: str, S: List[int], E: List[int], h: int, j: int, sep: str,
+              contiguous: bool) -> Optional[TextSpan]:
+        """Chunk made of pieces [h, j) joined by `sep` (LangChain's _join_docs); None if empty."""
+        if contiguous:
+            s, e = self._strip(text, S[h], E[j - 1])
+            return TextSpan(s, e) if e > s else None
+        L = len(sep)
+        parts = list(zip(S[h:j], E[h:j]))
+        joined = sep.join(text[s:e] for s, e in parts)
+        stripped = joined.strip() if self.strip_whitespace else joined
+        if not stripped:
+            return None
+        lead = len(joined) - len(joined.lstrip()) if self.strip_whitespace else 0
+        return TextSpan(self._joined_offset(parts, L, lead), parts[-1][1], stripped)
+
+    @staticmethod
+    def _joined_offset(parts: Sequence[Tuple[int, int]], sep_len: int, k: int) -> int:
+        """Map offset k in sep.join(parts) back to an offset in the original text."""
+        for s, e in parts:
+            if k < e - s:
+                return s + k
+            k -= e - s
+            if k < sep_len:
+                return e + k    # a separator always starts where a (non-final) piece ends
+            k -= sep_len
+        return parts[-1][1]
+
+    def _merge(self, text: str, S_arr: np.ndarray, E_arr: np.ndarray, sep: str) -> List[TextSpan]:
+        """
+        LangChain's TextSplitter._merge_splits on spans, with identical results.
+
+        Its running `total` for a window of pieces [h, j) is
+        sum(len) + L * (j - h - 1) = P[j] - P[h] - L, with P the prefix sums of
+        (len + L). Both the point where a chunk is emitted and the number of
+        pieces popped for the overlap are monotone in P, so they are found by
+        binary search instead of walking every piece.
+        """
+        m = S_arr.size
+        if m == 0:
+            return []
+        L = len(sep)
+        size, overlap = self.chunk_size, self.chunk_overlap
+        P = [0]
+        P.extend(np.cumsum(E_arr - S_arr + L).tolist())
+        S, E = S_arr.tolist(), E_arr.tolist()
+
+        def join(h: int, j: int) -> Optional[TextSpan]:
+            # pieces are separated by >= 1 separator; equal lengths <=> exactly one each
+            return self._join(text, S, E, h, j, sep, E[j - 1] - S[h] == P[j] - P[h] - L)
+
+        out: List[TextSpan] = []
+        h = j = 0   # window is pieces [h, j)
+        while True:
+            # first piece jf >= max(j, h+1) whose addition overflows: P[jf+1] - P[h] - L > size
+            jf = max(bisect_right(P, P[h] + L + size) - 1, j, h + 1)
+            if jf >= m:
+                break
+            chunk = join(h, jf)
+            if chunk is not None:
+                out.append(chunk)
+            # pop while total > overlap or (total + len + L > size and total > 0)
+            threshold = max(P[jf] - L - overlap, P[jf + 1] - L - size)
+            h = min(jf, max(h, bisect_left(P, threshold)))
+            j = jf + 1
+        chunk = join(h, m)
+        if chunk is not None:
+            out.append(chunk)
+        return out
+
+    # ----------------------------
+    # Public API
+    # ----------------------------
+    @abstractmethod
+    def split_spans(self, text: str) -> List[TextSpan]:
+        """Chunks of `text` as spans (offsets into it); defined by each splitter."""
+
+    def split_text(self, text: str) -> List[str]:
+        """Chunk strings, identical to the LangChain splitter's split_text."""
+        return [span.text_of(text) for span in self.split_spans(text)]
+
+    def create_documents(
+        self, texts: Sequence[str], metadatas: Optional[Sequence[Dict[Any, Any]]] = None
+    ) -> List[Document]:
+        """Documents per chunk; with add_start_index, metadata['start_index'] is the span start."""
+        out: List[Document] = []
+        for i, text in enumerate(texts):
+            meta = metadatas[i] if metadatas else {}
+            flat = all(isinstance(v, (str, int, float, bool, type(None))) for v in meta.values())
+            for span in self.split_spans(text):
+                m = dict(meta) if flat else copy.deepcopy(meta)
+                if self.add_start_index:
+                    m["start_index"] = span.start
+                out.append(Document(page_content=span.text_of(text), metadata=m))
+        return out
+
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        docs = list(documents)
+        return self.create_documents([d.page_content for d in docs], [d.metadata for d in docs])
+
+
+class RecursiveSpanSplitter(SpanSplitter):
+    """Span engine with RecursiveCharacterTextSplitter's rules (literal separators)."""
+
+    def __init__(self, separators: Optional[Sequence[str]] = None, keep_separator: Union[bool, str] = True, **kwargs):
+        super().__init__(keep_separator=keep_separator, **kwargs)
+        self.separators = list(separators or DEFAULT_SEPARATORS)
+
+    def split_spans(self, text: str) -> List[TextSpan]:
+        positions: Dict[str, _Positions] = {}
+        codes: List[np.ndarray] = []     # encoded on first use, shared by all 1-char separators
+
+        def pos(sep: str) -> _Positions:
+            if sep not in positions:
+                if len(sep) == 1 and not codes:
+                    codes.append(self._codes(text))
+                positions[sep] = _Positions(text, sep, codes[0] if len(sep) == 1 else None)
+            return positions[sep]
+
+        def split(a: int, b: int, separators: List[str]) -> List[TextSpan]:
+            separator, rest = separators[-1], []
+            for i, s in enumerate(separators):
+                if s == "":
+                    separator = s
+                    break
+                if pos(s).any_within(a, b):
+                    separator, rest = s, separators[i + 1:]
+                    break
+            S, E = self._pieces(a, b, separator, pos(separator) if separator else None)
+            merge_sep = "" if self.keep_separator else separator
+            final: List[TextSpan] = []
+            prev = 0
+            # runs of pieces shorter than chunk_size are merged; longer ones recurse
+            for big in np.flatnonzero(E - S >= self.chunk_size).tolist():
+                if big > prev:
+                    final.extend(self._merge(text, S[prev:big], E[prev:big], merge_sep))
+                s, e = int(S[big]), int(E[big])
+                if not rest:
+                    final.append(TextSpan(s, e))     # oversized piece, emitted as is (no strip)
+                else:
+                    final.extend(split(s, e, rest))
+                prev = big + 1
+            if prev < S.size:
+                final.extend(self._merge(text, S[prev:], E[prev:], merge_sep))
+            return final
+
+        return split(0, len(text), self.separators)
+
+
+class CharacterSpanSplitter(SpanSplitter):
+    """Span engine with CharacterTextSplitter's rules (one literal separator)."""
+
+    def __init__(self, separator: str = "\n\n", keep_separator: Union[bool, str] = False, **kwargs):
+        super().__init__(keep_separator=keep_separator, **kwargs)
+        self.separator = separator
+
+    def split_spans(self, text: str) -> List[TextSpan]:
+        sep = self.separator
+        positions = _Positions(text, sep, self._codes(text) if len(sep) == 1 else None) if sep else None
+        S, E = self._pieces(0, len(text), sep, positions)
+        return self._merge(text, S, E, "" if self.keep_separator else sep)
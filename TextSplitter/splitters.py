@@ -11,94 +11,109 @@ Supports:
 - JSON recursive splits (from URL or in-memory JSON)
 - PDF -> Documents -> split
 
+Recursive and character splits can run on the span engine (TextSplitter.spans,
+`engine="span"`): same chunks, with true start_index offsets. It is faster
+on separator-poor text (e.g. character splits on " ", where LangChain builds
+a substring per piece); on ordinary paragraph text LangChain's C-level
+str.split is usually faster and peaks lower, so the default stays "langchain".
+
 All functions return a list of `Document` objects unless noted.
 """
 
 from __future__ import annotations
-from typing import Iterable, List, Sequence, Tuple, Optional, Union
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Sequence, Tuple, Optional, Union
 from dataclasses import dataclass
-
-# LangChain splitters
-from langchain_text_splitters import (
-    RecursiveCharacterTextSplitter,
-    CharacterTextSplitter,
-    TokenTextSplitter,
-    MarkdownHeaderTextSplitter,
-    RecursiveJsonSplitter,
+from itertools import islice
+
+# LangChain splitters (instances are shared through the registry, which
+# imports langchain_text_splitters on first use)
+from .registry import (
+    splitter_for,
+    character_splitter,
+    token_splitter,
+    markdown_splitter,
+    code_splitter,
+    html_header_splitter,
+    json_splitter,
 )
-# Code-aware splitter helpers
-from langchain_text_splitters import Language
+from langchain_core.documents import Document
 
-# Loaders (used by helpers)
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.document_loaders.base import Document
+from utils.documents import assign_chunk_ids
+from utils.instrument import timed
 
-# Optional deps
-import bs4  # noqa: F401  (kept if you later add HTML parsing from raw HTML)
 import os
 import json
 from typing import Any
 
+if TYPE_CHECKING:
+    from langchain_text_splitters import Language
+
 # ------------------------------
 # Generic configs
 # ------------------------------
 DEFAULT_CHUNK_SIZE = 500
 DEFAULT_CHUNK_OVERLAP = 50
+SPLIT_ENGINES = ("langchain", "span")
 
 @dataclass
 class SplitConfig:
     chunk_size: int = DEFAULT_CHUNK_SIZE
     chunk_overlap: int = DEFAULT_CHUNK_OVERLAP
     add_start_index: bool = True
+    engine: str = "langchain"   # or "span" (start_index is the true offset, see TextSplitter.spans)
+    dedup: Optional[float] = None   # drop near-duplicate chunks at this similarity (TextSplitter.dedup)
+
+    def __post_init__(self):
+        if self.engine not in SPLIT_ENGINES:
+            raise ValueError(f"Unknown split engine {self.engine!r}; choose one of {SPLIT_ENGINES}")
+        if self.dedup is not None and not 0.0 < self.dedup <= 1.0:
+            raise ValueError("dedup must be a similarity threshold in (0, 1]")
 
 
 # ------------------------------
 # Core splitters
 # ------------------------------
+@timed("split.split_documents_recursive")
 def split_documents_recursive(
     docs: Sequence[Document],
     cfg: SplitConfig = SplitConfig(),
 ) -> List[Document]:
-    """Split LangChain Documents using RecursiveCharacterTextSplitter."""
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=cfg.chunk_size,
-        chunk_overlap=cfg.chunk_overlap,
-        add_start_index=cfg.add_start_index,
-    )
-    return splitter.split_documents(docs)
+    """Split LangChain Documents using RecursiveCharacterTextSplitter (chunks get stable ids)."""
+    splitter = splitter_for(cfg)
+    chunks = assign_chunk_ids(splitter.split_documents(docs))
+    if cfg.dedup is not None:
+        from .dedup import NearDuplicateFilter
+        chunks = NearDuplicateFilter(cfg.dedup).filter(chunks)
+    return chunks
 
 
+@timed("split.split_text_character")
 def split_text_character(
     text: str,
     separator: str = "\n\n",
     chunk_size: int = 100,
     chunk_overlap: int = 20,
+    engine: str = "langchain",
 ) -> List[Document]:
-    """Split raw text using CharacterTextSplitter -> Documents."""
-    splitter = CharacterTextSplitter(
-        separator=separator,
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-    )
+    """Split raw text using CharacterTextSplitter (or the span engine) -> Documents."""
+    splitter = character_splitter(separator, chunk_size, chunk_overlap, engine)
     return splitter.create_documents([text])
 
 
+@timed("split.split_text_by_tokens")
 def split_text_by_tokens(
     text: str,
     tokens_per_chunk: int = 256,
     tokens_overlap: int = 32,
-    encoding_name: Optional[str] = None,  # if None, langchain chooses default
+    encoding_name: Optional[str] = None,  # if None, TokenTextSplitter's default ("gpt2")
 ) -> List[Document]:
     """Split text by approximate token count."""
-    splitter = TokenTextSplitter(
-        chunk_size=tokens_per_chunk,
-        chunk_overlap=tokens_overlap,
-        encoding_name=encoding_name,
-    )
+    splitter = token_splitter(tokens_per_chunk, tokens_overlap, encoding_name)
     chunks = splitter.split_text(text)
     return [Document(page_content=ch, metadata={"splitter": "token"}) for ch in chunks]
 
 
+@timed("split.split_markdown")
 def split_markdown(
     text: str,
     headers_to_split_on: Sequence[Tuple[str, str]] = (
@@ -109,45 +124,93 @@ def split_markdown(
     ),
 ) -> List[Document]:
     """Split Markdown by headers into Documents preserving section metadata."""
-    md_splitter = MarkdownHeaderTextSplitter(headers_to_split_on=headers_to_split_on)
+    md_splitter = markdown_splitter(headers_to_split_on)
     return md_splitter.split_text(text)
 
 
+@timed("split.split_code")
 def split_code(
     text: str,
-    language: Language = Language.PYTHON,
+    language: Optional[Language] = None,
     chunk_size: int = 400,
     chunk_overlap: int = 40,
 ) -> List[Document]:
     """
     Code-aware recursive split. Choose Language via:
-      Language.PYTHON, Language.JS, Language.CPP, Language.GO, Language.JAVA, etc.
+      Language.PYTHON (default when None), Language.JS, Language.CPP, Language.GO, Language.JAVA, etc.
     """
-    splitter = RecursiveCharacterTextSplitter.from_language(
-        language=language,
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-    )
+    if language is None:
+        from langchain_text_splitters import Language
+        language = Language.PYTHON
+    splitter = code_splitter(language, chunk_size, chunk_overlap)
     return splitter.create_documents([text])
 
 
+# ------------------------------
+# Streaming helpers
+# ------------------------------
+@timed("split.iter_chunks")
+def iter_chunks(
+    docs: Iterable[Document],
+    cfg: SplitConfig = SplitConfig(),
+) -> Iterator[Document]:
+    """
+    Lazy `split_documents_recursive`: consume Documents one at a time (e.g. from
+    contentLoader.iter_documents) and yield their chunks as they are produced.
+    """
+    splitter = splitter_for(cfg)
+    chunks = (c for doc in docs for c in assign_chunk_ids(splitter.split_documents([doc])))
+    if cfg.dedup is not None:
+        from .dedup import NearDuplicateFilter
+        chunks = NearDuplicateFilter(cfg.dedup).iter_filter(chunks)
+    yield from chunks
+
+
+def iter_batches(items: Iterable[Any], batch_size: int = 64) -> Iterator[List[Any]]:
+    """
+    Group any iterable into lists of at most `batch_size` items, lazily.
+    Feeding an embedder this way keeps memory proportional to batch_size:
+
+        for batch in iter_batches(iter_chunks(iter_documents(path)), 64):
+            vectors = embeddings.embed_documents([d.page_content for d in batch])
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    it = iter(items)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
 # ------------------------------
 # PDF helpers
 # ------------------------------
+@timed("split.split_pdf")
 def split_pdf(
     path: str,
     cfg: SplitConfig = SplitConfig(),
+    backend: str = "pypdf",
+    workers: Optional[int] = 1,
 ) -> List[Document]:
-    """Load a PDF into Documents then split recursively."""
+    """
+    Load a PDF into Documents then split recursively.
+    backend/workers select the extractor and page-parallelism (see contentLoader.pdf;
+    in-process by default, workers=None for one process per CPU).
+    """
+    from contentLoader.pdf import load_pdf
+
     if not os.path.exists(path):
         raise FileNotFoundError(f"PDF not found: {path}")
-    docs = PyPDFLoader(path).load()
+    docs = load_pdf(path, backend=backend, workers=workers)
     return split_documents_recursive(docs, cfg)
 
 
 # ------------------------------
 # HTML header splits (URL)
 # ------------------------------
+@timed("split.split_html_from_url")
 def split_html_from_url(
     url: str,
     headers_to_split_on: Sequence[Tuple[str, str]] = (
@@ -156,39 +219,57 @@ def split_html_from_url(
         ("h3", "Header 3"),
         ("h4", "Header 4"),
     ),
+    http_cache=None,
+    timeout: int = 20,
 ) -> List[Document]:
     """
     Fetch HTML from a URL and split by header tags.
     Note: You need to fetch HTML yourself or use a loader.
     This function is kept minimal and expects you to provide the HTML string
     if you want to split offline. For web loading, use your own loader first.
+    With `http_cache` (utils.HttpCache) the page is revalidated and, if
+    unchanged, the previously split chunks are returned.
     """
+    def build(html: str) -> List[Document]:
+        splitter = html_header_splitter(headers_to_split_on)
+        return splitter.split_text(html)
+
+    if http_cache is not None:
+        key = ("html_headers", tuple(map(tuple, headers_to_split_on)))
+        return http_cache.derive(url, key, lambda resp: build(resp.text), timeout=timeout)
     import requests
-    html = requests.get(url, timeout=20).text  # simple fetch
-    splitter = MarkdownHeaderTextSplitter.from_html(
-        headers_to_split_on=headers_to_split_on
-    )
-    return splitter.split_text(html)
+    return build(requests.get(url, timeout=timeout).text)  # simple fetch
 
 
 # ------------------------------
 # JSON recursive splits
 # ------------------------------
+@timed("split.split_json_obj")
 def split_json_obj(
     data: Any,
     max_chunk_size: int = 300,
 ) -> List[Document]:
     """Split an in-memory JSON-like object into Documents."""
-    splitter = RecursiveJsonSplitter(max_chunk_size=max_chunk_size)
+    splitter = json_splitter(max_chunk_size)
     return splitter.create_documents(texts=[data])
 
 
+@timed("split.split_json_from_url")
 def split_json_from_url(
     url: str,
     max_chunk_size: int = 300,
     timeout: int = 20,
+    http_cache=None,
 ) -> List[Document]:
-    """Fetch JSON from URL and split into Documents."""
+    """
+    Fetch JSON from URL and split into Documents.
+    With `http_cache` (utils.HttpCache) an unchanged payload (304) reuses the chunks.
+    """
+    if http_cache is not None:
+        key = ("json", max_chunk_size)
+        return http_cache.derive(
+            url, key, lambda resp: split_json_obj(resp.json(), max_chunk_size=max_chunk_size), timeout=timeout
+        )
     import requests
     json_data = requests.get(url, timeout=timeout).json()
     return split_json_obj(json_data, max_chunk_size=max_chunk_size)
@@ -197,6 +278,7 @@ def split_json_from_url(
 # ------------------------------
 # Convenience: generic dispatcher
 # ------------------------------
+@timed("split.split_auto")
 def split_auto(
     source: Union[str, Sequence[Document]],
     cfg: SplitConfig = SplitConfig(),
@@ -206,7 +288,8 @@ def split_auto(
     """
     Convenience router:
       - If `source` is a path to .pdf: load & split PDF.
-      - If `source` is raw text: recursive split (uses cfg).
+      - If `source` is raw text: character split on blank lines (or a code
+        split with `assume_language`), with cfg's sizes, engine and dedup.
       - If `source` is a list of Documents: recursive split.
     """
     if isinstance(source, list) and source and isinstance(source[0], Document):
@@ -218,10 +301,15 @@ def split_auto(
             return split_pdf(source, cfg)
         # treat as raw text otherwise
         if assume_language:
-            return split_code(source, language=assume_language,
-                              chunk_size=cfg.chunk_size, chunk_overlap=cfg.chunk_overlap)
-        return split_text_character(source, separator="\n\n",
-                                    chunk_size=cfg.chunk_size, chunk_overlap=cfg.chunk_overlap)
+            chunks = split_code(source, language=assume_language,
+                                chunk_size=cfg.chunk_size, chunk_overlap=cfg.chunk_overlap)
+        else:
+            chunks = split_text_character(source, separator="\n\n", chunk_size=cfg.chunk_size,
+                                          chunk_overlap=cfg.chunk_overlap, engine=cfg.engine)
+        if cfg.dedup is not None:
+            from .dedup import NearDuplicateFilter
+            chunks = NearDuplicateFilter(cfg.dedup).filter(chunks)
+        return chunks
 
     raise ValueError("Unsupported input for split_auto. Pass a PDF path, raw text, or a list of Documents.")
 
@@ -0,0 +1,46 @@
+# VectorDB/__init__.py
+# Vector backends resolve lazily (PEP 562) on first use.
+
+from typing import TYPE_CHECKING
+
+from utils.lazy import lazy_exports
+
+_MODULES = {
+    ".numpy_store": ("NumpyVectorStore", "UpsertResult", "normalize_rows", "top_k", "top_k_rows"),
+    ".ivf": ("IVFVectorStore", "kmeans"),
+    ".quantized": ("QuantizedVectorStore", "ScalarQuantizer", "ProductQuantizer"),
+    ".metadata_index": ("MetadataIndex", "matches"),
+    ".chunk_store": ("ChunkStore",),
+    ".bm25": ("BM25Index", "tokenize"),
+    ".hybrid": ("HybridRetriever", "reciprocal_rank_fusion"),
+}
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _MODULES)
+
+if TYPE_CHECKING:  # static analysers and IDEs see the eager imports
+    from .numpy_store import NumpyVectorStore, UpsertResult, normalize_rows, top_k, top_k_rows
+    from .ivf import IVFVectorStore, kmeans
+    from .quantized import QuantizedVectorStore, ScalarQuantizer, ProductQuantizer
+    from .metadata_index import MetadataIndex, matches
+    from .chunk_store import ChunkStore
+    from .bm25 import BM25Index, tokenize
+    from .hybrid import HybridRetriever, reciprocal_rank_fusion
+
+__all__ = [
+    "NumpyVectorStore",
+    "UpsertResult",
+    "normalize_rows",
+    "top_k",
+    "top_k_rows",
+    "IVFVectorStore",
+    "kmeans",
+    "QuantizedVectorStore",
+    "ScalarQuantizer",
+    "ProductQuantizer",
+    "MetadataIndex",
+    "matches",
+    "ChunkStore",
+    "BM25Index",
+    "tokenize",
+    "HybridRetriever",
+    "reciprocal_rank_fusion",
+]
@@ -0,0 +1,177 @@
+# VectorDB/bm25.py
+# Compact in-memory BM25 inverted index, keyed by the same ids as the vector store.
+#
+# Postings are two parallel uint32 arrays per term (doc numbers, term freqs);
+# removed documents are tombstoned and dropped on compact().
+
+from __future__ import annotations
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import json
+import math
+import os
+import re
+
+import numpy as np
+
+# Words, plus compound identifiers such as "EmpID:004", "17:35", "02.08.2025"
+_TOKEN_RE = re.compile(r"\w+(?:[:./\-]\w+)*", re.UNICODE)
+_PART_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased tokens. Compound identifiers are kept whole and also split into
+    their parts, so "EmpID:004" matches queries for "empid:004", "empid" or "004".
+    """
+    out: List[str] = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        out.append(tok)
+        if not tok.isalnum():
+            out.extend(_PART_RE.findall(tok))
+    return out
+
+
+class BM25Index:
+    """Okapi BM25 over documents identified by string ids (add / remove / search / save / load)."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._ids: List[Optional[str]] = []          # docno -> id (None once removed)
+        self._lens = array("I")                       # docno -> token count
+        self._id_to_doc: Dict[str, int] = {}
+        self._docs: Dict[str, array] = {}             # term -> docnos
+        self._tfs: Dict[str, array] = {}              # term -> term freqs
+        self._total_len = 0
+        self._n_removed = 0
+
+    def __len__(self) -> int:
+        return len(self._id_to_doc)
+
+    # ----------------------------
+    # Maintenance
+    # ----------------------------
+    def add(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        """Index texts under ids (an existing id is replaced)."""
+        self.remove([i for i in ids if i in self._id_to_doc])
+        for id_, text in zip(ids, texts):
+            docno = len(self._ids)
+            counts = Counter(tokenize(text))
+            self._ids.append(id_)
+            length = sum(counts.values())
+            self._lens.append(length)
+            self._total_len += length
+            self._id_to_doc[id_] = docno
+            for term, tf in counts.items():
+                if term not in self._docs:
+                    self._docs[term] = array("I")
+                    self._tfs[term] = array("I")
+                self._docs[term].append(docno)
+                self._tfs[term].append(tf)
+
+    def remove(self, ids: Iterable[str]) -> None:
+        """Tombstone ids; postings are cleaned up by compact()."""
+        for id_ in ids:
+            docno = self._id_to_doc.pop(id_, None)
+            if docno is None:
+                continue
+            self._ids[docno] = None
+            self._total_len -= self._lens[docno]
+            self._n_removed += 1
+        if self._n_removed and self._n_removed >= 0.25 * len(self._ids):
+            self.compact()
+
+    def compact(self) -> None:
+        """Renumber live documents and drop removed postings."""
+        if not self._n_removed:
+            return
+        remap = np.full(len(self._ids), -1, dtype=np.int64)
+        live = [d for d, id_ in enumerate(self._ids) if id_ is not None]
+        remap[live] = np.arange(len(live))
+        for term in list(self._docs):
+            docs = np.frombuffer(self._docs[term], dtype=np.uint32)
+            tfs = np.frombuffer(self._tfs[term], dtype=np.uint32)
+            new = remap[docs]
+            keep = new >= 0
+            if not keep.any():
+                del self._docs[term], self._tfs[term]
+                continue
+            self._docs[term] = array("I", new[keep].astype(np.uint32).tobytes())
+            self._tfs[term] = array("I", tfs[keep].tobytes())
+        self._ids = [self._ids[d] for d in live]
+        self._lens = array("I", [self._lens[d] for d in live])
+        self._id_to_doc = {id_: d for d, id_ in enumerate(self._ids)}
+        self._n_removed = 0
+
+    # ----------------------------
+    # Search
+    # ----------------------------
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (id, BM25 score) for `query`; documents with no matching term are omitted."""
+        n_docs = len(self._id_to_doc)
+        if n_docs == 0:
+            return []
+        terms = [t for t in dict.fromkeys(tokenize(query)) if t in self._docs]
+        if not terms:
+            return []
+        avgdl = self._total_len / n_docs or 1.0
+        lens = np.frombuffer(self._lens, dtype=np.uint32).astype(np.float32)
+        norm = self.k1 * (1.0 - self.b + self.b * lens / avgdl)
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        for term in terms:
+            docs = np.frombuffer(self._docs[term], dtype=np.uint32)
+            tfs = np.frombuffer(self._tfs[term], dtype=np.uint32).astype(np.float32)
+            df = len(docs)   # includes tombstones until compaction; close enough for idf
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1.0) / (tfs + norm[docs])
+        cand = np.flatnonzero(scores > 0)
+        cand = cand[[self._ids[d] is not None for d in cand]] if self._n_removed else cand
+        if cand.size == 0:
+            return []
+        order = cand[np.argsort(-scores[cand], kind="stable")[:k]]
+        return [(self._ids[d], float(scores[d])) for d in order]
+
+    def contains_all(self, id_: str, terms: Iterable[str]) -> bool:
+        """True if document `id_` contains every one of `terms` (already tokenized)."""
+        docno = self._id_to_doc.get(id_)
+        if docno is None:
+            return False
+        for term in terms:
+            docs = self._docs.get(term)
+            if docs is None or docno not in docs:
+                return False
+        return True
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def save(self, path: str) -> None:
+        self.compact()
+        data = {
+            "k1": self.k1,
+            "b": self.b,
+            "ids": self._ids,
+            "lens": self._lens.tolist(),
+            "postings": {t: [self._docs[t].tolist(), self._tfs[t].tolist()] for t in self._docs},
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        index = cls(k1=data["k1"], b=data["b"])
+        index._ids = list(data["ids"])
+        index._lens = array("I", data["lens"])
+        index._id_to_doc = {id_: d for d, id_ in enumerate(index._ids)}
+        index._total_len = int(sum(data["lens"]))
+        for term, (docs, tfs) in data["postings"].items():
+            index._docs[term] = array("I", docs)
+            index._tfs[term] = array("I", tfs)
+        return index
@@ -0,0 +1,181 @@
+# VectorDB/chunk_store.py
+# Append-only chunk records (id, text, metadata) addressed by integer row.
+#
+# On disk:
+#   <folder>/chunks.bin   records back to back: id (UTF-8) | text (UTF-8) | metadata (JSON)
+#   <folder>/chunks.idx   int64 [rows, 4] = (start, id_end, text_end, end) byte offsets
+#
+# open() memory-maps both files, so it takes constant time however many rows
+# there are; a record is decoded only when it is read (e.g. for the top-k hits
+# of a search). Rows added afterwards stay in memory until save(), which
+# appends them to the files in place when saving back to the folder the store
+# was opened from (rewriting only after compaction renumbered rows). The row
+# count lives in the caller's manifest (meta.json), written last, so bytes
+# from an interrupted append are never read.
+
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import json
+import mmap
+import os
+
+import numpy as np
+
+BIN_FILE = "chunks.bin"
+IDX_FILE = "chunks.idx"
+
+
+def _encode(id_: str, text: str, metadata: Dict[str, Any]) -> Tuple[bytes, bytes, bytes]:
+    meta = json.dumps(metadata, ensure_ascii=False, default=str, separators=(",", ":"))
+    return id_.encode("utf-8"), text.encode("utf-8"), meta.encode("utf-8")
+
+
+class ChunkStore:
+    """
+    Rows of (id, text, metadata): rows [0, n_file) are read lazily from an
+    opened chunks.bin, later rows are held in memory.
+    """
+
+    def __init__(self):
+        self._path: Optional[str] = None     # folder the file rows come from
+        self._mm: Optional[mmap.mmap] = None
+        self._spans = np.zeros((0, 4), dtype=np.int64)
+        self._appendable = False             # file rows are exactly the file's first rows, in order
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metas: List[Dict[str, Any]] = []
+
+    @property
+    def n_file(self) -> int:
+        return int(self._spans.shape[0])
+
+    def __len__(self) -> int:
+        return self.n_file + len(self._ids)
+
+    # ----------------------------
+    # Reading
+    # ----------------------------
+    def _field(self, row: int, col: int) -> str:
+        span = self._spans[row]
+        return self._mm[int(span[col]): int(span[col + 1])].decode("utf-8")
+
+    def id(self, row: int) -> str:
+        return self._field(row, 0) if row < self.n_file else self._ids[row - self.n_file]
+
+    def text(self, row: int) -> str:
+        return self._field(row, 1) if row < self.n_file else self._texts[row - self.n_file]
+
+    def metadata(self, row: int) -> Dict[str, Any]:
+        """The row's metadata (a fresh dict for file rows; do not modify in-memory ones)."""
+        if row < self.n_file:
+            return json.loads(self._field(row, 2))
+        return self._metas[row - self.n_file]
+
+    def get(self, row: int) -> Tuple[str, str, Dict[str, Any]]:
+        if row >= self.n_file:
+            i = row - self.n_file
+            return self._ids[i], self._texts[i], self._metas[i]
+        start, id_end, text_end, end = (int(v) for v in self._spans[row])
+        raw = self._mm[start:end]
+        id_end, text_end = id_end - start, text_end - start
+        return (raw[:id_end].decode("utf-8"), raw[id_end:text_end].decode("utf-8"),
+                json.loads(raw[text_end:].decode("utf-8")))
+
+    def ids(self) -> Iterator[str]:
+        for row in range(self.n_file):
+            yield self._field(row, 0)
+        yield from self._ids
+
+    def metadatas(self) -> Iterator[Dict[str, Any]]:
+        for row in range(self.n_file):
+            yield json.loads(self._field(row, 2))
+        yield from self._metas
+
+    # ----------------------------
+    # Writing
+    # ----------------------------
+    def append(self, id_: str, text: str, metadata: Dict[str, Any]) -> None:
+        self._ids.append(id_)
+        self._texts.append(text)
+        self._metas.append(metadata)
+
+    def take(self, keep: np.ndarray) -> "ChunkStore":
+        """Store with only rows `keep` (ascending), renumbered from 0. File rows are not decoded."""
+        out = ChunkStore()
+        keep = np.asarray(keep, dtype=np.int64)
+        cut = int(np.searchsorted(keep, self.n_file))
+        if self._mm is not None:
+            out._path, out._mm = self._path, self._mm
+            out._spans = self._spans[keep[:cut]]
+            out._appendable = self._appendable and cut == self.n_file
+        for row in keep[cut:] - self.n_file:
+            out.append(self._ids[row], self._texts[row], self._metas[row])
+        return out
+
+    def save(self, folder_path: str) -> None:
+        """
+        Write every row to `folder_path`, then re-open from there (in-memory rows
+        move to the file). Appends in place when the folder's files already
+        hold this store's file rows; otherwise writes new files and replaces.
+        """
+        folder = os.path.realpath(folder_path)
+        bin_path, idx_path = os.path.join(folder, BIN_FILE), os.path.join(folder, IDX_FILE)
+        n = len(self)
+        if self._appendable and self._path == folder and os.path.exists(bin_path):
+            end = int(self._spans[-1, 3]) if self.n_file else 0
+            with open(bin_path, "r+b") as fb, open(idx_path, "r+b") as fi:
+                if os.path.getsize(bin_path) != end:    # bytes of an interrupted earlier append
+                    fb.truncate(end)
+                if os.path.getsize(idx_path) != self.n_file * 32:
+                    fi.truncate(self.n_file * 32)
+                fb.seek(end)
+                fi.seek(self.n_file * 32)
+                self._write_tail(fb, fi, end)
+        else:
+            with open(bin_path + ".tmp", "wb") as fb, open(idx_path + ".tmp", "wb") as fi:
+                pos = 0
+                for a in range(0, self.n_file, 4096):   # copy file rows as raw bytes
+                    spans = np.asarray(self._spans[a: a + 4096])
+                    new = np.empty_like(spans)
+                    for j, (start, id_end, text_end, end) in enumerate(spans):
+                        fb.write(self._mm[int(start): int(end)])
+                        new[j] = (pos, pos + id_end - start, pos + text_end - start, pos + end - start)
+                        pos += int(end - start)
+                    fi.write(new.tobytes())
+                self._write_tail(fb, fi, pos)
+            os.replace(bin_path + ".tmp", bin_path)     # an mmap of the old file stays valid
+            os.replace(idx_path + ".tmp", idx_path)
+        self._attach(folder, n)
+
+    def _write_tail(self, fb, fi, pos: int) -> None:
+        spans = np.empty((len(self._ids), 4), dtype=np.int64)
+        for j, rec in enumerate(zip(self._ids, self._texts, self._metas)):
+            id_b, text_b, meta_b = _encode(*rec)
+            spans[j] = (pos, pos + len(id_b), pos + len(id_b) + len(text_b), pos + len(id_b) + len(text_b) + len(meta_b))
+            fb.write(id_b + text_b + meta_b)
+            pos = int(spans[j, 3])
+        fi.write(spans.tobytes())
+
+    def _attach(self, folder: str, n: int) -> None:
+        store = ChunkStore.open(folder, n)
+        self.__dict__.update(store.__dict__)
+
+    @classmethod
+    def open(cls, folder_path: str, n: int) -> "ChunkStore":
+        """Memory-map the first `n` rows of a saved store (constant time)."""
+        store = cls()
+        store._path = os.path.realpath(folder_path)
+        store._appendable = True
+        if n:
+            store._spans = np.memmap(os.path.join(folder_path, IDX_FILE), dtype=np.int64, mode="r", shape=(n, 4))
+            with open(os.path.join(folder_path, BIN_FILE), "rb") as fh:
+                store._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return store
+
+    @classmethod
+    def from_records(cls, records: Sequence[Tuple[str, str, Dict[str, Any]]]) -> "ChunkStore":
+        store = cls()
+        for rec in records:
+            store.append(*rec)
+        return store
@@ -0,0 +1,97 @@
+# VectorDB/hybrid.py
+# Hybrid lexical (BM25) + vector retrieval with reciprocal rank fusion.
+
+from __future__ import annotations
+from typing import Any, Dict, List, Literal, Sequence, Tuple
+
+import re
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from utils.instrument import timed
+from .bm25 import tokenize
+
+# Query tokens that look like identifiers: contain a digit or a ':'/'.'/'-' joint
+_IDENT_RE = re.compile(r"^(?=.*\d)\S+$|^\w+[:./\-]\w+")
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    weights: Sequence[float] = (),
+    rrf_k: int = 60,
+) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists: score(id) = sum_i w_i / (rrf_k + rank_i(id)), rank from 1.
+    Returns (id, fused score) best first.
+    """
+    fused: Dict[str, float] = {}
+    for i, ranking in enumerate(rankings):
+        w = weights[i] if i < len(weights) else 1.0
+        for rank, id_ in enumerate(ranking, start=1):
+            fused[id_] = fused.get(id_, 0.0) + w / (rrf_k + rank)
+    return sorted(fused.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def identifier_terms(query: str) -> List[str]:
+    """Whole identifier-like tokens in a query (e.g. 'empid:004', '17:35'), lowercased."""
+    return [tok for tok in dict.fromkeys(tokenize(query)) if _IDENT_RE.match(tok)]
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Retriever over a NumpyVectorStore created with lexical=True.
+
+    mode:
+      - "hybrid":  BM25 and vector top-`fetch_k`, fused with RRF
+      - "lexical": BM25 only (no embedding call)
+      - "vector":  plain vector search
+      - "auto":    lexical only when the query contains identifier tokens
+                   (e.g. "EmpID:004 exit time") and the best BM25 hit contains
+                   all of them; hybrid otherwise
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    store: Any
+    k: int = 4
+    fetch_k: int = 20
+    mode: Literal["auto", "hybrid", "lexical", "vector"] = "auto"
+    rrf_k: int = 60
+    lexical_weight: float = 1.0
+    vector_weight: float = 1.0
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return [doc for doc, _ in self.search_with_scores(query)]
+
+    @timed("vector.hybrid_search")
+    def search_with_scores(self, query: str) -> List[Tuple[Document, float]]:
+        """Retrieve (Document, score); scores are BM25, cosine or RRF depending on the path taken."""
+        store = self.store
+        if self.mode == "vector":
+            return store.similarity_search_with_score(query, k=self.k)
+        if store.bm25 is None:
+            raise ValueError("HybridRetriever needs a store built with lexical=True.")
+
+        lexical = store.bm25.search(query, self.fetch_k if self.mode != "lexical" else self.k)
+        if self.mode == "lexical" or (self.mode == "auto" and self._lexical_is_enough(query, lexical)):
+            return [(store.get_by_ids([id_])[0], score) for id_, score in lexical[: self.k]]
+
+        vector = store.similarity_search_with_score(query, k=self.fetch_k)
+        fused = reciprocal_rank_fusion(
+            [[id_ for id_, _ in lexical], [doc.id for doc, _ in vector]],
+            weights=(self.lexical_weight, self.vector_weight),
+            rrf_k=self.rrf_k,
+        )[: self.k]
+        docs = {doc.id: doc for doc, _ in vector}
+        missing = [id_ for id_, _ in fused if id_ not in docs]
+        docs.update({doc.id: doc for doc in store.get_by_ids(missing)})
+        return [(docs[id_], score) for id_, score in fused]
+
+    def _lexical_is_enough(self, query: str, lexical: List[Tuple[str, float]]) -> bool:
+        idents = identifier_terms(query)
+        return bool(idents and lexical and self.store.bm25.contains_all(lexical[0][0], idents))
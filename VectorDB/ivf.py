@@ -0,0 +1,235 @@
+# VectorDB/ivf.py
+# Approximate nearest-neighbour search: inverted file (IVF) over k-means cells.
+#
+# Vectors are clustered into `nlist` cells by spherical k-means; a query scans
+# only the `nprobe` cells whose centroids are closest to it. Same surface as
+# NumpyVectorStore (similarity_search*, as_retriever, save_local/load_local).
+
+from __future__ import annotations
+from typing import Any, Optional, Tuple, Type
+
+import math
+import os
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .numpy_store import NumpyVectorStore, normalize_rows, top_k
+
+_ASSIGN_BLOCK = 8192
+
+
+def assign_to_centroids(data: np.ndarray, centroids: np.ndarray, spherical: bool = True) -> np.ndarray:
+    """Nearest centroid per row (max inner product, or min L2 if spherical=False), in blocks."""
+    out = np.empty(data.shape[0], dtype=np.int32)
+    bias = None if spherical else 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+    for a in range(0, data.shape[0], _ASSIGN_BLOCK):
+        sims = data[a: a + _ASSIGN_BLOCK] @ centroids.T
+        if bias is not None:
+            sims -= bias  # argmin ||x-c||^2 == argmax (x.c - ||c||^2 / 2)
+        out[a: a + _ASSIGN_BLOCK] = np.argmax(sims, axis=1)
+    return out
+
+
+def kmeans(
+    data: np.ndarray,
+    n_clusters: int,
+    n_iter: int = 20,
+    seed: int = 0,
+    spherical: bool = True,
+) -> np.ndarray:
+    """
+    Lloyd's k-means in NumPy. spherical=True keeps centroids unit-norm
+    (cosine k-means, for normalized embeddings); False is plain Euclidean.
+    Empty clusters are re-seeded from random points.
+    """
+    data = np.asarray(data, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    n = data.shape[0]
+    k = min(n_clusters, n)
+    centroids = data[rng.choice(n, k, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = assign_to_centroids(data, centroids, spherical)
+        counts = np.bincount(assign, minlength=k)
+        # per-cluster sums via one sort + reduceat (much faster than np.add.at)
+        order = np.argsort(assign, kind="stable")
+        present = np.flatnonzero(counts)
+        starts = np.concatenate([[0], np.cumsum(counts[present])[:-1]])
+        sums = np.zeros_like(centroids)
+        sums[present] = np.add.reduceat(data[order], starts, axis=0)
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = data[rng.choice(n, int(empty.sum()), replace=False)]
+            counts[empty] = 1
+        new = normalize_rows(sums) if spherical else sums / counts[:, None]
+        if np.allclose(new, centroids, atol=1e-6):
+            centroids = new
+            break
+        centroids = new
+    return centroids.astype(np.float32)
+
+
+class IVFVectorStore(NumpyVectorStore):
+    """
+    IVF approximate index on top of NumpyVectorStore.
+
+    Parameters
+    ----------
+    nlist : Optional[int]
+        Number of k-means cells. None -> about 4*sqrt(n) at training time.
+    nprobe : int
+        Cells scanned per query; recall/latency knob (nprobe=nlist == exact).
+    n_iter : int
+        k-means iterations when training.
+    train_size : Optional[int]
+        Max vectors sampled for training (default 64 * nlist).
+    min_train : int
+        Below this many vectors the index stays untrained and searches exactly.
+    kwargs :
+        Passed to NumpyVectorStore (compact_threshold, lexical).
+
+    The index trains lazily on the first search once `min_train` vectors are
+    present (or explicitly via train()); later additions are assigned to the
+    existing cells. Call train() again after large additions to re-balance.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        nlist: Optional[int] = None,
+        nprobe: int = 16,
+        n_iter: int = 20,
+        train_size: Optional[int] = None,
+        min_train: int = 1000,
+        seed: int = 0,
+        **kwargs: Any,
+    ):
+        super().__init__(embedding, **kwargs)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.n_iter = n_iter
+        self.train_size = train_size
+        self.min_train = min_train
+        self.seed = seed
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.empty(0, dtype=np.int32)     # cell id per row
+        self._order: Optional[np.ndarray] = None       # rows grouped by cell (CSR)
+        self._offsets: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    # ----------------------------
+    # Training / assignment
+    # ----------------------------
+    def train(self) -> None:
+        """(Re)cluster all current vectors and rebuild the inverted lists."""
+        live = np.flatnonzero(self.alive)
+        n = live.shape[0]
+        if n == 0:
+            raise ValueError("Cannot train an empty index.")
+        nlist = self.nlist or max(1, int(4 * math.sqrt(n)))
+        nlist = min(nlist, n)
+        sample_size = min(n, self.train_size or 64 * nlist)
+        rng = np.random.default_rng(self.seed)
+        if sample_size == n and not self._n_dead:
+            sample = self.vectors
+        else:
+            sample = self.vectors[np.sort(rng.choice(live, sample_size, replace=False))]
+        self._centroids = kmeans(sample, nlist, n_iter=self.n_iter, seed=self.seed)
+        self._assign = assign_to_centroids(self.vectors, self._centroids)
+        self._order = None
+
+    def _append_vectors(self, vectors: np.ndarray) -> None:
+        start = self._n
+        super()._append_vectors(vectors)
+        if self._centroids is not None:
+            new = assign_to_centroids(self.vectors[start:], self._centroids)
+            self._assign = np.concatenate([self._assign, new])
+            self._order = None
+
+    def _compact_rows(self, keep: np.ndarray) -> None:
+        if self._centroids is not None:
+            self._assign = self._assign[keep]
+            self._order = None
+
+    def _lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._order is None:
+            self._order = np.argsort(self._assign, kind="stable").astype(np.int64)
+            counts = np.bincount(self._assign, minlength=self._centroids.shape[0])
+            self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return self._order, self._offsets
+
+    # ----------------------------
+    # Search
+    # ----------------------------
+    def _search(
+        self,
+        query: np.ndarray,
+        k: int,
+        nprobe: Optional[int] = None,
+        mask: Optional[np.ndarray] = None,
+        **kwargs: Any,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        IVF probe; `nprobe` (e.g. similarity_search(q, nprobe=32)) overrides the
+        default per query. With a filter `mask`, only its rows in the probed
+        cells are scored.
+        """
+        if not self.is_trained and len(self) >= self.min_train:
+            self.train()
+        if not self.is_trained:
+            return super()._search(query, k, mask=mask, **kwargs)
+
+        order, offsets = self._lists()
+        probe = min(nprobe or self.nprobe, self._centroids.shape[0])
+        cells = top_k(self._centroids @ query, probe)
+        cand = np.concatenate([order[offsets[c]: offsets[c + 1]] for c in cells])
+        if mask is not None:
+            cand = cand[mask[cand]]
+        elif self._n_dead:
+            cand = cand[self.alive[cand]]
+        if cand.size == 0:
+            return cand, np.empty(0, dtype=np.float32)
+        scores = self.vectors[cand] @ query
+        best = top_k(scores, k)
+        return cand[best], scores[best]
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def save_local(self, folder_path: str) -> None:
+        super().save_local(folder_path)
+        path = os.path.join(folder_path, "ivf.npz")
+        if self.is_trained:
+            np.savez(
+                path,
+                centroids=self._centroids,
+                assign=self._assign,
+                params=np.array([self.nprobe, self.n_iter, self.min_train, self.seed], dtype=np.int64),
+            )
+        elif os.path.exists(path):
+            os.remove(path)     # left by an earlier save; would not match these rows
+
+    @classmethod
+    def load_local(
+        cls: Type["IVFVectorStore"],
+        folder_path: str,
+        embeddings: Embeddings,
+        mmap: bool = True,
+        **kwargs: Any,
+    ) -> "IVFVectorStore":
+        store = super().load_local(folder_path, embeddings, mmap=mmap, **kwargs)
+        path = os.path.join(folder_path, "ivf.npz")
+        if os.path.exists(path):
+            with np.load(path, allow_pickle=False) as data:
+                if data["assign"].shape[0] != store._n:
+                    raise ValueError(
+                        f"ivf.npz in {folder_path} covers {data['assign'].shape[0]} rows, the store has {store._n}"
+                    )
+                store._centroids = data["centroids"]
+                store._assign = data["assign"]
+                if "nprobe" not in kwargs:
+                    store.nprobe = int(data["params"][0])
+        return store
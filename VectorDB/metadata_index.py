@@ -0,0 +1,226 @@
+# VectorDB/metadata_index.py
+# Metadata index for pre-filtered vector search.
+#
+# Built incrementally as rows are added (ingestion time), per field:
+#   - value -> sorted row-id array (posting list) for equality / $in
+#   - numeric column + argsort order for range conditions ($lt, $gte, ...)
+# A filter resolves to a boolean row mask before any vector is scored, so a
+# selective filter (one source, a page range) scores only its candidates.
+#
+# Filters are dicts in the Mongo/Chroma style used by LangChain retrievers:
+#
+#   {"source": "Content/attention.pdf", "page": {"$lt": 5}}
+#   {"$or": [{"source": "a.txt"}, {"row": {"$gte": 100}}]}
+#
+# Operators: $eq $ne $gt $gte $lt $lte $in $nin, and $and / $or / $not.
+# A plain value means $eq; several fields in one dict are ANDed. `matches()`
+# is the reference semantics (a missing field reads as None); fields that are
+# not indexed, and arguments the posting lists cannot look up (lists, dicts),
+# are resolved by scanning with it.
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numbers
+
+import numpy as np
+
+_COMPARE = {
+    "$gt": lambda a, b: a > b,
+    "$gte": lambda a, b: a >= b,
+    "$lt": lambda a, b: a < b,
+    "$lte": lambda a, b: a <= b,
+}
+OPERATORS = ("$eq", "$ne", "$in", "$nin", *_COMPARE)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _check_op(op: str) -> None:
+    if op not in OPERATORS:
+        raise ValueError(f"Unknown filter operator {op!r}; supported: {OPERATORS + ('$and', '$or', '$not')}")
+
+
+def _condition(value: Any, op: str, arg: Any) -> bool:
+    _check_op(op)
+    if op == "$eq":
+        return value == arg
+    if op == "$ne":
+        return value != arg
+    if op == "$in":
+        return value in arg
+    if op == "$nin":
+        return value not in arg
+    return _is_number(value) and _is_number(arg) and _COMPARE[op](value, arg)
+
+
+def matches(metadata: Mapping[str, Any], flt: Mapping[str, Any]) -> bool:
+    """Reference evaluation of a filter against one metadata dict."""
+    for key, cond in flt.items():
+        if key == "$and":
+            if not all(matches(metadata, f) for f in cond):
+                return False
+        elif key == "$or":
+            if not any(matches(metadata, f) for f in cond):
+                return False
+        elif key == "$not":
+            if matches(metadata, cond):
+                return False
+        else:
+            value = metadata.get(key)
+            ops = cond.items() if isinstance(cond, Mapping) else (("$eq", cond),)
+            if not all(_condition(value, op, arg) for op, arg in ops):
+                return False
+    return True
+
+
+class MetadataIndex:
+    """
+    Per-field posting lists and numeric columns over a store's rows.
+
+    Parameters
+    ----------
+    fields : Optional[Sequence[str]]
+        Fields to index; None indexes every field. Scalar values (str / int /
+        float / bool / None) get posting lists; conditions on other values
+        (lists, dicts) and on fields that are not indexed are filtered by scan.
+    """
+
+    def __init__(self, fields: Optional[Sequence[str]] = None):
+        self.fields = None if fields is None else set(fields)
+        self._n = 0
+        self._postings: Dict[str, Dict[Any, List[int]]] = {}
+        self._present: Dict[str, List[int]] = {}     # rows that have the field (any value)
+        self._numbers: Dict[str, Dict[int, float]] = {}
+        self._frozen: Dict[str, Any] = {}   # field -> cached numpy arrays (dropped on add)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _wants(self, key: str) -> bool:
+        return self.fields is None or key in self.fields
+
+    # ----------------------------
+    # Building
+    # ----------------------------
+    def add(self, start: int, metadatas: Iterable[Mapping[str, Any]]) -> None:
+        """Index rows start, start+1, ... (rows must be added in increasing order)."""
+        row = start
+        for meta in metadatas:
+            for key, value in meta.items():
+                if not self._wants(key):
+                    continue
+                self._present.setdefault(key, []).append(row)
+                self._frozen.pop(key, None)
+                if not (value is None or isinstance(value, (str, bool, numbers.Real))):
+                    continue
+                self._postings.setdefault(key, {}).setdefault(value, []).append(row)
+                if _is_number(value) and value == value:
+                    self._numbers.setdefault(key, {})[row] = float(value)
+            row += 1
+        self._n = max(self._n, row)
+
+    def rebuild(self, metadatas: Sequence[Mapping[str, Any]]) -> None:
+        """Re-index from scratch (after rows were renumbered by compaction)."""
+        self._n = 0
+        self._postings.clear()
+        self._present.clear()
+        self._numbers.clear()
+        self._frozen.clear()
+        self.add(0, metadatas)
+
+    def _field(self, key: str) -> Dict[str, Any]:
+        """Posting arrays, rows with the field and (values, rows) sorted by value, built on first use."""
+        frozen = self._frozen.get(key)
+        if frozen is None:
+            postings = {v: np.asarray(rows, dtype=np.int64) for v, rows in self._postings.get(key, {}).items()}
+            nums = self._numbers.get(key, {})
+            rows = np.fromiter(nums.keys(), dtype=np.int64, count=len(nums))
+            values = np.fromiter(nums.values(), dtype=np.float64, count=len(nums))
+            order = np.argsort(values, kind="stable")
+            present = np.asarray(self._present.get(key, ()), dtype=np.int64)
+            frozen = self._frozen[key] = {"postings": postings, "present": present,
+                                          "values": values[order], "rows": rows[order]}
+        return frozen
+
+    def is_indexed(self, key: str) -> bool:
+        return key in self._present or (self.fields is not None and key in self.fields)
+
+    # ----------------------------
+    # Resolution
+    # ----------------------------
+    def mask(
+        self,
+        flt: Mapping[str, Any],
+        n: int,
+        scan: Optional[Callable[[str, Callable[[Any], bool]], np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Boolean mask [n] of rows matching `flt` (as `matches()` would). `scan(key,
+        predicate)` resolves what the index cannot (it must return a mask [n]).
+        """
+        out = np.ones(n, dtype=bool)
+        for key, cond in flt.items():
+            if key == "$and":
+                for f in cond:
+                    out &= self.mask(f, n, scan)
+            elif key == "$or":
+                any_ = np.zeros(n, dtype=bool)
+                for f in cond:
+                    any_ |= self.mask(f, n, scan)
+                out &= any_
+            elif key == "$not":
+                out &= ~self.mask(cond, n, scan)
+            else:
+                ops = cond.items() if isinstance(cond, Mapping) else (("$eq", cond),)
+                for op, arg in ops:
+                    out &= self._op_mask(key, op, arg, n, scan)
+        return out
+
+    def _rows_mask(self, rows: np.ndarray, n: int) -> np.ndarray:
+        m = np.zeros(n, dtype=bool)
+        m[rows[rows < n]] = True
+        return m
+
+    def _op_mask(self, key: str, op: str, arg: Any, n: int, scan) -> np.ndarray:
+        _check_op(op)
+        if not self.is_indexed(key):
+            return self._scan(key, op, arg, scan)
+        field = self._field(key)
+        if op in ("$eq", "$ne", "$in", "$nin"):
+            wanted = (arg,) if op in ("$eq", "$ne") else arg
+            if not isinstance(wanted, (list, tuple, set, frozenset)) or not all(_hashable(v) for v in wanted):
+                return self._scan(key, op, arg, scan)      # e.g. {"tags": ["a", "b"]}
+            hits = [field["postings"][v] for v in wanted if v in field["postings"]]
+            m = self._rows_mask(np.concatenate(hits), n) if hits else np.zeros(n, dtype=bool)
+            if any(v is None for v in wanted):     # matches() reads a missing field as None
+                m |= ~self._rows_mask(field["present"], n)
+            return ~m if op in ("$ne", "$nin") else m
+        if not _is_number(arg):
+            return np.zeros(n, dtype=bool)
+        values, rows = field["values"], field["rows"]
+        if op == "$gt":
+            sel = rows[np.searchsorted(values, arg, side="right"):]
+        elif op == "$gte":
+            sel = rows[np.searchsorted(values, arg, side="left"):]
+        elif op == "$lt":
+            sel = rows[: np.searchsorted(values, arg, side="left")]
+        else:
+            sel = rows[: np.searchsorted(values, arg, side="right")]
+        return self._rows_mask(sel, n)
+
+    @staticmethod
+    def _scan(key: str, op: str, arg: Any, scan) -> np.ndarray:
+        if scan is None:
+            raise KeyError(f"Filter on field {key!r} needs a scan (not indexed, or an unhashable argument)")
+        return scan(key, lambda value: _condition(value, op, arg))
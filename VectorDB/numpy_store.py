@@ -0,0 +1,689 @@
+# VectorDB/numpy_store.py
+# In-project flat vector store on NumPy: exact cosine top-k, no FAISS, no pickle.
+#
+# On disk (save_local / load_local):
+#   <folder>/vectors.npy   float32 [n, dim], L2-normalized, loaded with mmap_mode="r"
+#   <folder>/chunks.bin    append-only id / text / metadata records (see chunk_store)
+#   <folder>/chunks.idx    int64 byte offsets of each record, memory-mapped
+#   <folder>/meta.json     format version, dim, count, indexed metadata fields
+#   <folder>/bm25.json     lexical index (only for stores created with lexical=True)
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type, Union
+
+import json
+import os
+import uuid
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from utils import instrument
+from utils.documents import chunk_id, content_hash
+from .bm25 import BM25Index
+from .chunk_store import ChunkStore
+from .metadata_index import MetadataIndex, matches
+
+STORE_VERSION = 2       # 1: texts and metadata in docs.jsonl (still readable)
+_MIN_CAPACITY = 256
+_SCORE_BUDGET = 1 << 20     # float32 scores per block in _search_many (4 MiB, cache-friendly)
+_QUERY_BLOCK = 256
+_GATHER_FRACTION = 0.25     # filtered search copies out the candidates below this fraction of rows
+
+
+def normalize_rows(mat: np.ndarray) -> np.ndarray:
+    """L2-normalize rows as float32 (zero rows stay zero)."""
+    mat = np.asarray(mat, dtype=np.float32)
+    if mat.ndim == 1:
+        mat = mat[None, :]
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first (argpartition + sort of k)."""
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(n)
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """Per-row `top_k` of a [m, n] score matrix -> [m, min(k, n)] column indices, best first."""
+    n = scores.shape[1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    idx = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < n else np.broadcast_to(np.arange(n), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def _blocked_top_k(
+    queries: np.ndarray,
+    vectors: np.ndarray,
+    k: int,
+    block_rows: Optional[int] = None,
+    valid: Optional[np.ndarray] = None,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Exact top-k of each query over `vectors` (rows where `valid` is False never
+    win; k must not exceed the number of valid rows). One matrix-matrix product
+    per (query block, corpus block), each keeping only its top k per query, so
+    memory stays at about _SCORE_BUDGET floats however large the corpus is.
+    """
+    n = vectors.shape[0]
+    out: List[Tuple[np.ndarray, np.ndarray]] = []
+    for qa in range(0, queries.shape[0], _QUERY_BLOCK):
+        qb = queries[qa: qa + _QUERY_BLOCK]
+        step = max(k, block_rows or _SCORE_BUDGET // qb.shape[0])
+        best_rows = best_scores = None
+        for a in range(0, n, step):
+            scores = qb @ vectors[a: a + step].T
+            if valid is not None:
+                scores[:, ~valid[a: a + step]] = -np.inf
+            idx = top_k_rows(scores, k)
+            rows, vals = idx + a, np.take_along_axis(scores, idx, axis=1)
+            if best_rows is not None:   # merge with the best of the earlier blocks
+                rows = np.concatenate([best_rows, rows], axis=1)
+                vals = np.concatenate([best_scores, vals], axis=1)
+                keep = top_k_rows(vals, k)
+                rows, vals = np.take_along_axis(rows, keep, axis=1), np.take_along_axis(vals, keep, axis=1)
+            best_rows, best_scores = rows, vals
+        out.extend(zip(best_rows, best_scores))
+    return out
+
+
+@dataclass
+class UpsertResult:
+    added: int = 0       # ids not in the store before
+    updated: int = 0     # existing ids whose text/metadata changed
+    unchanged: int = 0   # identical, nothing done
+    deleted: int = 0     # removed by sync_source
+    embedded: int = 0    # texts actually sent to the embedder
+    reused: int = 0      # vectors copied from an existing row with identical text
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Exact nearest-neighbour store over pre-normalized float32 embeddings.
+
+    Search is one matrix-vector product plus argpartition; scores are cosine
+    similarities (higher is better, unlike FAISS's L2 distances). Persistence
+    is plain .npy + an append-only chunk file, so loading needs no
+    allow_dangerous_deserialization and takes constant time: the matrix and
+    the chunk records are memory-mapped, and a chunk's text and metadata are
+    decoded only when it is returned (or an id lookup / filter scan needs it).
+
+    Rows are addressed by stable string ids. upsert_documents()/sync_source()
+    only embed new or changed chunks; delete() tombstones rows, which are
+    skipped by search and physically removed by compact() (run automatically
+    once `compact_threshold` of the rows are dead, and before save_local).
+
+    With lexical=True a BM25 index is maintained alongside the vectors (same
+    ids) and saved next to them; see lexical_search() and HybridRetriever.
+
+    Every search method accepts filter={...} on metadata (see
+    VectorDB.metadata_index): matching rows are found first and only they are
+    scored. With metadata_index=True (or a list of fields) the filter is
+    resolved from posting lists built as rows are added instead of a scan
+    over every row's metadata.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        compact_threshold: float = 0.25,
+        lexical: bool = False,
+        metadata_index: Union[bool, Sequence[str]] = False,
+    ):
+        self._embedding = embedding
+        self.compact_threshold = compact_threshold
+        self.bm25: Optional[BM25Index] = BM25Index() if lexical else None
+        self.meta_index: Optional[MetadataIndex] = None
+        if metadata_index:
+            self.meta_index = MetadataIndex(None if metadata_index is True else metadata_index)
+        self.version = 0     # bumped on every mutation (cache invalidation)
+        self._buf = np.zeros((0, 0), dtype=np.float32)   # capacity >= count rows
+        self._alive = np.zeros(0, dtype=bool)            # False -> tombstoned row
+        self._n = 0
+        self._n_dead = 0
+        self._chunks = ChunkStore()                      # row -> (id, text, metadata)
+        self._id_map: Optional[Dict[str, int]] = None    # live id -> row, built on first use
+        self._meta_index_stale = False                   # loaded store: index built on first filter
+
+    # ----------------------------
+    # Basic properties
+    # ----------------------------
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    @property
+    def dim(self) -> int:
+        return int(self._buf.shape[1])
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Normalized embedding matrix [n, dim] (a view, do not modify)."""
+        return self._buf[: self._n]
+
+    @property
+    def alive(self) -> np.ndarray:
+        """Boolean mask [n] of live (not tombstoned) rows."""
+        return self._alive[: self._n]
+
+    def __len__(self) -> int:
+        return self._n - self._n_dead
+
+    @property
+    def _id_to_row(self) -> Dict[str, int]:
+        if self._id_map is None:
+            alive = self.alive
+            self._id_map = {id_: row for row, id_ in enumerate(self._chunks.ids()) if alive[row]}
+        return self._id_map
+
+    def _select_relevance_score_fn(self):
+        # cosine similarity in [-1, 1] -> relevance in [0, 1]
+        return lambda score: (score + 1.0) / 2.0
+
+    # ----------------------------
+    # Adding
+    # ----------------------------
+    def _append_vectors(self, vectors: np.ndarray) -> None:
+        vectors = normalize_rows(vectors)
+        if self._n == 0 and self._buf.shape[1] == 0:
+            self._buf = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match store dimension {self.dim}")
+        need = self._n + vectors.shape[0]
+        if need > self._buf.shape[0] or not self._buf.flags.writeable:
+            cap = max(_MIN_CAPACITY, self._buf.shape[0])
+            while cap < need:
+                cap *= 2
+            buf = np.empty((cap, self.dim), dtype=np.float32)
+            buf[: self._n] = self._buf[: self._n]   # copies out of an mmap on first write
+            self._buf = buf
+        if self._alive.shape[0] < self._buf.shape[0]:
+            alive = np.zeros(self._buf.shape[0], dtype=bool)
+            alive[: self._n] = self._alive[: self._n]
+            self._alive = alive
+        self._buf[self._n: need] = vectors
+        self._alive[self._n: need] = True
+        self._n = need
+        self.version += 1
+
+    def add_embeddings(
+        self,
+        texts: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[dict]] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        """Add texts with precomputed embeddings (no embedding call)."""
+        if metadatas is not None and len(metadatas) != len(texts):
+            raise ValueError("The number of metadatas must match the number of texts.")
+        if ids is not None and len(ids) != len(texts):
+            raise ValueError("The number of ids must match the number of texts.")
+        if len(vectors) != len(texts):
+            raise ValueError("The number of vectors must match the number of texts.")
+        if not texts:
+            return []
+        ids = [id_ or uuid.uuid4().hex for id_ in ids] if ids is not None else [uuid.uuid4().hex for _ in texts]
+        dupes = [i for i in ids if i in self._id_to_row]
+        if dupes or len(set(ids)) != len(ids):
+            raise ValueError(f"Duplicate ids: {dupes[:5] or 'within the batch'}")
+
+        id_to_row = self._id_to_row
+        self._append_vectors(np.asarray(vectors, dtype=np.float32))
+        start = len(self._chunks)
+        added = [dict(metadatas[offset]) if metadatas is not None else {} for offset in range(len(texts))]
+        for offset, (id_, text) in enumerate(zip(ids, texts)):
+            id_to_row[id_] = start + offset
+            self._chunks.append(id_, text, added[offset])
+        if self.meta_index is not None and not self._meta_index_stale:
+            self.meta_index.add(start, added)
+        if self.bm25 is not None:
+            self.bm25.add(ids, texts)
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        with instrument.timer("embed.documents"):
+            vectors = self._embedding.embed_documents(texts)
+        instrument.count("embed.texts", len(texts))
+        return self.add_embeddings(texts, vectors, metadatas, ids)
+
+    @classmethod
+    def from_texts(
+        cls: Type["NumpyVectorStore"],
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        store = cls(embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
+
+    # ----------------------------
+    # Lookup
+    # ----------------------------
+    def _document(self, row: int) -> Document:
+        id_, text, metadata = self._chunks.get(row)
+        return Document(id=id_, page_content=text, metadata=dict(metadata))
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        return [self._document(self._id_to_row[i]) for i in ids if i in self._id_to_row]
+
+    def _search(
+        self, query: np.ndarray, k: int, mask: Optional[np.ndarray] = None, **kwargs: Any
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Core search hook: normalized query vector -> (rows, scores), best first.
+        Subclasses (ANN, quantized, ...) override this; search kwargs given to
+        the similarity_search* methods are passed through. `mask` (bool [n],
+        live rows only) restricts the results to its rows, for filtered search.
+        """
+        valid = len(self) if mask is None else int(np.count_nonzero(mask))
+        if valid == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = self.vectors @ query
+        if mask is not None:
+            scores[~mask] = -np.inf
+        elif self._n_dead:
+            scores[~self.alive] = -np.inf
+        rows = top_k(scores, min(k, valid))
+        return rows, scores[rows]
+
+    def _search_many(
+        self,
+        queries: np.ndarray,
+        k: int,
+        block_rows: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Batched `_search`: normalized query matrix [m, dim] -> per-query (rows, scores),
+        scored block by block (see _blocked_top_k). `block_rows` overrides the
+        corpus block size. Subclasses with their own `_search` (IVF,
+        quantized) fall back to one `_search` per query.
+        """
+        if type(self)._search is not NumpyVectorStore._search:
+            return [self._search(q, k, **kwargs) for q in queries]
+        k = min(k, len(self))
+        if k <= 0:
+            return [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))] * queries.shape[0]
+        return _blocked_top_k(queries, self.vectors, k, block_rows, self.alive if self._n_dead else None)
+
+    # ----------------------------
+    # Metadata filters
+    # ----------------------------
+    def _scan_field(self, key: str, predicate) -> np.ndarray:
+        return np.fromiter((predicate(m.get(key)) for m in self._chunks.metadatas()), dtype=bool, count=self._n)
+
+    def filter_mask(self, filter: Mapping[str, Any]) -> np.ndarray:
+        """Boolean mask [n] of live rows whose metadata matches `filter`."""
+        with instrument.timer("vector.filter"):
+            if self.meta_index is not None:
+                if self._meta_index_stale:
+                    self.meta_index.rebuild(list(self._chunks.metadatas()))
+                    self._meta_index_stale = False
+                mask = self.meta_index.mask(filter, self._n, self._scan_field)
+            else:
+                mask = np.fromiter((matches(m, filter) for m in self._chunks.metadatas()), dtype=bool, count=self._n)
+            if self._n_dead:
+                mask &= self.alive
+        return mask
+
+    def _filtered_search_many(
+        self,
+        queries: np.ndarray,
+        k: int,
+        filter: Mapping[str, Any],
+        block_rows: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Top-k among the rows matching `filter` only. A selective filter copies
+        its candidate rows out and scores just those exactly; a broad one
+        searches every row with the rest masked (cheaper than the copy) --
+        through the subclass's own `_search` when it has one (IVF cells,
+        quantized codes), otherwise by exact blocked scoring.
+        """
+        mask = self.filter_mask(filter)
+        cand = np.flatnonzero(mask)
+        k = min(k, cand.size)
+        if k <= 0:
+            return [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))] * queries.shape[0]
+        if cand.size >= _GATHER_FRACTION * self._n:
+            if type(self)._search is not NumpyVectorStore._search:
+                return [self._search(q, k, mask=mask, **kwargs) for q in queries]
+            return _blocked_top_k(queries, self.vectors, k, block_rows, mask)
+        hits = _blocked_top_k(queries, np.asarray(self.vectors[cand]), k, block_rows)
+        return [(cand[rows], scores) for rows, scores in hits]
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: Sequence[float],
+        k: int = 4,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        """Top-k (Document, cosine similarity) for a raw query vector."""
+        query = normalize_rows(embedding)[0]
+        if self._n and query.shape[0] != self.dim:
+            raise ValueError(f"Query dimension {query.shape[0]} does not match store dimension {self.dim}")
+        flt = kwargs.pop("filter", None)
+        with instrument.timer("vector.search"):
+            if flt is None:
+                rows, scores = self._search(query, k, **kwargs)
+            else:
+                rows, scores = self._filtered_search_many(query[None, :], k, flt, **kwargs)[0]
+        return [(self._document(int(r)), float(s)) for r, s in zip(rows, scores)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        with instrument.timer("embed.query"):
+            vector = self._embedding.embed_query(query)
+        return self.similarity_search_with_score_by_vector(vector, k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    # ----------------------------
+    # Batched search
+    # ----------------------------
+    def similarity_search_many_with_score_by_vector(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        k: int = 4,
+        **kwargs: Any,
+    ) -> List[List[Tuple[Document, float]]]:
+        """Top-k (Document, cosine similarity) for each query vector, scored in one batch."""
+        if len(embeddings) == 0:
+            return []
+        queries = normalize_rows(embeddings)
+        if self._n and queries.shape[1] != self.dim:
+            raise ValueError(f"Query dimension {queries.shape[1]} does not match store dimension {self.dim}")
+        flt = kwargs.pop("filter", None)
+        with instrument.timer("vector.search_many", queries=queries.shape[0]):
+            if flt is None:
+                hits = self._search_many(queries, k, **kwargs)
+            else:
+                hits = self._filtered_search_many(queries, k, flt, **kwargs)
+        return [[(self._document(int(r)), float(s)) for r, s in zip(rows, scores)] for rows, scores in hits]
+
+    def similarity_search_many_by_vector(
+        self, embeddings: Sequence[Sequence[float]], k: int = 4, **kwargs: Any
+    ) -> List[List[Document]]:
+        return [[doc for doc, _ in hits] for hits in self.similarity_search_many_with_score_by_vector(embeddings, k, **kwargs)]
+
+    def similarity_search_many_with_score(
+        self, queries: Sequence[str], k: int = 4, queries_as_documents: bool = False, **kwargs: Any
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Batched similarity_search_with_score: each query is embedded with
+        embed_query (so results match the one-at-a-time call), then all are
+        scored together. Results are in query order.
+
+        queries_as_documents=True embeds them in one embed_documents call
+        instead, which saves round-trips but is only equivalent for symmetric
+        embedders (not for instruction- or prefix-based query embeddings; cf.
+        EmbeddingEngine's coalesce_as_documents).
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        with instrument.timer("embed.queries"):
+            if queries_as_documents:
+                vectors = self._embedding.embed_documents(queries)
+            else:
+                vectors = [self._embedding.embed_query(q) for q in queries]
+        instrument.count("embed.texts", len(queries))
+        return self.similarity_search_many_with_score_by_vector(vectors, k, **kwargs)
+
+    def similarity_search_many(self, queries: Sequence[str], k: int = 4, **kwargs: Any) -> List[List[Document]]:
+        """One list of Documents per query (see similarity_search_many_with_score)."""
+        return [[doc for doc, _ in hits] for hits in self.similarity_search_many_with_score(queries, k, **kwargs)]
+
+    def lexical_search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        """BM25 top-k (Document, score); no embedding call. Requires lexical=True."""
+        if self.bm25 is None:
+            raise ValueError("This store was created without a lexical index (lexical=True).")
+        with instrument.timer("vector.lexical_search"):
+            hits = self.bm25.search(query, k)
+        return [(self._document(self._id_to_row[id_]), score) for id_, score in hits]
+
+    def as_hybrid_retriever(self, **kwargs: Any):
+        """HybridRetriever (BM25 + vectors, reciprocal rank fusion) over this store."""
+        from .hybrid import HybridRetriever
+
+        return HybridRetriever(store=self, **kwargs)
+
+    # ----------------------------
+    # Upsert / delete / compaction
+    # ----------------------------
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Tombstone rows by id (None -> delete everything). Returns False if nothing matched."""
+        if ids is None:
+            rows = [int(r) for r in np.flatnonzero(self.alive)]
+        else:
+            rows = [self._id_to_row[i] for i in dict.fromkeys(ids) if i in self._id_to_row]
+        if not rows:
+            return False
+        id_to_row = self._id_to_row
+        for r in rows:
+            del id_to_row[self._chunks.id(r)]
+        self._alive[rows] = False
+        self._n_dead += len(rows)
+        self.version += 1
+        self._on_delete(rows)
+        self.maybe_compact()
+        return True
+
+    def _on_delete(self, rows: List[int]) -> None:
+        """Hook for side indexes when rows are tombstoned."""
+        if self.bm25 is not None:
+            self.bm25.remove(self._chunks.id(r) for r in rows)
+
+    def maybe_compact(self) -> bool:
+        """Compact if the dead-row fraction has reached `compact_threshold`."""
+        if self._n_dead and self._n_dead >= self.compact_threshold * self._n:
+            self.compact()
+            return True
+        return False
+
+    def compact(self) -> None:
+        """Physically drop tombstoned rows (renumbers rows; ids are unaffected)."""
+        if not self._n_dead:
+            return
+        keep = np.flatnonzero(self.alive)
+        self._buf = np.ascontiguousarray(self._buf[keep])
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._chunks = self._chunks.take(keep)
+        self._id_map = None
+        self._n = len(keep)
+        self._n_dead = 0
+        if self.meta_index is not None:
+            self._meta_index_stale = True
+        self._compact_rows(keep)
+        self.version += 1
+
+    def _compact_rows(self, keep: np.ndarray) -> None:
+        """Hook for subclasses holding per-row arrays: keep only rows `keep` (old numbering)."""
+
+    def upsert_documents(self, documents: Sequence[Document], ids: Optional[Sequence[str]] = None) -> UpsertResult:
+        """
+        Insert or replace Documents by stable id, embedding only what changed.
+
+        ids default to doc.id, then metadata["chunk_id"], then utils.chunk_id(doc).
+        Identical (id, text, metadata) rows are left alone; a changed row is
+        tombstoned and re-added. Before embedding, vectors are reused from any
+        live row of the same source with identical text (e.g. chunks that only
+        shifted position after an edit).
+        """
+        if ids is not None and len(ids) != len(documents):
+            raise ValueError("The number of ids must match the number of documents.")
+        batch: Dict[str, Document] = {}
+        for pos, doc in enumerate(documents):
+            id_ = ids[pos] if ids is not None else (doc.id or doc.metadata.get("chunk_id") or chunk_id(doc))
+            batch[id_] = doc   # last one wins within a batch
+
+        result = UpsertResult()
+        todo: List[Tuple[str, Document]] = []
+        replaced: List[str] = []
+        for id_, doc in batch.items():
+            row = self._id_to_row.get(id_)
+            if row is None:
+                result.added += 1
+            elif self._chunks.text(row) == doc.page_content and self._chunks.metadata(row) == doc.metadata:
+                result.unchanged += 1
+                continue
+            else:
+                result.updated += 1
+                replaced.append(id_)
+            todo.append((id_, doc))
+        if not todo:
+            return result
+
+        # vectors already in the store for identical text (same sources only)
+        sources = list({doc.metadata.get("source") for _, doc in todo})
+        by_hash: Dict[str, int] = {}
+        for row in np.flatnonzero(self.filter_mask({"source": {"$in": sources}})):
+            by_hash.setdefault(content_hash(self._chunks.text(row)), int(row))
+        vectors: List[Optional[np.ndarray]] = []
+        to_embed: List[int] = []
+        for pos, (_, doc) in enumerate(todo):
+            row = by_hash.get(content_hash(doc.page_content))
+            if row is not None:
+                vectors.append(np.array(self._buf[row]))
+                result.reused += 1
+            else:
+                vectors.append(None)
+                to_embed.append(pos)
+        if to_embed:
+            with instrument.timer("embed.documents"):
+                fresh = self._embedding.embed_documents([todo[p][1].page_content for p in to_embed])
+            instrument.count("embed.texts", len(to_embed))
+            for p, vec in zip(to_embed, fresh):
+                vectors[p] = np.asarray(vec, dtype=np.float32)
+            result.embedded = len(to_embed)
+
+        self.delete(replaced)
+        self.add_embeddings(
+            [doc.page_content for _, doc in todo],
+            np.stack(vectors),
+            [doc.metadata for _, doc in todo],
+            [id_ for id_, _ in todo],
+        )
+        return result
+
+    def sync_source(self, source: str, documents: Sequence[Document]) -> UpsertResult:
+        """
+        Make the rows of one `source` exactly `documents` (e.g. the new chunks of
+        an edited file): upsert them, then delete that source's stale ids.
+        """
+        result = self.upsert_documents(documents)
+        keep = {doc.id or doc.metadata.get("chunk_id") or chunk_id(doc) for doc in documents}
+        stale = [
+            id_
+            for id_ in (self._chunks.id(row) for row in np.flatnonzero(self.filter_mask({"source": source})))
+            if id_ not in keep
+        ]
+        if stale:
+            self.delete(stale)
+        result.deleted = len(stale)
+        return result
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def save_local(self, folder_path: str) -> None:
+        """
+        Write vectors.npy, the chunk files and meta.json into `folder_path`
+        (compacts first). Saving back to the folder a store was loaded from
+        appends only the new chunk records; meta.json is written last.
+        """
+        self.compact()
+        os.makedirs(folder_path, exist_ok=True)
+        vectors_path = os.path.join(folder_path, "vectors.npy")
+        with open(vectors_path + ".tmp", "wb") as fh:    # replaced, not truncated: it may be mmapped
+            np.save(fh, np.ascontiguousarray(self.vectors), allow_pickle=False)
+        os.replace(vectors_path + ".tmp", vectors_path)
+        self._chunks.save(folder_path)
+        meta = {"version": STORE_VERSION, "dim": self.dim, "count": self._n}
+        if self.meta_index is not None:
+            meta["metadata_index"] = sorted(self.meta_index.fields) if self.meta_index.fields is not None else True
+        meta_path = os.path.join(folder_path, "meta.json")
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        os.replace(meta_path + ".tmp", meta_path)
+        legacy = os.path.join(folder_path, "docs.jsonl")
+        if os.path.exists(legacy):
+            os.remove(legacy)
+        bm25_path = os.path.join(folder_path, "bm25.json")
+        if self.bm25 is not None:
+            self.bm25.save(bm25_path)
+        elif os.path.exists(bm25_path):
+            os.remove(bm25_path)    # left by an earlier lexical store; its ids are gone
+
+    @classmethod
+    def load_local(
+        cls: Type["NumpyVectorStore"],
+        folder_path: str,
+        embeddings: Embeddings,
+        mmap: bool = True,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        """
+        Open a store written by save_local. With mmap=True the matrix is not read
+        into RAM; chunk records are always memory-mapped, so opening takes the
+        same time for any number of rows (a lexical index is still read whole).
+        A saved store's metadata index is rebuilt on the first filtered search
+        unless metadata_index=False is passed.
+        """
+        with open(os.path.join(folder_path, "meta.json"), "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+        if meta.get("version") not in (1, STORE_VERSION):
+            raise ValueError(f"Unsupported store version {meta.get('version')} in {folder_path}")
+        kwargs.setdefault("metadata_index", meta.get("metadata_index", False))
+        store = cls(embeddings, **kwargs)
+        store._buf = np.load(
+            os.path.join(folder_path, "vectors.npy"),
+            mmap_mode="r" if mmap else None,
+            allow_pickle=False,
+        )
+        store._n = int(meta["count"])
+        store._alive = np.ones(store._n, dtype=bool)
+        if meta["version"] == 1:
+            with open(os.path.join(folder_path, "docs.jsonl"), "r", encoding="utf-8") as fh:
+                recs = (json.loads(line) for line in fh)
+                store._chunks = ChunkStore.from_records([(r["id"], r["page_content"], r["metadata"]) for r in recs])
+        else:
+            store._chunks = ChunkStore.open(folder_path, store._n)
+        store._meta_index_stale = store.meta_index is not None
+        bm25_path = os.path.join(folder_path, "bm25.json")
+        if os.path.exists(bm25_path):
+            store.bm25 = BM25Index.load(bm25_path)
+        return store
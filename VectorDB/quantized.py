@@ -0,0 +1,306 @@
+# VectorDB/quantized.py
+# Compressed vector storage: scalar int8 or product quantization (PQ), with
+# exact re-ranking of the best candidates.
+#
+# Search scans only the compact codes (int8: 1 byte per dimension, 4x smaller
+# than float32; PQ: 1 byte per sub-vector, e.g. 32x for 1024 dims / m=128),
+# then re-scores the top `rerank` candidates with the exact float32 vectors.
+# A store opened with load_local(mmap=True) keeps those vectors in
+# vectors.npy on disk: only the codes live in RAM, and re-ranking reads a few
+# rows of the memory map per query.
+#
+# On disk: the NumpyVectorStore files plus
+#   <folder>/quant.npz     codec, parameters, codebooks and codes
+
+from __future__ import annotations
+from typing import Any, Dict, Optional, Tuple, Type
+
+import os
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .ivf import kmeans
+from .numpy_store import NumpyVectorStore, top_k
+
+CODECS = ("int8", "pq")
+_BLOCK = 16384      # rows encoded at a time (bounds temporary memory)
+_SCORE_BLOCK = 2048     # rows scored at a time; the float32 temporary stays cache-sized
+
+
+# ----------------------------
+# Codecs
+# ----------------------------
+class ScalarQuantizer:
+    """Per-dimension affine int8 codes: x ~= lo + scale * (code + 128)."""
+
+    def __init__(self, lo: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None):
+        self.lo = lo
+        self.scale = scale
+
+    def train(self, data: np.ndarray) -> None:
+        lo, hi = data.min(axis=0), data.max(axis=0)
+        self.lo = lo.astype(np.float32)
+        self.scale = np.maximum((hi - lo) / 255.0, 1e-12).astype(np.float32)
+
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        codes = np.rint((data - self.lo) / self.scale) - 128.0
+        return np.clip(codes, -128, 127).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return self.lo + self.scale * (codes.astype(np.float32) + 128.0)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Approximate inner products of `query` with every coded row."""
+        qs = (query * self.scale).astype(np.float32)
+        bias = float(query @ self.lo) + 128.0 * float(qs.sum())
+        out = np.empty(codes.shape[0], dtype=np.float32)
+        for a in range(0, codes.shape[0], _SCORE_BLOCK):
+            out[a: a + _SCORE_BLOCK] = codes[a: a + _SCORE_BLOCK].astype(np.float32) @ qs
+        out += bias
+        return out
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"lo": self.lo, "scale": self.scale}
+
+
+class ProductQuantizer:
+    """
+    `m` sub-vectors of dim/m each, coded by the nearest of 256 k-means
+    centroids (one uint8 per sub-vector). Queries use asymmetric distance
+    computation: a [m, 256] table of query-sub-vector x centroid products,
+    summed over each row's codes.
+    """
+
+    def __init__(self, m: int, codebooks: Optional[np.ndarray] = None, n_iter: int = 15, seed: int = 0):
+        self.m = m
+        self.codebooks = codebooks      # [m, 256, dim / m]
+        self.n_iter = n_iter
+        self.seed = seed
+
+    def _split(self, data: np.ndarray) -> np.ndarray:
+        n, dim = data.shape
+        if dim % self.m:
+            raise ValueError(f"PQ needs dim divisible by m (dim={dim}, m={self.m})")
+        return data.reshape(n, self.m, dim // self.m)
+
+    def train(self, data: np.ndarray) -> None:
+        parts = self._split(np.asarray(data, dtype=np.float32))
+        ksub = min(256, parts.shape[0])
+        books = np.zeros((self.m, 256, parts.shape[2]), dtype=np.float32)
+        for j in range(self.m):
+            books[j, :ksub] = kmeans(parts[:, j], ksub, n_iter=self.n_iter, seed=self.seed + j, spherical=False)
+        self.codebooks = books
+
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        parts = self._split(np.asarray(data, dtype=np.float32))
+        codes = np.empty((parts.shape[0], self.m), dtype=np.uint8)
+        for j in range(self.m):
+            book = self.codebooks[j]
+            # argmin ||x - c||^2 == argmax (x.c - ||c||^2 / 2)
+            bias = 0.5 * np.einsum("ij,ij->i", book, book)
+            for a in range(0, parts.shape[0], _BLOCK):
+                codes[a: a + _BLOCK, j] = np.argmax(parts[a: a + _BLOCK, j] @ book.T - bias, axis=1)
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        parts = self.codebooks[np.arange(self.m)[None, :], codes]
+        return parts.reshape(codes.shape[0], -1)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        table = np.einsum("mkd,md->mk", self.codebooks, self._split(query[None, :])[0])
+        flat = table.ravel()
+        offsets = (np.arange(self.m) * 256)[None, :]
+        out = np.empty(codes.shape[0], dtype=np.float32)
+        for a in range(0, codes.shape[0], _SCORE_BLOCK):
+            out[a: a + _SCORE_BLOCK] = flat[codes[a: a + _SCORE_BLOCK] + offsets].sum(axis=1)
+        return out
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"codebooks": self.codebooks}
+
+
+# ----------------------------
+# Store
+# ----------------------------
+class QuantizedVectorStore(NumpyVectorStore):
+    """
+    NumpyVectorStore that searches compressed codes and re-ranks exactly.
+
+    Parameters
+    ----------
+    codec : str
+        "int8" (scalar quantization, 4x) or "pq" (product quantization,
+        4*dim/pq_m x).
+    pq_m : int
+        PQ sub-vectors; must divide the embedding dimension.
+    rerank : int
+        Candidates per query re-scored with the exact float32 vectors
+        (at least k). 0 returns the approximate scores as they are.
+    min_train : int
+        Below this many vectors the codec stays untrained and searches exactly.
+    train_size : int
+        Max vectors sampled to fit the codec.
+    kwargs :
+        Passed to NumpyVectorStore (compact_threshold, lexical).
+
+    Like IVFVectorStore the codec trains lazily on the first search once
+    `min_train` vectors are present (or explicitly via train()); later
+    additions are encoded with the existing codec.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        codec: str = "int8",
+        pq_m: int = 32,
+        rerank: int = 64,
+        min_train: int = 1000,
+        train_size: int = 16_384,
+        seed: int = 0,
+        **kwargs: Any,
+    ):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}; choose one of {CODECS}")
+        super().__init__(embedding, **kwargs)
+        self.codec = codec
+        self.pq_m = pq_m
+        self.rerank = rerank
+        self.min_train = min_train
+        self.train_size = train_size
+        self.seed = seed
+        self._quantizer = None
+        self._codes: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self._quantizer is not None
+
+    @property
+    def codes(self) -> Optional[np.ndarray]:
+        """Codes of rows [0, n) (int8 [n, dim] or uint8 [n, pq_m]); None until trained."""
+        return None if self._codes is None else self._codes[: self._n]
+
+    def memory_bytes(self) -> Dict[str, int]:
+        """Bytes of the float32 matrix vs the codes (+ codebooks) for the current rows."""
+        vectors = self._n * self.dim * 4
+        codes = 0 if self._codes is None else int(self.codes.nbytes)
+        books = 0 if self._quantizer is None else sum(int(a.nbytes) for a in self._quantizer.state().values())
+        return {"vectors": vectors, "codes": codes, "codebooks": books}
+
+    # ----------------------------
+    # Training / encoding
+    # ----------------------------
+    def _new_quantizer(self):
+        if self.codec == "pq":
+            return ProductQuantizer(self.pq_m, seed=self.seed)
+        return ScalarQuantizer()
+
+    def train(self) -> None:
+        """(Re)fit the codec on a sample of the live vectors and re-encode every row."""
+        live = np.flatnonzero(self.alive)
+        if live.size == 0:
+            raise ValueError("Cannot train an empty index.")
+        rng = np.random.default_rng(self.seed)
+        sample = live if live.size <= self.train_size else np.sort(rng.choice(live, self.train_size, replace=False))
+        quantizer = self._new_quantizer()
+        quantizer.train(np.asarray(self.vectors[sample]))
+        self._quantizer = quantizer
+        self._codes = self._encode(self.vectors)
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        parts = [self._quantizer.encode(np.asarray(vectors[a: a + _BLOCK])) for a in range(0, vectors.shape[0], _BLOCK)]
+        return np.concatenate(parts) if parts else self._quantizer.encode(np.zeros((0, self.dim), np.float32))
+
+    def _append_vectors(self, vectors: np.ndarray) -> None:
+        start = self._n
+        super()._append_vectors(vectors)
+        if self._quantizer is not None:
+            self._codes = np.concatenate([self._codes[:start], self._encode(self.vectors[start:])])
+
+    def _compact_rows(self, keep: np.ndarray) -> None:
+        if self._codes is not None:
+            self._codes = np.ascontiguousarray(self._codes[keep])
+
+    # ----------------------------
+    # Search
+    # ----------------------------
+    def _search(
+        self,
+        query: np.ndarray,
+        k: int,
+        rerank: Optional[int] = None,
+        mask: Optional[np.ndarray] = None,
+        **kwargs: Any,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate scores over the codes, then exact re-scoring of the top
+        `rerank` (overridable per query). A filter `mask` is applied to the
+        code scores, so only its rows are re-ranked.
+        """
+        if not self.is_trained and len(self) >= self.min_train:
+            self.train()
+        valid = len(self) if mask is None else int(np.count_nonzero(mask))
+        if not self.is_trained or valid == 0:
+            return super()._search(query, k, mask=mask, **kwargs)
+
+        scores = self._quantizer.scores(self.codes, query)
+        if mask is not None:
+            scores[~mask] = -np.inf
+        elif self._n_dead:
+            scores[~self.alive] = -np.inf
+        rerank = self.rerank if rerank is None else rerank
+        n_cand = min(max(k, rerank), valid)
+        cand = top_k(scores, n_cand)
+        if rerank <= 0:
+            return cand[:k], scores[cand[:k]]
+        order = np.sort(cand)                       # sequential reads from the memory map
+        exact = np.asarray(self._buf[order]) @ query
+        best = top_k(exact, min(k, order.size))
+        return order[best], exact[best]
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def save_local(self, folder_path: str) -> None:
+        super().save_local(folder_path)
+        path = os.path.join(folder_path, "quant.npz")
+        if self.is_trained:
+            np.savez(
+                path,
+                codec=np.array(self.codec),
+                params=np.array([self.pq_m, self.rerank, self.min_train, self.seed], dtype=np.int64),
+                codes=self.codes,
+                **self._quantizer.state(),
+            )
+        elif os.path.exists(path):
+            os.remove(path)     # left by an earlier save; would not match these rows
+
+    @classmethod
+    def load_local(
+        cls: Type["QuantizedVectorStore"],
+        folder_path: str,
+        embeddings: Embeddings,
+        mmap: bool = True,
+        **kwargs: Any,
+    ) -> "QuantizedVectorStore":
+        """With mmap=True (default) only the codes are read into RAM; exact vectors stay in vectors.npy."""
+        path = os.path.join(folder_path, "quant.npz")
+        if os.path.exists(path):
+            with np.load(path, allow_pickle=False) as data:
+                codec = str(data["codec"])
+                pq_m, rerank, min_train, seed = (int(v) for v in data["params"])
+                kwargs.setdefault("codec", codec)
+                kwargs.setdefault("pq_m", pq_m)
+                kwargs.setdefault("rerank", rerank)
+                store = super().load_local(folder_path, embeddings, mmap=mmap, **kwargs)
+                if data["codes"].shape[0] != store._n:
+                    raise ValueError(
+                        f"quant.npz in {folder_path} covers {data['codes'].shape[0]} rows, the store has {store._n}"
+                    )
+                if store.codec == codec and store.pq_m == pq_m:
+                    store._codes = data["codes"]
+                    store._quantizer = (ProductQuantizer(pq_m, data["codebooks"], seed=seed) if codec == "pq"
+                                        else ScalarQuantizer(data["lo"], data["scale"]))
+            return store
+        return super().load_local(folder_path, embeddings, mmap=mmap, **kwargs)
@@ -87,4 +87,19 @@ from langchain_text_splitters import CharacterTextSplitter
 # ### Retriever option
 # retriever=vectordb.as_retriever()
 # retriever.invoke(query)[0].page_content
-#####################################################################
\ No newline at end of file
+#####################################################################
+
+
+####<NumPy flat store>//////////////////////////////////////////////////
+## no FAISS/Chroma needed; exact cosine search, mmap load, no pickle
+# from VectorDB import NumpyVectorStore
+# from Embedding import HashEmbeddings   # offline stand-in; or OllamaEmbeddings()
+
+# db = NumpyVectorStore.from_documents(docs, HashEmbeddings())
+# docs_and_score = db.similarity_search_with_score(query)   # cosine similarity, higher is better
+
+# db.save_local("numpy_index")
+# new_db = NumpyVectorStore.load_local("numpy_index", HashEmbeddings())
+# retriever = new_db.as_retriever()
+# retriever.invoke(query)[0].page_content
+#////////////////////////////////////////////////////////////////////////
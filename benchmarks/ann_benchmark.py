@@ -0,0 +1,79 @@
+# benchmarks/ann_benchmark.py
+# Recall@k and query latency of IVFVectorStore vs exact NumpyVectorStore
+# on synthetic vectors. Runs offline.
+#
+#   python -m benchmarks.ann_benchmark --n 100000 --dim 384 --nprobe 1 4 8 16 32
+
+import argparse
+import json
+import time
+
+from Embedding import HashEmbeddings
+from VectorDB import NumpyVectorStore, IVFVectorStore
+from .common import synthetic_vectors, synthetic_queries, latency_summary, recall_at_k
+
+
+def _fill(store, data):
+    store.add_embeddings([""] * data.shape[0], data, ids=[str(i) for i in range(data.shape[0])])
+    return store
+
+
+def run(n: int, dim: int, k: int, n_queries: int, nlist, nprobes, seed: int = 0) -> dict:
+    data = synthetic_vectors(n, dim, seed=seed)
+    queries = synthetic_queries(data, n_queries, seed=seed + 1)
+    emb = HashEmbeddings(dim)
+
+    exact = _fill(NumpyVectorStore(emb), data)
+    truth, exact_lat = [], []
+    for q in queries:
+        start = time.perf_counter()
+        rows, _ = exact._search(q, k)
+        exact_lat.append(time.perf_counter() - start)
+        truth.append(rows)
+
+    ivf = _fill(IVFVectorStore(emb, nlist=nlist), data)
+    start = time.perf_counter()
+    ivf.train()
+    build_s = time.perf_counter() - start
+
+    result = {
+        "n": n, "dim": dim, "k": k, "queries": n_queries,
+        "nlist": int(ivf._centroids.shape[0]), "train_s": build_s,
+        "exact": latency_summary(exact_lat),
+        "ivf": [],
+    }
+    for nprobe in nprobes:
+        found, lat = [], []
+        for q in queries:
+            start = time.perf_counter()
+            rows, _ = ivf._search(q, k, nprobe=nprobe)
+            lat.append(time.perf_counter() - start)
+            found.append(rows)
+        result["ivf"].append({"nprobe": nprobe, "recall": recall_at_k(found, truth), **latency_summary(lat)})
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Recall@k and query latency of IVFVectorStore vs exact NumpyVectorStore on synthetic vectors.")
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--nlist", type=int, default=None)
+    ap.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    res = run(args.n, args.dim, args.k, args.queries, args.nlist, args.nprobe)
+    print(f"n={res['n']} dim={res['dim']} k={res['k']} nlist={res['nlist']} train={res['train_s']:.2f}s")
+    print(f"exact      recall=1.000  p50={res['exact']['p50_ms']:.3f}ms  p99={res['exact']['p99_ms']:.3f}ms")
+    for row in res["ivf"]:
+        print(f"nprobe={row['nprobe']:<4} recall={row['recall']:.3f}  p50={row['p50_ms']:.3f}ms  p99={row['p99_ms']:.3f}ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(res, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/batch_search.py
+# Throughput of NumpyVectorStore.similarity_search_many (blocked matrix-matrix
+# scoring) vs a loop of similarity_search calls, on synthetic vectors. End to
+# end, queries are embedded with embed_query as in the loop, or in one
+# embed_documents batch (queries_as_documents=True; HashEmbeddings is
+# symmetric). Runs offline; results are checked to be identical.
+#
+#   python -m benchmarks.batch_search --n 100000 --dim 384 --queries 16 64 256 1024
+
+import argparse
+import json
+import time
+
+from Embedding import HashEmbeddings
+from VectorDB import NumpyVectorStore
+from .common import synthetic_vectors, synthetic_queries
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(n: int, dim: int, k: int, batch_sizes, block_rows=None, repeat: int = 3, seed: int = 0) -> dict:
+    data = synthetic_vectors(n, dim, seed=seed)
+    emb = HashEmbeddings(dim)
+    store = NumpyVectorStore(emb)
+    store.add_embeddings([""] * n, data, ids=[str(i) for i in range(n)])
+    texts = [f"query {i} kitchen light schedule" for i in range(max(batch_sizes))]
+
+    result = {"n": n, "dim": dim, "k": k, "block_rows": block_rows, "rows": []}
+    for m in batch_sizes:
+        vecs = synthetic_queries(data, m, seed=seed + m)
+        loop = [store.similarity_search_by_vector(v, k) for v in vecs]
+        many = store.similarity_search_many_by_vector(vecs, k, block_rows=block_rows)
+        same = all([d.id for d in a] == [d.id for d in b] for a, b in zip(loop, many))
+
+        loop_s = _best_of(lambda: [store.similarity_search_by_vector(v, k) for v in vecs], repeat)
+        many_s = _best_of(lambda: store.similarity_search_many_by_vector(vecs, k, block_rows=block_rows), repeat)
+        # end to end with query embedding
+        q = texts[:m]
+        loop_e2e = _best_of(lambda: [store.similarity_search(t, k) for t in q], repeat)
+        many_e2e = _best_of(lambda: store.similarity_search_many(q, k, block_rows=block_rows), repeat)
+        docs_e2e = _best_of(
+            lambda: store.similarity_search_many(q, k, queries_as_documents=True, block_rows=block_rows), repeat)
+        result["rows"].append({
+            "queries": m,
+            "identical": bool(same),
+            "loop_qps": m / loop_s,
+            "many_qps": m / many_s,
+            "speedup": loop_s / many_s,
+            "loop_e2e_qps": m / loop_e2e,
+            "many_e2e_qps": m / many_e2e,
+            "e2e_speedup": loop_e2e / many_e2e,
+            "many_docs_e2e_qps": m / docs_e2e,
+        })
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Batched similarity_search_many vs a loop of similarity_search calls on synthetic vectors.")
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--queries", type=int, nargs="+", default=[1, 16, 64, 256])
+    ap.add_argument("--block-rows", type=int, default=None, help="corpus rows per scoring block (default: by memory budget)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    res = run(args.n, args.dim, args.k, args.queries, args.block_rows, args.repeat)
+    print(f"n={res['n']} dim={res['dim']} k={res['k']} block_rows={res['block_rows'] or 'auto'}")
+    print(f"{'queries':>7} {'loop q/s':>10} {'many q/s':>10} {'x':>6} {'e2e loop':>10} {'e2e many':>10} {'x':>6} {'e2e docs':>10}  same")
+    for r in res["rows"]:
+        print(f"{r['queries']:>7} {r['loop_qps']:>10.0f} {r['many_qps']:>10.0f} {r['speedup']:>6.1f} "
+              f"{r['loop_e2e_qps']:>10.0f} {r['many_e2e_qps']:>10.0f} {r['e2e_speedup']:>6.1f} {r['many_docs_e2e_qps']:>10.0f}  {r['identical']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(res, fh, indent=2)
+    if not all(r["identical"] for r in res["rows"]):
+        raise SystemExit("batched results differ from the looped ones")
+
+
+if __name__ == "__main__":
+    main()
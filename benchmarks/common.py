@@ -0,0 +1,69 @@
+# benchmarks/common.py
+# Shared helpers for the offline benchmarks (synthetic data, timing stats).
+
+from typing import Dict, List, Optional, Sequence
+
+import sys
+import time
+
+import numpy as np
+
+
+def synthetic_vectors(n: int, dim: int, n_clusters: int = 64, noise: float = 0.35, seed: int = 0) -> np.ndarray:
+    """Unit-norm float32 vectors drawn around `n_clusters` random centres (embedding-like)."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, size=n)
+    data = centres[labels] + noise * rng.standard_normal((n, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return data
+
+
+def synthetic_queries(data: np.ndarray, n: int, noise: float = 0.1, seed: int = 1) -> np.ndarray:
+    """Queries near (but not equal to) random rows of `data`."""
+    rng = np.random.default_rng(seed)
+    q = data[rng.integers(0, data.shape[0], size=n)] + noise * rng.standard_normal((n, data.shape[1])).astype(np.float32)
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return q
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """p50/p90/p99/mean in milliseconds."""
+    ms = np.asarray(seconds, dtype=np.float64) * 1000.0
+    if ms.size == 0:
+        return {"p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0}
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p90_ms": float(np.percentile(ms, 90)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+    }
+
+
+def timed_calls(fn, args_list) -> List[float]:
+    """Call fn(*args) for each args tuple and return per-call seconds."""
+    out = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        out.append(time.perf_counter() - start)
+    return out
+
+
+def recall_at_k(found: Sequence[Sequence[int]], truth: Sequence[Sequence[int]]) -> float:
+    """Mean |found ∩ truth| / |truth| over queries."""
+    if not truth:
+        return 0.0
+    hits = [len(set(map(int, f)) & set(map(int, t))) / max(1, len(t)) for f, t in zip(found, truth)]
+    return float(np.mean(hits))
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MiB (None where unsupported, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024.0
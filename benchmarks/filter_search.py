@@ -0,0 +1,109 @@
+# benchmarks/filter_search.py
+# Metadata-filtered search latency at several filter selectivities:
+#   post    unfiltered search for k * overfetch rows, then drop non-matching ones
+#           (what a store without filter support forces on the caller; may return < k)
+#   scan    filter=... on a store without an index (metadata scanned per query)
+#   index   filter=... with metadata_index=True (posting lists, candidates scored only)
+# Synthetic rows carry contentLoader-like metadata: `source` over --sources
+# files and a `page` number per source.
+#
+#   python -m benchmarks.filter_search --n 200000 --dim 384 --sources 200
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from Embedding import HashEmbeddings
+from VectorDB import NumpyVectorStore, matches
+from .common import synthetic_vectors, synthetic_queries, latency_summary, recall_at_k
+
+
+def _metadatas(n: int, n_sources: int, pages: int, seed: int):
+    rng = np.random.default_rng(seed)
+    src = rng.integers(0, n_sources, size=n)
+    page = rng.integers(0, pages, size=n)
+    return [{"source": f"Content/doc{s}.pdf", "page": int(p), "start_index": i} for i, (s, p) in enumerate(zip(src, page))]
+
+
+def _filters(n_sources: int, pages: int):
+    """(label, filter) from broad to very selective."""
+    return [
+        ("page < half", {"page": {"$lt": pages // 2}}),
+        ("10% sources", {"source": {"$in": [f"Content/doc{s}.pdf" for s in range(max(1, n_sources // 10))]}}),
+        ("1 source", {"source": "Content/doc0.pdf"}),
+        ("1 source, page < 5", {"source": "Content/doc0.pdf", "page": {"$lt": 5}}),
+    ]
+
+
+def run(n: int, dim: int, k: int, n_queries: int, n_sources: int, pages: int, overfetch: int, seed: int = 0) -> dict:
+    data = synthetic_vectors(n, dim, seed=seed)
+    queries = synthetic_queries(data, n_queries, seed=seed + 1)
+    metas = _metadatas(n, n_sources, pages, seed)
+    emb = HashEmbeddings(dim)
+    ids = [str(i) for i in range(n)]
+
+    start = time.perf_counter()
+    plain = NumpyVectorStore(emb)
+    plain.add_embeddings([""] * n, data, metas, ids)
+    add_plain = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = NumpyVectorStore(emb, metadata_index=True)
+    indexed.add_embeddings([""] * n, data, metas, ids)
+    add_indexed = time.perf_counter() - start
+
+    result = {"n": n, "dim": dim, "k": k, "queries": n_queries, "overfetch": overfetch,
+              "index_build_s": add_indexed - add_plain, "filters": []}
+    for label, flt in _filters(n_sources, pages):
+        selectivity = sum(matches(m, flt) for m in metas) / n
+        row = {"filter": label, "selectivity": selectivity}
+        truth = None
+        for name, store in (("index", indexed), ("scan", plain)):
+            found, lat = [], []
+            for q in queries:
+                t0 = time.perf_counter()
+                hits = store.similarity_search_with_score_by_vector(q, k, filter=flt)
+                lat.append(time.perf_counter() - t0)
+                found.append([int(doc.id) for doc, _ in hits])
+            truth = truth or found
+            row[name] = {"recall": recall_at_k(found, truth), **latency_summary(lat)}
+        found, lat = [], []
+        for q in queries:
+            t0 = time.perf_counter()
+            rows, _ = plain._search(q, k * overfetch)
+            hits = [int(r) for r in rows if matches(metas[r], flt)][:k]
+            lat.append(time.perf_counter() - t0)
+            found.append(hits)
+        row["post"] = {"recall": recall_at_k(found, truth), **latency_summary(lat)}
+        result["filters"].append(row)
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Metadata-filtered search latency: post-filtering vs scan vs metadata index.")
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("--sources", type=int, default=200)
+    ap.add_argument("--pages", type=int, default=50)
+    ap.add_argument("--overfetch", type=int, default=10, help="post-filter baseline fetches k * overfetch rows")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    res = run(args.n, args.dim, args.k, args.queries, args.sources, args.pages, args.overfetch)
+    print(f"n={res['n']} dim={res['dim']} k={res['k']} index build {res['index_build_s']:.2f}s")
+    print(f"{'filter':<20} {'sel':>7} {'post ms':>8} {'recall':>7} {'scan ms':>8} {'index ms':>9} {'speedup':>8}")
+    for row in res["filters"]:
+        post, scan, index = row["post"], row["scan"], row["index"]
+        print(f"{row['filter']:<20} {row['selectivity']:>7.4f} {post['p50_ms']:>8.2f} {post['recall']:>7.3f} "
+              f"{scan['p50_ms']:>8.2f} {index['p50_ms']:>9.2f} {scan['p50_ms'] / max(index['p50_ms'], 1e-9):>7.1f}x")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(res, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
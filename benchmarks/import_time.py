@@ -0,0 +1,146 @@
+# benchmarks/import_time.py
+# Import-time budget for the packages and the CLI (python -X importtime).
+#
+# For each package: median cumulative import time over fresh interpreters,
+# checked against a budget in ms, plus a guard that importing it does not pull
+# in the heavy optional stacks (those must load on first use). Optionally
+# measures time-to-prompt of app.py. Exits 1 when any budget is exceeded, so
+# it can run in CI.
+#
+#   python -m benchmarks.import_time
+#   python -m benchmarks.import_time --runs 7 --budget cli=400 --prompt
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Generous defaults (about 2x a cold-cache laptop); tighten per machine with --budget
+BUDGETS_MS = {
+    "utils": 200,
+    "contentLoader": 250,
+    "TextSplitter": 250,
+    "VectorDB": 250,
+    "Embedding": 250,
+    "cli": 700,
+}
+
+# Must not be imported by `import <package>` alone
+HEAVY_MODULES = (
+    "langchain_community",
+    "langchain_text_splitters",
+    "langchain_core.runnables",
+    "langsmith",
+    "bs4",
+    "pypdf",
+    "pymupdf",
+    "fitz",
+    "aiohttp",
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=ROOT, capture_output=True, text=True)
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of `module` in a fresh interpreter (ms)."""
+    proc = _python(f"import {module}", "-X", "importtime")
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    for line in reversed(proc.stderr.splitlines()):
+        # "import time:   self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000.0
+    raise RuntimeError(f"no importtime line for {module}")
+
+
+def heavy_imports(module: str) -> list:
+    """HEAVY_MODULES (or their submodules) present in sys.modules after `import module`."""
+    code = (f"import sys, json, {module}\n"
+            f"heavy = {HEAVY_MODULES!r}\n"
+            "print(json.dumps(sorted({h for h in heavy for m in sys.modules if m == h or m.startswith(h + '.')})))")
+    proc = _python(code)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def time_to_prompt_s(timeout: float = 60.0) -> float:
+    """Wall time from launching app.py until it prints the first '>>> ' prompt."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "app.py"], cwd=ROOT, stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        seen = b""
+        while b">>> " not in seen:
+            chunk = proc.stdout.read1(4096) if hasattr(proc.stdout, "read1") else proc.stdout.read(1)
+            if not chunk:
+                raise RuntimeError("app.py exited before showing the prompt")
+            seen += chunk
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError("no prompt within timeout")
+        elapsed = time.perf_counter() - start
+        proc.communicate(b"exit\n", timeout=timeout)
+        return elapsed
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+
+
+def run(budgets: dict, runs: int = 5, prompt: bool = False) -> dict:
+    result = {"python": sys.version.split()[0], "runs": runs, "modules": {}}
+    for module, budget in budgets.items():
+        samples = [import_time_ms(module) for _ in range(runs)]
+        heavy = heavy_imports(module)
+        median = statistics.median(samples)
+        result["modules"][module] = {
+            "median_ms": median,
+            "min_ms": min(samples),
+            "budget_ms": budget,
+            "heavy": heavy,
+            "ok": median <= budget and not heavy,
+        }
+    if prompt:
+        samples = [time_to_prompt_s() for _ in range(max(1, runs // 2))]
+        result["time_to_prompt_s"] = statistics.median(samples)
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Import-time budget for the packages and the CLI (exit 1 when a budget is exceeded).")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--budget", action="append", default=[], metavar="MODULE=MS",
+                    help="override/add a budget, e.g. --budget cli=400")
+    ap.add_argument("--prompt", action="store_true", help="also time app.py start-up to its first prompt")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    budgets = dict(BUDGETS_MS)
+    for item in args.budget:
+        module, _, ms = item.partition("=")
+        budgets[module] = float(ms)
+
+    res = run(budgets, args.runs, args.prompt)
+    print(f"{'module':<15} {'median ms':>10} {'min ms':>8} {'budget':>8}  status")
+    for module, row in res["modules"].items():
+        status = "ok" if row["ok"] else "OVER BUDGET" if not row["heavy"] else f"HEAVY: {', '.join(row['heavy'])}"
+        print(f"{module:<15} {row['median_ms']:>10.1f} {row['min_ms']:>8.1f} {row['budget_ms']:>8.0f}  {status}")
+    if "time_to_prompt_s" in res:
+        print(f"app.py time to prompt: {res['time_to_prompt_s']:.2f}s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(res, fh, indent=2)
+    if not all(row["ok"] for row in res["modules"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
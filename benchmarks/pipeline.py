@@ -0,0 +1,322 @@
+# benchmarks/pipeline.py
+# End-to-end benchmark: load -> split -> embed -> index -> query on synthetic
+# text / CSV / PDF corpora at several scales. Runs offline (HashEmbeddings,
+# PDFs written by a tiny built-in writer).
+#
+# Each stage reports wall time, throughput, per-call latency percentiles and
+# the process peak RSS after the stage. Results go to JSON; --compare flags
+# stages whose throughput dropped against an earlier run (exit code 1).
+#
+#   python -m benchmarks.pipeline --scales small medium --json run.json
+#   python -m benchmarks.pipeline --scales small --compare run.json
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+from contentLoader import load_documents
+from Embedding import HashEmbeddings
+from TextSplitter import NearDuplicateFilter, SplitConfig, split_auto
+from VectorDB import NumpyVectorStore, IVFVectorStore
+from .common import latency_summary, peak_rss_mb
+
+SCALES = {
+    #          text files x chars,   csv rows, pdf pages, queries
+    "small":  dict(text_files=4, text_chars=20_000, csv_rows=500, pdf_pages=10, queries=50),
+    "medium": dict(text_files=20, text_chars=50_000, csv_rows=5_000, pdf_pages=60, queries=200),
+    "large":  dict(text_files=80, text_chars=100_000, csv_rows=40_000, pdf_pages=300, queries=500),
+}
+STAGES = ("load", "split", "embed", "index", "query")
+
+_ROOMS = "kitchen hall bedroom garage porch office basement attic garden lounge".split()
+_DEVICES = "light fan heater door window sensor camera thermostat lock blind".split()
+_VERBS = "switched reported opened closed dimmed locked triggered scheduled paused resumed".split()
+_WORDS = ("temperature humidity motion schedule entry exit battery signal firmware "
+          "energy usage alarm timer scene routine presence occupancy").split()
+
+
+# ----------------------------
+# Synthetic corpus
+# ----------------------------
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_ROOMS), rng.choice(_DEVICES), rng.choice(_VERBS)]
+    words += rng.sample(_WORDS, rng.randint(3, 8))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraphs(rng: random.Random, chars: int):
+    size = 0
+    while size < chars:
+        para = " ".join(_sentence(rng) for _ in range(rng.randint(2, 7)))
+        size += len(para) + 2
+        yield para
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, pages) -> None:
+    """Minimal PDF 1.4 writer: one Helvetica text stream per page (ASCII lines)."""
+    pages = list(pages)
+    n = len(pages)
+    # objects: 1 catalog, 2 pages, 3 font, then (page, content) per page
+    objs = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: ("<< /Type /Pages /Count %d /Kids [%s] >>"
+            % (n, " ".join(f"{4 + 2 * i} 0 R" for i in range(n)))).encode("ascii"),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for i, lines in enumerate(pages):
+        text = " T* ".join(f"({_pdf_escape(line)}) Tj" for line in lines)
+        stream = f"BT /F1 9 Tf 11 TL 40 800 Td {text} ET".encode("ascii", "replace")
+        objs[4 + 2 * i] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                           f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>").encode("ascii")
+        objs[5 + 2 * i] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num in sorted(objs):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, objs[num])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    with open(path, "wb") as fh:
+        fh.write(out)
+
+
+def make_corpus(folder: str, text_files: int, text_chars: int, csv_rows: int, pdf_pages: int,
+                seed: int = 0, **_) -> list:
+    """Write the synthetic corpus into `folder`; returns the file paths."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(text_files):
+        path = os.path.join(folder, f"notes_{i:03d}.txt")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("\n\n".join(_paragraphs(rng, text_chars)))
+        paths.append(path)
+
+    if csv_rows:
+        path = os.path.join(folder, "events.csv")
+        with open(path, "w", encoding="utf-8", newline="") as fh:
+            fh.write("timestamp,room,device,event,value,note\n")
+            t0 = 1_750_000_000
+            for r in range(csv_rows):
+                fh.write(f"{t0 + 37 * r},{rng.choice(_ROOMS)},{rng.choice(_DEVICES)},{rng.choice(_VERBS)},"
+                         f"{rng.uniform(0, 100):.2f},{' '.join(rng.sample(_WORDS, 3))}\n")
+        paths.append(path)
+
+    if pdf_pages:
+        path = os.path.join(folder, "manual.pdf")
+        pages = []
+        for _ in range(pdf_pages):
+            lines = [_sentence(rng) for _ in range(60)]
+            pages.append(lines)
+        write_pdf(path, pages)
+        paths.append(path)
+    return paths
+
+
+def make_queries(n: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [" ".join([rng.choice(_ROOMS), rng.choice(_DEVICES)] + rng.sample(_WORDS, 2)) for _ in range(n)]
+
+
+# ----------------------------
+# Stages
+# ----------------------------
+def _stage(latencies, items: int, seconds: float, **extra) -> dict:
+    return {
+        "seconds": seconds,
+        "items": items,
+        "per_s": items / seconds if seconds > 0 else 0.0,
+        **latency_summary(latencies),
+        "peak_rss_mb": peak_rss_mb(),
+        **extra,
+    }
+
+
+def run_scale(name: str, folder: str, cfg: SplitConfig, dim: int = 384, batch: int = 64, k: int = 4,
+              store: str = "numpy", pdf_backend: str = "pypdf", seed: int = 0) -> dict:
+    params = SCALES[name]
+    files = make_corpus(folder, seed=seed, **params)
+    queries = make_queries(params["queries"], seed=seed + 1)
+    stages = {}
+
+    # load: one load_documents call per file
+    docs, lat = [], []
+    start = time.perf_counter()
+    for path in files:
+        t = time.perf_counter()
+        docs.extend(load_documents(path, pdf_backend=pdf_backend) if path.endswith(".pdf") else load_documents(path))
+        lat.append(time.perf_counter() - t)
+    n_bytes = sum(os.path.getsize(p) for p in files)
+    stages["load"] = _stage(lat, len(files), time.perf_counter() - start, documents=len(docs), mb=n_bytes / 1e6)
+
+    # split: split_auto per source Document (+ one near-duplicate filter across all of them)
+    chunks, lat = [], []
+    dedup = NearDuplicateFilter(cfg.dedup) if cfg.dedup is not None else None
+    per_doc = replace(cfg, dedup=None)
+    start = time.perf_counter()
+    for doc in docs:
+        t = time.perf_counter()
+        pieces = split_auto([doc], per_doc)
+        chunks.extend(dedup.filter(pieces) if dedup is not None else pieces)
+        lat.append(time.perf_counter() - t)
+    extra = {"embeddings_avoided": dedup.stats.embeddings_avoided} if dedup is not None else {}
+    stages["split"] = _stage(lat, len(docs), time.perf_counter() - start, chunks=len(chunks), **extra)
+
+    # embed: deterministic local embedder, in batches
+    emb = HashEmbeddings(dim)
+    texts = [c.page_content for c in chunks]
+    vectors, lat = [], []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch):
+        t = time.perf_counter()
+        vectors.extend(emb.embed_documents(texts[i:i + batch]))
+        lat.append(time.perf_counter() - t)
+    stages["embed"] = _stage(lat, len(texts), time.perf_counter() - start)
+
+    # index: add precomputed vectors in batches (+ IVF training)
+    index = IVFVectorStore(emb) if store == "ivf" else NumpyVectorStore(emb)
+    metas = [c.metadata for c in chunks]
+    ids = [c.id or None for c in chunks]
+    lat = []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch):
+        t = time.perf_counter()
+        index.add_embeddings(texts[i:i + batch], vectors[i:i + batch], metas[i:i + batch], ids[i:i + batch])
+        lat.append(time.perf_counter() - t)
+    if store == "ivf":
+        t = time.perf_counter()
+        index.train()
+        lat.append(time.perf_counter() - t)
+    stages["index"] = _stage(lat, len(texts), time.perf_counter() - start)
+
+    # query: similarity_search per query (embeds the query too)
+    lat = []
+    start = time.perf_counter()
+    for q in queries:
+        t = time.perf_counter()
+        index.similarity_search(q, k=k)
+        lat.append(time.perf_counter() - t)
+    stages["query"] = _stage(lat, len(queries), time.perf_counter() - start)
+
+    return {"params": params, "stages": stages}
+
+
+def run(scales, cfg: SplitConfig, workdir=None, **kwargs) -> dict:
+    result = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "split": {"chunk_size": cfg.chunk_size, "chunk_overlap": cfg.chunk_overlap, "engine": cfg.engine,
+                      "dedup": cfg.dedup},
+            **kwargs,
+        },
+        "scales": {},
+    }
+    for name in scales:
+        if workdir:
+            folder = os.path.join(workdir, name)
+            os.makedirs(folder, exist_ok=True)
+            result["scales"][name] = run_scale(name, folder, cfg, **kwargs)
+        else:
+            with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as folder:
+                result["scales"][name] = run_scale(name, folder, cfg, **kwargs)
+    return result
+
+
+# ----------------------------
+# Regression check
+# ----------------------------
+def compare(current: dict, baseline: dict, tolerance: float = 0.15) -> list:
+    """
+    Rows (scale, stage, baseline per_s, current per_s, ratio, regressed) for
+    every stage present in both runs. A stage regresses when its throughput
+    falls below (1 - tolerance) x the baseline.
+    """
+    rows = []
+    for name, scale in current["scales"].items():
+        base = baseline.get("scales", {}).get(name)
+        if base is None:
+            continue
+        for stage in STAGES:
+            cur, old = scale["stages"].get(stage), base["stages"].get(stage)
+            if not cur or not old or not old["per_s"]:
+                continue
+            ratio = cur["per_s"] / old["per_s"]
+            rows.append((name, stage, old["per_s"], cur["per_s"], ratio, ratio < 1.0 - tolerance))
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Offline end-to-end benchmark: load -> split -> embed -> index -> query on synthetic corpora.")
+    ap.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    ap.add_argument("--chunk-size", type=int, default=500)
+    ap.add_argument("--chunk-overlap", type=int, default=50)
+    ap.add_argument("--engine", choices=["langchain", "span"], default="langchain")
+    ap.add_argument("--dedup", type=float, default=None, metavar="THRESHOLD",
+                    help="drop near-duplicate chunks before embedding (TextSplitter.dedup)")
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--batch", type=int, default=64)
+    ap.add_argument("--k", type=int, default=4)
+    ap.add_argument("--store", choices=["numpy", "ivf"], default="numpy")
+    ap.add_argument("--pdf-backend", default="pypdf")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", help="keep the generated corpora here (default: temporary)")
+    ap.add_argument("--json", help="write results to this file")
+    ap.add_argument("--compare", help="baseline JSON from an earlier run")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="allowed throughput drop (fraction)")
+    args = ap.parse_args(argv)
+
+    cfg = SplitConfig(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap, engine=args.engine,
+                      dedup=args.dedup)
+    res = run(args.scales, cfg, workdir=args.workdir, dim=args.dim, batch=args.batch, k=args.k,
+              store=args.store, pdf_backend=args.pdf_backend, seed=args.seed)
+
+    print(f"{'scale':<8} {'stage':<6} {'items':>7} {'seconds':>8} {'items/s':>10} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'rss MiB':>8}")
+    for name, scale in res["scales"].items():
+        for stage in STAGES:
+            s = scale["stages"][stage]
+            rss = f"{s['peak_rss_mb']:.0f}" if s["peak_rss_mb"] is not None else "-"
+            print(f"{name:<8} {stage:<6} {s['items']:>7} {s['seconds']:>8.3f} {s['per_s']:>10.1f} "
+                  f"{s['p50_ms']:>8.2f} {s['p99_ms']:>8.2f} {rss:>8}")
+        split = scale["stages"]["split"]
+        if "embeddings_avoided" in split:
+            print(f"{name:<8} dedup: {split['embeddings_avoided']} of "
+                  f"{split['chunks'] + split['embeddings_avoided']} chunks dropped before embedding")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(res, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        rows = compare(res, baseline, args.tolerance)
+        print(f"\nvs {args.compare} (tolerance {args.tolerance:.0%})")
+        differs = [key for key in ("split", "dim", "batch", "k", "store", "pdf_backend", "seed", "cpus")
+                   if baseline.get("meta", {}).get(key) != res["meta"].get(key)]
+        if differs:
+            print(f"note: settings differ from the baseline ({', '.join(differs)})")
+        for name, stage, old, cur, ratio, regressed in rows:
+            print(f"{name:<8} {stage:<6} {old:>10.1f} -> {cur:>10.1f} items/s  x{ratio:.2f}"
+                  f"{'  REGRESSION' if regressed else ''}")
+        if any(r[-1] for r in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/quant_benchmark.py
+# Memory, recall@k and query latency of QuantizedVectorStore (int8 / PQ, with
+# and without exact re-ranking) vs exact NumpyVectorStore, on synthetic
+# vectors. Each quantized store is saved and re-opened with load_local(mmap=True),
+# so re-ranking reads the exact vectors from disk as it would in production.
+#
+#   python -m benchmarks.quant_benchmark --n 100000 --dim 1024 --codecs int8 pq:64 pq:128 --rerank 0 32 128
+
+import argparse
+import json
+import tempfile
+import time
+
+from Embedding import HashEmbeddings
+from VectorDB import NumpyVectorStore, QuantizedVectorStore
+from .common import synthetic_vectors, synthetic_queries, latency_summary, recall_at_k
+
+
+def _fill(store, data):
+    store.add_embeddings([""] * data.shape[0], data, ids=[str(i) for i in range(data.shape[0])])
+    return store
+
+
+def _parse_codec(spec: str):
+    """'int8' -> ("int8", 0); 'pq:64' -> ("pq", 64)."""
+    codec, _, m = spec.partition(":")
+    return codec, int(m or 0)
+
+
+def run(n: int, dim: int, k: int, n_queries: int, codecs, reranks, noise: float = 0.35, seed: int = 0) -> dict:
+    data = synthetic_vectors(n, dim, noise=noise, seed=seed)
+    queries = synthetic_queries(data, n_queries, seed=seed + 1)
+    emb = HashEmbeddings(dim)
+
+    exact = _fill(NumpyVectorStore(emb), data)
+    truth, exact_lat = [], []
+    for q in queries:
+        start = time.perf_counter()
+        rows, _ = exact._search(q, k)
+        exact_lat.append(time.perf_counter() - start)
+        truth.append(rows)
+
+    result = {
+        "n": n, "dim": dim, "k": k, "queries": n_queries, "noise": noise,
+        "exact": {"bytes_per_vector": dim * 4, **latency_summary(exact_lat)},
+        "quantized": [],
+    }
+    for spec in codecs:
+        codec, m = _parse_codec(spec)
+        store = _fill(QuantizedVectorStore(emb, codec=codec, pq_m=m or 32, seed=seed), data)
+        start = time.perf_counter()
+        store.train()
+        train_s = time.perf_counter() - start
+        mem = store.memory_bytes()
+        with tempfile.TemporaryDirectory(prefix="quant_") as folder:
+            store.save_local(folder)
+            served = QuantizedVectorStore.load_local(folder, emb)   # exact vectors memory-mapped
+            for rerank in reranks:
+                found, lat = [], []
+                for q in queries:
+                    start = time.perf_counter()
+                    rows, _ = served._search(q, k, rerank=rerank)
+                    lat.append(time.perf_counter() - start)
+                    found.append(rows)
+                result["quantized"].append({
+                    "codec": spec,
+                    "rerank": rerank,
+                    "train_s": train_s,
+                    "bytes_per_vector": mem["codes"] / n,
+                    "compression": mem["vectors"] / max(1, mem["codes"]),
+                    "codebook_bytes": mem["codebooks"],
+                    "recall": recall_at_k(found, truth),
+                    **latency_summary(lat),
+                })
+            del served
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Memory, recall@k and query latency of QuantizedVectorStore vs exact NumpyVectorStore.")
+    ap.add_argument("--n", type=int, default=50_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--codecs", nargs="+", default=["int8", "pq:48", "pq:96"],
+                    help="int8 and/or pq:<m> (m must divide dim)")
+    ap.add_argument("--rerank", type=int, nargs="+", default=[0, 32, 128])
+    ap.add_argument("--noise", type=float, default=0.35,
+                    help="spread around the synthetic cluster centres; lower = more structured, PQ-friendly data")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    res = run(args.n, args.dim, args.k, args.queries, args.codecs, args.rerank, args.noise)
+    print(f"n={res['n']} dim={res['dim']} k={res['k']} noise={res['noise']}")
+    print(f"{'codec':<8} {'rerank':>6} {'B/vec':>7} {'x':>6} {'recall':>7} {'p50 ms':>8} {'p99 ms':>8} {'train s':>8}")
+    e = res["exact"]
+    print(f"{'float32':<8} {'-':>6} {e['bytes_per_vector']:>7.0f} {1.0:>6.1f} {1.0:>7.3f} "
+          f"{e['p50_ms']:>8.3f} {e['p99_ms']:>8.3f} {'-':>8}")
+    for row in res["quantized"]:
+        print(f"{row['codec']:<8} {row['rerank']:>6} {row['bytes_per_vector']:>7.0f} {row['compression']:>6.1f} "
+              f"{row['recall']:>7.3f} {row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f} {row['train_s']:>8.2f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(res, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/splitter_overhead.py
+# Per-call cost of the TextSplitter helpers on many small documents:
+# a new LangChain splitter per call ("fresh") vs the shared registry instance.
+# Runs offline.
+#
+#   python -m benchmarks.splitter_overhead --docs 2000 --chars 400
+
+import argparse
+import json
+import logging
+import random
+import time
+
+from langchain_core.documents import Document
+from langchain_text_splitters import (
+    CharacterTextSplitter,
+    Language,
+    MarkdownHeaderTextSplitter,
+    RecursiveCharacterTextSplitter,
+    TokenTextSplitter,
+)
+
+from TextSplitter import (
+    SplitConfig,
+    split_code,
+    split_documents_recursive,
+    split_markdown,
+    split_text_by_tokens,
+    split_text_character,
+)
+from TextSplitter.registry import clear_registry
+from utils.documents import assign_chunk_ids
+from .common import latency_summary
+
+_WORDS = "light fan door sensor hall kitchen on off temperature humidity schedule entry exit".split()
+_MD_HEADERS = (("#", "Header 1"), ("##", "Header 2"), ("###", "Header 3"), ("####", "Header 4"))
+
+
+def _texts(n: int, chars: int, seed: int = 0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        words, size = [], 0
+        while size < chars:
+            w = rng.choice(_WORDS)
+            words.append(w + ("\n\n" if rng.random() < 0.05 else " "))
+            size += len(words[-1])
+        out.append("".join(words))
+    return out
+
+
+# Pre-registry behaviour: build the LangChain splitter inside every call
+def _fresh_recursive(doc, cfg):
+    s = RecursiveCharacterTextSplitter(chunk_size=cfg.chunk_size, chunk_overlap=cfg.chunk_overlap,
+                                       add_start_index=cfg.add_start_index)
+    return assign_chunk_ids(s.split_documents([doc]))
+
+
+def _fresh_character(text):
+    return CharacterTextSplitter(separator="\n\n", chunk_size=100, chunk_overlap=20).create_documents([text])
+
+
+def _fresh_tokens(text):
+    return TokenTextSplitter(chunk_size=64, chunk_overlap=8, encoding_name="gpt2").split_text(text)
+
+
+def _fresh_code(text):
+    s = RecursiveCharacterTextSplitter.from_language(language=Language.PYTHON, chunk_size=400, chunk_overlap=40)
+    return s.create_documents([text])
+
+
+def _fresh_markdown(text):
+    return MarkdownHeaderTextSplitter(headers_to_split_on=list(_MD_HEADERS)).split_text(text)
+
+
+_BUILDERS = {
+    "recursive": lambda: RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=20, add_start_index=True),
+    "character": lambda: CharacterTextSplitter(separator="\n\n", chunk_size=100, chunk_overlap=20),
+    "tokens": lambda: TokenTextSplitter(chunk_size=64, chunk_overlap=8, encoding_name="gpt2"),
+    "code": lambda: RecursiveCharacterTextSplitter.from_language(language=Language.PYTHON, chunk_size=400, chunk_overlap=40),
+    "markdown": lambda: MarkdownHeaderTextSplitter(headers_to_split_on=list(_MD_HEADERS)),
+}
+
+
+def _time(fn, items):
+    lat = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        lat.append(time.perf_counter() - start)
+    return lat
+
+
+def run(n_docs: int, chars: int) -> dict:
+    texts = _texts(n_docs, chars)
+    docs = [Document(page_content=t, metadata={"source": f"doc{i}"}) for i, t in enumerate(texts)]
+    cfg = SplitConfig(chunk_size=200, chunk_overlap=20)
+    cases = {
+        "recursive": (lambda d: _fresh_recursive(d, cfg), lambda d: split_documents_recursive([d], cfg), docs),
+        "character": (_fresh_character, split_text_character, texts),
+        "tokens": (_fresh_tokens, lambda t: split_text_by_tokens(t, 64, 8, "gpt2"), texts),
+        "code": (_fresh_code, lambda t: split_code(t, Language.PYTHON), texts),
+        "markdown": (_fresh_markdown, split_markdown, texts),
+    }
+    result = {"docs": n_docs, "chars": chars, "cases": {}}
+    for name, (fresh, shared, items) in cases.items():
+        clear_registry()
+        try:
+            fresh(items[0]), shared(items[0])   # warm imports / tiktoken's own cache
+        except Exception as exc:                # e.g. tiktoken encoding not downloadable offline
+            result["cases"][name] = {"skipped": f"{type(exc).__name__}: {exc}"[:200]}
+            continue
+        build = latency_summary(_time(lambda _: _BUILDERS[name](), range(200)))
+        before = latency_summary(_time(fresh, items))
+        after = latency_summary(_time(shared, items))
+        result["cases"][name] = {
+            "construct": build,
+            "fresh": before,
+            "registry": after,
+            "speedup": before["mean_ms"] / after["mean_ms"] if after["mean_ms"] else 0.0,
+        }
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Per-call cost of the TextSplitter helpers: fresh LangChain splitters vs the shared registry.")
+    ap.add_argument("--docs", type=int, default=2000)
+    ap.add_argument("--chars", type=int, default=400)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+    logging.getLogger("langchain_text_splitters").setLevel(logging.ERROR)   # "chunk longer than" noise
+
+    res = run(args.docs, args.chars)
+    print(f"{res['docs']} docs x ~{res['chars']} chars, per-call mean (us)")
+    print(f"{'splitter':<10} {'build':>10} {'fresh':>10} {'registry':>10} {'speedup':>8}")
+    for name, case in res["cases"].items():
+        if "skipped" in case:
+            print(f"{name:<10} skipped ({case['skipped'][:60]})")
+            continue
+        print(f"{name:<10} {case['construct']['mean_ms'] * 1000:>10.1f} {case['fresh']['mean_ms'] * 1000:>10.1f} "
+              f"{case['registry']['mean_ms'] * 1000:>10.1f} {case['speedup']:>7.1f}x")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(res, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
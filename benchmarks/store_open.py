@@ -0,0 +1,108 @@
+# benchmarks/store_open.py
+# Time to open a saved NumpyVectorStore and answer the first query, for the
+# memory-mapped chunk files (chunks.bin / chunks.idx) vs the previous
+# docs.jsonl format, which parsed every record on load. Also times saving a
+# few new chunks back into the same folder (an in-place append).
+#
+#   python -m benchmarks.store_open --n 200000 1000000 --dim 64
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from Embedding import HashEmbeddings
+from VectorDB import NumpyVectorStore
+from .common import synthetic_vectors, peak_rss_mb
+
+
+def _write_legacy(store: NumpyVectorStore, folder: str) -> None:
+    """Rewrite a saved store's chunks as docs.jsonl (format version 1)."""
+    with open(os.path.join(folder, "docs.jsonl"), "w", encoding="utf-8") as fh:
+        for row in range(store._n):
+            id_, text, meta = store._chunks.get(row)
+            fh.write(json.dumps({"id": id_, "page_content": text, "metadata": meta}, ensure_ascii=False))
+            fh.write("\n")
+    with open(os.path.join(folder, "meta.json"), "w", encoding="utf-8") as fh:
+        json.dump({"version": 1, "dim": store.dim, "count": store._n}, fh)
+    os.remove(os.path.join(folder, "chunks.bin"))
+    os.remove(os.path.join(folder, "chunks.idx"))
+
+
+def _open_and_query(folder: str, emb, query: np.ndarray, k: int) -> dict:
+    start = time.perf_counter()
+    store = NumpyVectorStore.load_local(folder, emb)
+    opened = time.perf_counter() - start
+    hits = store.similarity_search_with_score_by_vector(query, k)
+    first = time.perf_counter() - start
+    assert len(hits) == k
+    return {"open_ms": opened * 1000.0, "first_query_ms": first * 1000.0, "store": store}
+
+
+def run(sizes, dim: int, k: int, text_chars: int, seed: int = 0) -> dict:
+    emb = HashEmbeddings(dim)
+    rng = np.random.default_rng(seed)
+    out = {"dim": dim, "k": k, "text_chars": text_chars, "sizes": []}
+    for n in sizes:
+        data = synthetic_vectors(n, dim, seed=seed)
+        filler = "x" * max(0, text_chars - 16)
+        store = NumpyVectorStore(emb)
+        store.add_embeddings(
+            [f"chunk {i} {filler}" for i in range(n)],
+            data,
+            [{"source": f"Content/doc{i % 500}.pdf", "page": i % 40, "start_index": i} for i in range(n)],
+            [f"c{i}" for i in range(n)],
+        )
+        query = data[int(rng.integers(n))]
+        row = {"n": n}
+        with tempfile.TemporaryDirectory(prefix="store_open_") as folder:
+            start = time.perf_counter()
+            store.save_local(folder)
+            row["save_s"] = time.perf_counter() - start
+            del store
+            row["chunks_mb"] = os.path.getsize(os.path.join(folder, "chunks.bin")) / (1 << 20)
+            mapped = _open_and_query(folder, emb, query, k)
+            row["mmap"] = {key: v for key, v in mapped.items() if key != "store"}
+
+            served = mapped["store"]
+            served.add_embeddings(["new chunk"] * 10, data[:10], None, [f"new{i}" for i in range(10)])
+            start = time.perf_counter()
+            served.save_local(folder)
+            row["append_save_s"] = time.perf_counter() - start
+
+            _write_legacy(served, folder)
+            del served, mapped
+            legacy = _open_and_query(folder, emb, query, k)
+            row["jsonl"] = {key: v for key, v in legacy.items() if key != "store"}
+            del legacy
+        out["sizes"].append(row)
+    out["peak_rss_mb"] = peak_rss_mb()
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Time to open a saved NumpyVectorStore and answer the first query (mmap chunks vs docs.jsonl).")
+    ap.add_argument("--n", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    ap.add_argument("--dim", type=int, default=64)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--text-chars", type=int, default=400)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    res = run(args.n, args.dim, args.k, args.text_chars)
+    print(f"dim={res['dim']} k={res['k']} text~{res['text_chars']} chars")
+    print(f"{'n':>9} {'chunks MB':>10} {'open ms':>9} {'1st q ms':>9} {'jsonl open':>11} {'jsonl 1st q':>12} {'append save s':>14}")
+    for row in res["sizes"]:
+        print(f"{row['n']:>9} {row['chunks_mb']:>10.1f} {row['mmap']['open_ms']:>9.2f} {row['mmap']['first_query_ms']:>9.2f} "
+              f"{row['jsonl']['open_ms']:>11.1f} {row['jsonl']['first_query_ms']:>12.1f} {row['append_save_s']:>14.3f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(res, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
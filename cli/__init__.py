@@ -1 +1,2 @@
-from .cli import run_cli  # re-export for convenience
+from .cli import run_cli, main  # re-export for convenience
+from .semantic_cache import SemanticCache
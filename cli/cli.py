@@ -1,20 +1,95 @@
-from contentLoader import load_documents
-from utils import print_docs_pretty
-from textSplitter import split_text_character
+from contextlib import nullcontext
+
+import argparse
+import os
+
+from contentLoader import IngestionManifest, StructuredQuery, detect_from_documents
+from utils import print_docs_pretty, instrument
+from TextSplitter import split_text_character
 ##########################################
-def run_cli():
+def run_cli(answer=None, cache=None, trace=False, profile=None):
+    """
+    answer:  optional callable query -> (answer_text, retrieved_chunk_ids); questions the
+             structured log engine can answer (e.g. "who left after 17:30?") skip it
+    cache:   optional SemanticCache; repeated/near-duplicate queries skip `answer`
+    trace:   print a per-request stage breakdown (load/split/embed/search/print)
+    profile: directory; the whole session runs under cProfile + tracemalloc and
+             stats, per-request traces and profiles are written there on exit
+    """
+    if profile:
+        with instrument.profile_session(profile):
+            traces = _session(answer, cache, trace=True)
+        instrument.export_json(os.path.join(profile, "traces.json"), traces)
+        print(instrument.report())
+        print(f"[profile] written to {profile}/")
+        return
+    was_enabled = instrument.is_enabled()
+    if trace:
+        instrument.enable()
+    try:
+        _session(answer, cache, trace)
+    finally:
+        if not was_enabled:
+            instrument.disable()   # later @timed calls in this process stay on the no-op path
+
+
+def _session(answer, cache, trace):
+    traces = []
+
+    def request(name):
+        return instrument.trace(name) if trace else nullcontext()
+
     print("CLI started. Type 'exit' to quit.")
-    docs = load_documents("Content/Attendance.txt", source_type="text")
-    print_docs_pretty(docs)  # line-by-line output with source header
-    chunks = split_text_character(docs, chunk_size=10, chunk_overlap=2)
-    print(chunks)
+    with request("startup") as tr:
+        manifest = IngestionManifest(".ingest_cache")  # unchanged files are not re-parsed
+        docs = manifest.load_documents("Content/Attendance.txt", source_type="text")
+        print_docs_pretty(docs)  # line-by-line output with source header
+        text = "\n\n".join(d.page_content for d in docs)
+        # span engine: same chunks, without importing langchain_text_splitters at startup
+        chunks = split_text_character(text, chunk_size=10, chunk_overlap=2, engine="span")
+        print(chunks)
+        # key/value logs (Attendance.txt) get a record table; range questions skip retrieval
+        table = detect_from_documents(docs)
+        structured = StructuredQuery(table) if table is not None else None
+        if table is not None:
+            print(f"[structured] {len(table)} records, fields: {', '.join(table.columns)}")
+    _show(tr, traces)
 
     while True:
         user_input = input(">>> ")  # Read string from terminal
 
         if user_input.lower() == "exit":
+            if cache is not None:
+                s = cache.stats
+                print(f"[cache] hits={s.hits} misses={s.misses} hit_rate={s.hit_rate:.0%}")
             print("Exiting program... Goodbye!")
             break
-        else:
-            print(f"You entered: {user_input}")
+        with request("query") as tr:
+            hit = structured.answer(user_input) if structured is not None else None
+            if hit is not None:
+                print(hit.text)
+            elif answer is not None and cache is not None:
+                reply, cached = cache.get_or_compute(user_input, answer)
+                print(f"{reply}{'  (cached)' if cached else ''}")
+            elif answer is not None:
+                print(answer(user_input)[0])
+            else:
+                print(f"You entered: {user_input}")
+        _show(tr, traces)
+    return traces
+
+
+def _show(tr, traces):
+    if tr is not None:
+        traces.append(tr)
+        print(tr.summary())
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Interactive home-automation CLI.")
+    ap.add_argument("--trace", action="store_true", help="print per-request stage timings")
+    ap.add_argument("--profile", nargs="?", const="profiles", default=None, metavar="DIR",
+                    help="profile the session (cProfile + tracemalloc) and write results to DIR")
+    args = ap.parse_args(argv)
+    run_cli(trace=args.trace, profile=args.profile)
 ###########################################
@@ -0,0 +1,247 @@
+# cli/semantic_cache.py
+# Semantic query/answer cache for the interactive loop.
+#
+# "turn on the hall light" and "turn the hall light on" embed to nearly the
+# same vector; the second one is answered from cache instead of paying for
+# embed + search + LLM again. Dense embedders also score "turn off the hall
+# light" or "set the thermostat to 25" (vs "... 21") above any useful
+# threshold, so a hit additionally needs the same action / negation words and
+# the same numbers (see query_guard).
+
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import re
+import time
+
+import numpy as np
+
+_WS_RE = re.compile(r"\s+")
+# punctuation, except ':' and a sign that starts a number ("-5", "+3"; not "5-10")
+_PUNCT_RE = re.compile(r"[^\w\s:+-]|[+-](?!\d)|(?<=\w)[+-]")
+_GUARD_TOKEN_RE = re.compile(r"(?<!\w)[+-]?\d+(?:[.:]\d+)?|\d+(?:[.:]\d+)?|[a-z]+n['\u2019]t|[a-z]+")
+
+# word -> canonical action; queries must agree on these to share an answer
+ACTION_WORDS = {
+    "on": "on", "off": "off",
+    "open": "open", "opens": "open", "opened": "open",
+    "close": "close", "closes": "close", "closed": "close", "shut": "close",
+    "lock": "lock", "locks": "lock", "locked": "lock",
+    "unlock": "unlock", "unlocks": "unlock", "unlocked": "unlock",
+    "start": "start", "stop": "stop", "enable": "enable", "disable": "disable",
+    "up": "up", "down": "down", "increase": "up", "raise": "up", "decrease": "down", "lower": "down",
+    "not": "not", "no": "not", "never": "not", "dont": "not", "cannot": "not",
+}
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation (except ':' and number signs), collapse whitespace."""
+    return _WS_RE.sub(" ", _PUNCT_RE.sub(" ", query.lower())).strip()
+
+
+def query_guard(query: str) -> Tuple[frozenset, Tuple[str, ...]]:
+    """(action / negation words, signed numbers in order) that must match for a hit."""
+    actions, numbers = set(), []
+    for token in _GUARD_TOKEN_RE.findall(query.lower()):
+        if token[-1].isdigit():
+            numbers.append(token)
+        elif token[-3:] in ("n't", "n\u2019t"):
+            actions.add("not")
+        elif token in ACTION_WORDS:
+            actions.add(ACTION_WORDS[token])
+    return frozenset(actions), tuple(numbers)
+
+
+@dataclass
+class CacheEntry:
+    query: str
+    vector: np.ndarray
+    answer: Any
+    chunk_ids: Tuple[str, ...] = ()
+    created: float = 0.0
+    hits: int = 0
+    guard: Tuple[frozenset, Tuple[str, ...]] = (frozenset(), ())
+
+
+@dataclass
+class SemanticCacheStats:
+    hits: int = 0
+    exact_hits: int = 0       # served by normalized text alone, no embedding
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class CacheLookup:
+    entry: Optional[CacheEntry]
+    similarity: float = 0.0
+    vector: Optional[np.ndarray] = field(default=None, repr=False)  # query vector, reused on put
+
+
+class SemanticCache:
+    """
+    LRU + TTL cache of (query embedding, retrieved chunk ids, answer).
+
+    A lookup first tries the normalized query text (no embedding call), then
+    cosine similarity against cached query vectors; the most similar entry at
+    or above `threshold` whose query_guard() equals the query's (same on/off,
+    open/close, lock/unlock, negation and numbers) is a hit. When bound to a vector store, any change of the
+    store's `version` (add/delete/upsert/compact) clears the cache.
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        threshold: float = 0.92,
+        max_entries: int = 512,
+        ttl: Optional[float] = 3600.0,
+        store=None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = SemanticCacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()   # normalized query -> entry, LRU order
+        self._matrix: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+        self._store = None
+        self._store_version = None
+        if store is not None:
+            self.bind(store)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ----------------------------
+    # Invalidation
+    # ----------------------------
+    def bind(self, store) -> None:
+        """Tie the cache to a store exposing `version`; a version change clears the cache."""
+        self._store = store
+        self._store_version = getattr(store, "version", None)
+
+    def _check_store(self) -> None:
+        if self._store is None:
+            return
+        version = getattr(self._store, "version", None)
+        if version != self._store_version:
+            self._store_version = version
+            if self._entries:
+                self.clear()
+
+    def clear(self) -> None:
+        self.stats.invalidations += len(self._entries)
+        self._entries.clear()
+        self._matrix = None
+
+    def invalidate(self, chunk_ids: Optional[Sequence[str]] = None) -> int:
+        """Drop entries that used any of `chunk_ids` (all entries if None). Returns how many."""
+        if chunk_ids is None:
+            n = len(self._entries)
+            self.clear()
+            return n
+        wanted = set(chunk_ids)
+        doomed = [k for k, e in self._entries.items() if wanted.intersection(e.chunk_ids)]
+        for k in doomed:
+            del self._entries[k]
+        if doomed:
+            self._matrix = None
+            self.stats.invalidations += len(doomed)
+        return len(doomed)
+
+    def _expire(self) -> None:
+        if self.ttl is None:
+            return
+        cutoff = self._clock() - self.ttl
+        old = [k for k, e in self._entries.items() if e.created < cutoff]
+        for k in old:
+            del self._entries[k]
+        if old:
+            self._matrix = None
+            self.stats.expirations += len(old)
+
+    # ----------------------------
+    # Lookup / store
+    # ----------------------------
+    def lookup(self, query: str) -> CacheLookup:
+        """Find a cached answer for `query` (hit -> CacheLookup.entry is set)."""
+        self._check_store()
+        self._expire()
+        key = normalize_query(query)
+        entry = self._entries.get(key)
+        guard = query_guard(query)
+        if entry is not None and entry.guard == guard:
+            return self._hit(key, entry, 1.0, None, exact=True)
+
+        vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        vector /= float(np.linalg.norm(vector)) or 1.0
+        if self._entries:
+            if self._matrix is None:
+                self._keys = list(self._entries)
+                self._matrix = np.stack([self._entries[k].vector for k in self._keys])
+            sims = self._matrix @ vector
+            above = np.flatnonzero(sims >= self.threshold)
+            for best in above[np.argsort(-sims[above], kind="stable")]:
+                key = self._keys[best]
+                if self._entries[key].guard == guard:
+                    return self._hit(key, self._entries[key], float(sims[best]), vector, exact=False)
+        self.stats.misses += 1
+        return CacheLookup(None, 0.0, vector)
+
+    def _hit(self, key: str, entry: CacheEntry, similarity: float, vector, exact: bool) -> CacheLookup:
+        self._entries.move_to_end(key)
+        entry.hits += 1
+        self.stats.hits += 1
+        if exact:
+            self.stats.exact_hits += 1
+        return CacheLookup(entry, similarity, vector)
+
+    def put(
+        self,
+        query: str,
+        answer: Any,
+        chunk_ids: Sequence[str] = (),
+        vector: Optional[np.ndarray] = None,
+    ) -> CacheEntry:
+        """Cache an answer (pass the lookup's vector to avoid embedding the query twice)."""
+        self._check_store()
+        if vector is None:
+            vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+            vector /= float(np.linalg.norm(vector)) or 1.0
+        key = normalize_query(query)
+        entry = CacheEntry(query, vector, answer, tuple(chunk_ids), self._clock(), guard=query_guard(query))
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        self._matrix = None
+        return entry
+
+    def get_or_compute(
+        self,
+        query: str,
+        compute: Callable[[str], Tuple[Any, Sequence[str]]],
+    ) -> Tuple[Any, bool]:
+        """
+        Return (answer, from_cache). On a miss, compute(query) must return
+        (answer, retrieved chunk ids) and the result is cached.
+        """
+        found = self.lookup(query)
+        if found.entry is not None:
+            return found.entry.answer, True
+        answer, chunk_ids = compute(query)
+        self.put(query, answer, chunk_ids, vector=found.vector)
+        return answer, False
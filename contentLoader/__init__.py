@@ -1,13 +1,71 @@
-from .loader import (
-    load_documents,
-    load_from_text,
-    load_from_pdf,
-    load_from_csv,
-    load_from_web,
-    load_from_arxiv,
-    load_from_wikipedia,
-    chunk_docs,
-)
+# contentLoader/__init__.py
+# Public names resolve lazily (PEP 562): `import contentLoader` is cheap and a
+# submodule, with its LangChain / bs4 / PDF / aiohttp imports, loads on first use.
+
+from typing import TYPE_CHECKING
+
+from utils.lazy import lazy_exports
+
+_MODULES = {
+    ".loader": (
+        "load_documents",
+        "load_from_text",
+        "load_from_pdf",
+        "load_from_csv",
+        "load_from_web",
+        "load_from_arxiv",
+        "load_from_wikipedia",
+        "chunk_docs",
+        "infer_source_type",
+        "iter_documents",
+        "iter_chunk_docs",
+    ),
+    ".columnar": ("ColumnarCSVLoader", "CsvTable", "CsvDocuments", "load_csv_table"),
+    ".structured": ("RecordTable", "StructuredQuery", "StructuredAnswer", "detect_records", "detect_from_documents"),
+    ".pdf": ("PdfLoader", "PageTiming", "iter_pdf_pages", "load_pdf", "available_backends"),
+    ".manifest": ("IngestionManifest", "ManifestEntry", "ManifestStats"),
+    ".bulk": ("load_directory", "expand_sources", "flatten_results", "IngestResult"),
+    ".async_web": (
+        "AsyncFetcher",
+        "FetchResult",
+        "aiter_web_documents",
+        "aiter_web_chunks",
+        "aload_from_web",
+        "load_from_web_concurrent",
+        "aload_queries",
+    ),
+}
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _MODULES)
+
+if TYPE_CHECKING:  # static analysers and IDEs see the eager imports
+    from .loader import (
+        load_documents,
+        load_from_text,
+        load_from_pdf,
+        load_from_csv,
+        load_from_web,
+        load_from_arxiv,
+        load_from_wikipedia,
+        chunk_docs,
+        infer_source_type,
+        iter_documents,
+        iter_chunk_docs,
+    )
+    from .columnar import ColumnarCSVLoader, CsvTable, CsvDocuments, load_csv_table
+    from .structured import RecordTable, StructuredQuery, StructuredAnswer, detect_records, detect_from_documents
+    from .pdf import PdfLoader, PageTiming, iter_pdf_pages, load_pdf, available_backends
+    from .manifest import IngestionManifest, ManifestEntry, ManifestStats
+    from .bulk import load_directory, expand_sources, flatten_results, IngestResult
+    from .async_web import (
+        AsyncFetcher,
+        FetchResult,
+        aiter_web_documents,
+        aiter_web_chunks,
+        aload_from_web,
+        load_from_web_concurrent,
+        aload_queries,
+    )
+
 __all__ = [
     "load_documents",
     "load_from_text",
@@ -17,4 +75,35 @@ __all__ = [
     "load_from_arxiv",
     "load_from_wikipedia",
     "chunk_docs",
+    "infer_source_type",
+    "iter_documents",
+    "iter_chunk_docs",
+    "ColumnarCSVLoader",
+    "CsvTable",
+    "CsvDocuments",
+    "load_csv_table",
+    "RecordTable",
+    "StructuredQuery",
+    "StructuredAnswer",
+    "detect_records",
+    "detect_from_documents",
+    "PdfLoader",
+    "PageTiming",
+    "iter_pdf_pages",
+    "load_pdf",
+    "available_backends",
+    "IngestionManifest",
+    "ManifestEntry",
+    "ManifestStats",
+    "load_directory",
+    "expand_sources",
+    "flatten_results",
+    "IngestResult",
+    "AsyncFetcher",
+    "FetchResult",
+    "aiter_web_documents",
+    "aiter_web_chunks",
+    "aload_from_web",
+    "load_from_web_concurrent",
+    "aload_queries",
 ]
@@ -0,0 +1,247 @@
+# contentLoader/async_web.py
+# Async, concurrent web ingestion with one pooled HTTP client.
+#
+# - a single aiohttp session (connection pooling / keep-alive) per run
+# - global and per-host concurrency limits, timeouts, retries with backoff
+# - HTML parsing (bs4) on a worker pool so the event loop never blocks
+# - documents (or chunks) are yielded as soon as each page is parsed
+# - ArXiv / Wikipedia queries run concurrently on threads
+#
+# Output Documents match WebBaseLoader (same text, source/title/description/language).
+
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+import asyncio
+import random
+import time
+
+from langchain_core.documents import Document
+
+from .loader import DEFAULT_CSS_CLASSES, iter_chunk_docs, load_from_arxiv, load_from_wikipedia, parse_html
+
+# Optional dependency (only needed for the async path)
+try:
+    import aiohttp
+except Exception:
+    aiohttp = None
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int = 0
+    text: str = ""
+    error: Optional[str] = None
+    attempts: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 300
+
+
+class AsyncFetcher:
+    """
+    Pooled async HTTP GET client. Use as an async context manager:
+
+        async with AsyncFetcher(per_host=4) as fetcher:
+            result = await fetcher.fetch(url)
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 32,
+        per_host: int = 4,
+        timeout: float = 20.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for async web loading. Install it with `pip install aiohttp`.")
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = headers or {"User-Agent": "GenAI-Home-Automation/1.0"}
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        # semaphores bind to the running loop: a fetcher reused across
+        # asyncio.run() calls needs fresh ones for each session
+        self._host_limits = {}
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=self.headers,
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._host_limits = {}
+
+    def _limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        """GET `url`; retries on connection errors, timeouts, 429 and 5xx. Never raises."""
+        if self._session is None:
+            raise RuntimeError("AsyncFetcher must be used inside `async with`.")
+        result = FetchResult(url)
+        start = time.perf_counter()
+        async with self._limit(url):
+            for attempt in range(self.retries + 1):
+                result.attempts = attempt + 1
+                try:
+                    async with self._session.get(url, headers=headers) as resp:
+                        result.status = resp.status
+                        if resp.status in _RETRY_STATUS and attempt < self.retries:
+                            raise _Retry(f"HTTP {resp.status}")
+                        result.text = await resp.text(errors="replace")
+                        result.error = None if resp.status < 400 else f"HTTP {resp.status}"
+                        break
+                except (_Retry, aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    result.error = f"{type(exc).__name__}: {exc}"
+                    if attempt < self.retries:
+                        await asyncio.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random() / 2))
+        result.seconds = time.perf_counter() - start
+        return result
+
+
+class _Retry(Exception):
+    pass
+
+
+# ----------------------------
+# Parsing (runs on a worker pool)
+# ----------------------------
+def _make_executor(parse_workers: Optional[int], use_processes: bool) -> Executor:
+    if use_processes:
+        return ProcessPoolExecutor(max_workers=parse_workers)
+    return ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix="html-parse")
+
+
+# ----------------------------
+# Streaming entry points
+# ----------------------------
+async def aiter_web_documents(
+    urls: Union[str, Iterable[str]],
+    css_classes: Sequence[str] = DEFAULT_CSS_CLASSES,
+    fetcher: Optional[AsyncFetcher] = None,
+    parse_workers: Optional[int] = None,
+    use_processes: bool = False,
+    errors: Optional[List[FetchResult]] = None,
+    **fetcher_kwargs,
+) -> AsyncIterator[Tuple[int, Document]]:
+    """
+    Fetch and parse many URLs concurrently, yielding (input_index, Document)
+    in completion order. Failed URLs are skipped and, if `errors` is given,
+    their FetchResult is appended to it.
+
+    fetcher_kwargs configure a new AsyncFetcher (per_host, timeout, retries, ...)
+    when `fetcher` is not supplied.
+    """
+    if isinstance(urls, str):
+        urls = (urls,)
+    urls = list(urls)
+    loop = asyncio.get_running_loop()
+    executor = _make_executor(parse_workers, use_processes)
+    own_fetcher = fetcher is None
+    fetcher = fetcher or AsyncFetcher(**fetcher_kwargs)
+    try:
+        if own_fetcher:
+            await fetcher.__aenter__()
+
+        async def one(i: int, url: str):
+            res = await fetcher.fetch(url)
+            if not res.ok:
+                return i, res, None
+            doc = await loop.run_in_executor(executor, parse_html, url, res.text, tuple(css_classes))
+            return i, res, doc
+
+        tasks = [asyncio.ensure_future(one(i, u)) for i, u in enumerate(urls)]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                i, res, doc = await fut
+                if doc is None:
+                    if errors is not None:
+                        errors.append(res)
+                    continue
+                yield i, doc
+        finally:
+            for t in tasks:
+                t.cancel()
+    finally:
+        if own_fetcher:
+            await fetcher.__aexit__(None, None, None)
+        executor.shutdown(wait=False)
+
+
+async def aiter_web_chunks(
+    urls: Union[str, Iterable[str]],
+    chunk_size: int = 1000,
+    chunk_overlap: int = 150,
+    **kwargs,
+) -> AsyncIterator[Document]:
+    """Like aiter_web_documents, but each page is split (chunk_docs settings) as soon as it arrives."""
+    async for _, doc in aiter_web_documents(urls, **kwargs):
+        for chunk in iter_chunk_docs([doc], chunk_size=chunk_size, chunk_overlap=chunk_overlap):
+            yield chunk
+
+
+async def aload_from_web(urls: Union[str, Iterable[str]], **kwargs) -> List[Document]:
+    """Concurrent load_from_web: all pages, in input order (failed URLs omitted)."""
+    found: Dict[int, Document] = {}
+    async for i, doc in aiter_web_documents(urls, **kwargs):
+        found[i] = doc
+    return [found[i] for i in sorted(found)]
+
+
+def load_from_web_concurrent(urls: Union[str, Iterable[str]], **kwargs) -> List[Document]:
+    """Blocking wrapper around aload_from_web (for scripts / the CLI)."""
+    return asyncio.run(aload_from_web(urls, **kwargs))
+
+
+async def aload_queries(
+    queries: Sequence[str],
+    source_type: str = "arxiv",
+    concurrency: int = 4,
+    load_max_docs: int = 2,
+    lang: str = "en",
+) -> List[List[Document]]:
+    """
+    Run several ArXiv or Wikipedia queries concurrently (their loaders are
+    blocking, so each runs on a thread). Results are in query order; a failed
+    query yields an empty list.
+    """
+    if source_type not in {"arxiv", "wikipedia"}:
+        raise ValueError("source_type must be 'arxiv' or 'wikipedia'")
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(q: str) -> List[Document]:
+        async with limit:
+            try:
+                if source_type == "arxiv":
+                    return await asyncio.to_thread(load_from_arxiv, q, load_max_docs)
+                return await asyncio.to_thread(load_from_wikipedia, q, load_max_docs, lang)
+            except ImportError:
+                raise
+            except Exception:
+                return []
+
+    return list(await asyncio.gather(*(one(q) for q in queries)))
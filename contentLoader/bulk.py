@@ -0,0 +1,118 @@
+# contentLoader/bulk.py
+# Directory / glob ingestion with process-pool parallel loading and splitting.
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import glob
+import os
+import time
+
+from .loader import load_documents, infer_source_type
+
+
+@dataclass
+class IngestResult:
+    source: str
+    source_type: Optional[str]
+    documents: List[Any] = field(default_factory=list)
+    error: Optional[str] = None   # "<ExceptionType>: message" if the file failed
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def expand_sources(pattern: str, recursive: bool = True) -> List[str]:
+    """
+    Resolve a directory or glob pattern to a sorted list of loadable files.
+
+    A directory is expanded to every file below it (or directly in it when
+    recursive=False). Files whose extension has no known loader are skipped.
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "**", "*") if recursive else os.path.join(pattern, "*")
+    paths = [p for p in glob.glob(pattern, recursive=recursive) if os.path.isfile(p)]
+    return sorted(p for p in paths if infer_source_type(p) is not None)
+
+
+def _ingest_one(path: str, chunk: bool, chunk_size: int, chunk_overlap: int, kwargs: Dict[str, Any]) -> IngestResult:
+    """Worker: load (+ chunk) one file. Never raises; errors are reported on the result."""
+    source_type = infer_source_type(path)
+    start = time.perf_counter()
+    try:
+        docs = load_documents(
+            path,
+            source_type=source_type,
+            chunk=chunk,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            **kwargs,
+        )
+        return IngestResult(path, source_type, docs, None, time.perf_counter() - start)
+    except Exception as exc:  # report per file, keep the batch going
+        return IngestResult(path, source_type, [], f"{type(exc).__name__}: {exc}", time.perf_counter() - start)
+
+
+def load_directory(
+    pattern: str,
+    workers: Optional[int] = None,
+    chunk: bool = True,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 150,
+    recursive: bool = True,
+    **kwargs,
+) -> List[IngestResult]:
+    """
+    Bulk entry point: load and split every file matching a directory or glob.
+
+    Parameters
+    ----------
+    pattern : str
+        Directory (e.g. "Content") or glob (e.g. "Content/**/*").
+        source_type is inferred per file from its extension, as in `load_documents`.
+    workers : Optional[int]
+        Process-pool size. None -> os.cpu_count(); 1 -> run in-process (no pool).
+    chunk, chunk_size, chunk_overlap :
+        Passed to `load_documents` for each file.
+    kwargs : dict
+        Extra loader args (encoding, csv_args, ...), applied to every file.
+
+    Returns
+    -------
+    list[IngestResult]
+        One result per file, in sorted path order regardless of completion
+        order. Failed files carry `error` and no documents.
+    """
+    paths = expand_sources(pattern, recursive=recursive)
+    if not paths:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(paths))
+    if workers == 1:
+        return [_ingest_one(p, chunk, chunk_size, chunk_overlap, kwargs) for p in paths]
+
+    # Files are already spread over processes; do not nest a page-level pool per PDF
+    kwargs.setdefault("pdf_workers", 1)
+
+    # Largest files first so one big PDF does not start last and become the tail;
+    # results are slotted back by index, so output order stays sorted-by-path.
+    order = sorted(range(len(paths)), key=lambda i: os.path.getsize(paths[i]), reverse=True)
+    results: List[Optional[IngestResult]] = [None] * len(paths)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_ingest_one, paths[i], chunk, chunk_size, chunk_overlap, kwargs): i
+            for i in order
+        }
+        for fut, i in futures.items():
+            results[i] = fut.result()
+    return results
+
+
+def flatten_results(results: List[IngestResult]) -> List[Any]:
+    """Concatenate the documents of all successful results, in order."""
+    return [doc for r in results if r.ok for doc in r.documents]
@@ -0,0 +1,451 @@
+# contentLoader/columnar.py
+# Columnar CSV ingestion for spreadsheet-style exports.
+#
+# CSVLoader takes the first line as the header and writes every column of
+# every row into the Document. Spreadsheet exports often start with blank
+# lines and carry dozens of empty columns, so the header collapses (every key
+# is "") and each Document is mostly ": " noise. This loader:
+#
+# - streams the file twice with csv.reader (nothing but column statistics is
+#   held between passes): pass 1 finds the header and the non-empty columns,
+#   pass 2 emits Documents
+# - detects the real header row (first non-blank, mostly non-numeric row)
+# - drops columns that are empty in every data row, and empty cells per row
+# - emits one Document per row or per group of N rows
+# - optionally keeps a typed table (numbers / dates / text) for totals and
+#   date filters that should not go through retrieval
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import csv
+import os
+import re
+
+import numpy as np
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+DATE_FORMATS = ("%d.%m.%Y", "%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d", "%d.%m.%y", "%d-%b-%Y", "%d %b %Y")
+TYPE_THRESHOLD = 0.8     # share of non-empty values that must parse for a typed column
+HEADER_SCAN_ROWS = 20
+TYPE_SAMPLE = 500        # non-empty values per column inspected for type inference
+TYPE_MIN_VALUES = 10     # fewer non-empty values than this -> text (too little evidence to type)
+
+_NUMBER_RE = re.compile(r"^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$")
+_CURRENCY = "$€£₹"
+_DICT_READER_ARGS = ("fieldnames", "restkey", "restval")   # CSVLoader's csv.DictReader-only keys
+
+
+def parse_number(value: str) -> Optional[float]:
+    """'1,950.00' / '₹ 300' / '-12.5' -> float; None if not a plain number."""
+    v = value.strip().lstrip(_CURRENCY).strip().replace(",", "")
+    if not _NUMBER_RE.match(v):
+        return None
+    return float(v)
+
+
+def parse_date(value: str, formats: Sequence[str] = DATE_FORMATS) -> Optional[date]:
+    v = value.strip()
+    if not v or not v[0].isdigit():
+        return None
+    for fmt in formats:
+        try:
+            return datetime.strptime(v, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _blank(row: Sequence[str]) -> bool:
+    return not "".join(row).strip()
+
+
+def looks_like_header(row: Sequence[str]) -> bool:
+    """At least two non-empty cells, and most of them neither numbers nor dates."""
+    cells = [c.strip() for c in row if c.strip()]
+    if len(cells) < 2:
+        return False
+    typed = sum(parse_number(c) is not None or parse_date(c) is not None for c in cells)
+    return typed <= len(cells) // 2
+
+
+def _column_names(header: Sequence[str], width: int) -> List[str]:
+    """Header cells -> unique names; unnamed columns become column_<n> (1-based)."""
+    names, seen = [], {}
+    for i in range(width):
+        name = header[i].strip() if i < len(header) else ""
+        name = name or f"column_{i + 1}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}_{seen[name]}"
+        else:
+            seen[name] = 1
+        names.append(name)
+    return names
+
+
+# ----------------------------
+# Typed table
+# ----------------------------
+@dataclass
+class CsvTable:
+    """
+    Typed, column-oriented copy of a CSV's data rows (pruned columns only).
+
+    Numbers are float64 (NaN when missing or unparseable), dates are
+    datetime64[D] (NaT), text is an object array of str ("" when missing).
+
+        aug = loader.table
+        m = aug.mask(DATE=(date(2025, 8, 1), date(2025, 8, 31)))
+        aug.total("PAY", m)
+    """
+    source: str
+    columns: List[str]
+    types: Dict[str, str]
+    data: Dict[str, np.ndarray] = field(repr=False)
+    rows_index: np.ndarray = field(repr=False)    # data-row number of each table row
+
+    def __len__(self) -> int:
+        return int(self.rows_index.size)
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self.data:
+            raise KeyError(f"Unknown column {name!r}; columns: {self.columns}")
+        return self.data[name]
+
+    def mask(self, **conditions: Any) -> np.ndarray:
+        """
+        Boolean row mask; conditions are ANDed.
+          col=(lo, hi)    inclusive range, either end may be None (numbers, dates)
+          col=callable    predicate applied to each value
+          col=value       equality (text is compared case-insensitively)
+        """
+        m = np.ones(len(self), dtype=bool)
+        for name, cond in conditions.items():
+            col, kind = self.column(name), self.types[name]
+            if isinstance(cond, tuple) and len(cond) == 2:
+                lo, hi = (np.datetime64(c, "D") if kind == "date" and c is not None else c for c in cond)
+                if lo is not None:
+                    m &= col >= lo
+                if hi is not None:
+                    m &= col <= hi
+            elif callable(cond):
+                m &= np.fromiter((bool(cond(v)) for v in col), dtype=bool, count=len(col))
+            elif kind == "text":
+                m &= np.char.lower(col.astype(str)) == str(cond).lower()
+            elif kind == "date":
+                m &= col == np.datetime64(cond, "D")
+            else:
+                m &= col == cond
+        return m
+
+    def total(self, name: str, mask: Optional[np.ndarray] = None) -> float:
+        """Sum of a numeric column (missing values ignored)."""
+        if self.types[name] != "number":
+            raise TypeError(f"Column {name!r} is {self.types[name]}, not number")
+        col = self.column(name)
+        return float(np.nansum(col if mask is None else col[mask]))
+
+    def count(self, mask: Optional[np.ndarray] = None) -> int:
+        return len(self) if mask is None else int(mask.sum())
+
+    def rows(self, mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """Matching rows as dicts of typed values (missing values omitted)."""
+        idx = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        out = []
+        for i in idx.tolist():
+            row = {}
+            for name in self.columns:
+                v = self.data[name][i]
+                kind = self.types[name]
+                if kind == "number" and not np.isnan(v):
+                    row[name] = float(v)
+                elif kind == "date" and not np.isnat(v):
+                    row[name] = v.astype(date)
+                elif kind == "text" and v:
+                    row[name] = v
+            out.append(row)
+        return out
+
+    def describe(self) -> Dict[str, Dict[str, Any]]:
+        """Per-column type, non-missing count and min/max/sum where meaningful."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for name in self.columns:
+            col, kind = self.data[name], self.types[name]
+            if kind == "number":
+                ok = col[~np.isnan(col)]
+                out[name] = {"type": kind, "count": int(ok.size), "sum": float(ok.sum()),
+                             "min": float(ok.min()) if ok.size else None, "max": float(ok.max()) if ok.size else None}
+            elif kind == "date":
+                ok = col[~np.isnat(col)]
+                out[name] = {"type": kind, "count": int(ok.size),
+                             "min": ok.min().astype(date) if ok.size else None,
+                             "max": ok.max().astype(date) if ok.size else None}
+            else:
+                out[name] = {"type": kind, "count": int(sum(1 for v in col if v))}
+        return out
+
+
+class _TableBuilder:
+    def __init__(self, columns: List[str], types: Dict[str, str], date_formats: Dict[str, str]):
+        self.columns = columns
+        self.types = types
+        self.date_formats = date_formats
+        self.values: Dict[str, list] = {c: [] for c in columns}
+        self.rows: List[int] = []
+
+    def add(self, row_no: int, cells: Sequence[str]) -> None:
+        self.rows.append(row_no)
+        for name, cell in zip(self.columns, cells):
+            kind = self.types[name]
+            if kind == "number":
+                v = parse_number(cell) if cell else None
+                self.values[name].append(np.nan if v is None else v)
+            elif kind == "date":
+                fmt = self.date_formats.get(name)
+                d = parse_date(cell, (fmt,) + DATE_FORMATS if fmt else DATE_FORMATS) if cell else None
+                self.values[name].append(np.datetime64(d, "D") if d else np.datetime64("NaT", "D"))
+            else:
+                self.values[name].append(cell)
+
+    def build(self, source: str) -> CsvTable:
+        data = {}
+        for name in self.columns:
+            kind = self.types[name]
+            dtype = np.float64 if kind == "number" else "datetime64[D]" if kind == "date" else object
+            data[name] = np.array(self.values[name], dtype=dtype)
+        return CsvTable(source, list(self.columns), dict(self.types), data, np.asarray(self.rows, dtype=np.int64))
+
+
+class CsvDocuments(list):
+    """Documents from a keep_table load, with the typed table as `.table`."""
+
+    def __init__(self, docs=(), table: Optional[CsvTable] = None):
+        super().__init__(docs)
+        self.table = table
+
+
+# ----------------------------
+# Loader
+# ----------------------------
+@dataclass
+class CsvLayout:
+    """Result of the scan pass."""
+    header_line: Optional[int]        # 0-based file row of the header (None: no header)
+    names: List[str]                  # kept column names
+    keep: List[int]                   # kept column indices
+    types: Dict[str, str]
+    date_formats: Dict[str, str]
+    data_rows: int
+    dropped: List[int]                # all-empty column indices
+
+
+class ColumnarCSVLoader(BaseLoader):
+    """
+    Compact CSV loader (see module header). Drop-in for CSVLoader where the
+    per-row "key: value" layout is wanted without the empty columns.
+
+    Parameters
+    ----------
+    path : str
+    rows_per_doc : int
+        1 -> one Document per data row (metadata "row" like CSVLoader);
+        N -> N consecutive rows per Document ("row" = first, "row_end" = last).
+    layout : str
+        "records": "name: value" lines per row, empty cells skipped;
+        "table": header line once, then one " | "-joined line per row.
+    header : Optional[int]
+        0-based file row of the header; None -> detect; -1 -> no header row.
+    keep_table : bool
+        Also build a typed CsvTable, available as `self.table` after loading.
+        Columns with fewer than TYPE_MIN_VALUES non-empty values stay text.
+    csv_args : dict
+        Passed to csv.reader (delimiter, quotechar, ...). CSVLoader's
+        DictReader-only keys are accepted too: `fieldnames` names the columns
+        and, as in DictReader, makes every row data (header=-1 unless given);
+        `restkey` / `restval` have no effect (extra cells get column_<n> names).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rows_per_doc: int = 1,
+        layout: str = "records",
+        header: Optional[int] = None,
+        keep_table: bool = False,
+        encoding: str = "utf-8-sig",
+        csv_args: Optional[dict] = None,
+    ):
+        if rows_per_doc < 1:
+            raise ValueError("rows_per_doc must be >= 1")
+        if layout not in ("records", "table"):
+            raise ValueError(f"Unknown layout {layout!r}; choose 'records' or 'table'")
+        self.path = path
+        self.rows_per_doc = rows_per_doc
+        self.layout = layout
+        self.header = header
+        self.keep_table = keep_table
+        self.encoding = encoding
+        args = dict(csv_args or {})
+        fieldnames = args.pop("fieldnames", None)
+        for key in _DICT_READER_ARGS:
+            args.pop(key, None)
+        self.fieldnames: Optional[List[str]] = list(fieldnames) if fieldnames else None
+        if self.fieldnames is not None and header is None:
+            self.header = -1
+        self.csv_args = args
+        self.layout_info: Optional[CsvLayout] = None
+        self.table: Optional[CsvTable] = None
+
+    def _rows(self) -> Iterator[List[str]]:
+        with open(self.path, "r", encoding=self.encoding, newline="") as fh:
+            yield from csv.reader(fh, **self.csv_args)
+
+    def scan(self) -> CsvLayout:
+        """Pass 1: header row, non-empty columns and column types."""
+        header_line = None if self.header is None else (None if self.header < 0 else self.header)
+        header: List[str] = []
+        width = 0
+        filled: List[int] = []
+        sampled: List[int] = []
+        numbers: List[int] = []
+        dates: Dict[int, Dict[str, int]] = {}
+        data_rows = 0
+        candidates: List[Tuple[int, List[str]]] = []   # rows seen before the header is known
+
+        def account(row: List[str]) -> None:
+            nonlocal width, data_rows
+            if _blank(row):
+                return
+            data_rows += 1
+            if len(row) > width:
+                grow = len(row) - width
+                filled.extend([0] * grow)
+                sampled.extend([0] * grow)
+                numbers.extend([0] * grow)
+                width = len(row)
+            for i, cell in enumerate(row):
+                cell = cell.strip()
+                if not cell:
+                    continue
+                filled[i] += 1
+                if sampled[i] >= TYPE_SAMPLE:
+                    continue
+                sampled[i] += 1
+                if parse_number(cell) is not None:
+                    numbers[i] += 1
+                elif cell[0].isdigit():
+                    for fmt in DATE_FORMATS:
+                        try:
+                            datetime.strptime(cell, fmt)
+                        except ValueError:
+                            continue
+                        dates.setdefault(i, {}).setdefault(fmt, 0)
+                        dates[i][fmt] += 1
+                        break
+
+        header_found = self.header is not None
+        for line, row in enumerate(self._rows()):
+            if not header_found:
+                if line == HEADER_SCAN_ROWS:
+                    # no header-like row near the top: treat everything as data
+                    header_found = True
+                    for _, r in candidates:
+                        account(r)
+                elif looks_like_header(row):
+                    header_line, header, header_found = line, row, True
+                    continue
+                else:
+                    candidates.append((line, row))
+                    continue
+            if header_line is not None and line == header_line:
+                header = row
+                continue
+            if header_line is not None and line < header_line:
+                continue
+            account(row)
+        if not header_found:       # short file without a header-like row
+            for _, r in candidates:
+                account(r)
+
+        if self.fieldnames is not None:
+            header = self.fieldnames
+        names_all = _column_names(header, max(width, len(header)))
+        keep = [i for i in range(width) if filled[i]]
+        types, date_formats = {}, {}
+        for i in keep:
+            name = names_all[i]
+            best_fmt, n_dates = max(dates.get(i, {}).items(), key=lambda kv: kv[1], default=(None, 0))
+            if sampled[i] < TYPE_MIN_VALUES:
+                types[name] = "text"    # e.g. a few side notes in an otherwise empty column
+            elif numbers[i] >= TYPE_THRESHOLD * sampled[i]:
+                types[name] = "number"
+            elif n_dates >= TYPE_THRESHOLD * sampled[i]:
+                types[name] = "date"
+                date_formats[name] = best_fmt
+            else:
+                types[name] = "text"
+        dropped = [i for i in range(max(width, len(header))) if i not in set(keep)]
+        self.layout_info = CsvLayout(header_line, [names_all[i] for i in keep], keep, types,
+                                     date_formats, data_rows, dropped)
+        return self.layout_info
+
+    def _data_rows(self, info: CsvLayout) -> Iterator[Tuple[int, List[str]]]:
+        """(data-row number, kept cells) for non-blank data rows."""
+        n = 0
+        start = -1 if info.header_line is None else info.header_line
+        for line, row in enumerate(self._rows()):
+            if line <= start or _blank(row):
+                continue
+            cells = [row[i].strip() if i < len(row) else "" for i in info.keep]
+            yield n, cells
+            n += 1
+
+    def _render(self, names: List[str], group: List[Tuple[int, List[str]]]) -> str:
+        if self.layout == "table":
+            lines = [" | ".join(names)]
+            lines += [" | ".join(cells).rstrip() for _, cells in group]
+            return "\n".join(lines)
+        records = ["\n".join(f"{n}: {c}" for n, c in zip(names, cells) if c) for _, cells in group]
+        return "\n\n".join(r for r in records if r)
+
+    def lazy_load(self) -> Iterator[Document]:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"CSV not found: {self.path}")
+        info = self.scan()
+        builder = _TableBuilder(info.names, info.types, info.date_formats) if self.keep_table else None
+        self.table = None
+
+        group: List[Tuple[int, List[str]]] = []
+
+        def emit() -> Document:
+            meta: Dict[str, Any] = {"source": self.path, "row": group[0][0]}
+            if self.rows_per_doc > 1:
+                meta["row_end"] = group[-1][0]
+            return Document(page_content=self._render(info.names, group), metadata=meta)
+
+        for row_no, cells in self._data_rows(info):
+            if not any(cells):
+                continue
+            if builder is not None:
+                builder.add(row_no, cells)
+            group.append((row_no, cells))
+            if len(group) == self.rows_per_doc:
+                yield emit()
+                group = []
+        if group:
+            yield emit()
+        if builder is not None:
+            self.table = builder.build(self.path)
+
+
+def load_csv_table(path: str, header: Optional[int] = None, encoding: str = "utf-8-sig",
+                   csv_args: Optional[dict] = None) -> CsvTable:
+    """Typed table only (no Documents)."""
+    loader = ColumnarCSVLoader(path, header=header, keep_table=True, encoding=encoding, csv_args=csv_args)
+    for _ in loader.lazy_load():
+        pass
+    return loader.table
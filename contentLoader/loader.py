@@ -2,140 +2,254 @@
 # Unified document loader utilities for multiple sources.
 # Works with: TXT, PDF, CSV, Web URLs, ArXiv, Wikipedia
 # Optional: text chunking via RecursiveCharacterTextSplitter
+#
+# The LangChain loaders, bs4 and the PDF backends are imported inside the
+# functions that use them: importing this module stays cheap, and a text-only
+# session never pays for the web/PDF stack.
 
 from __future__ import annotations
-from typing import Iterable, List, Optional, Union
-
-from langchain_community.document_loaders import (
-    TextLoader,
-    PyPDFLoader,
-    WebBaseLoader,
-    CSVLoader,
-)
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-# Lazy imports (only if you use them)
-try:
-    from langchain_community.document_loaders import ArxivLoader
-except Exception:
-    ArxivLoader = None
-
-try:
-    from langchain_community.document_loaders import WikipediaLoader
-except Exception:
-    WikipediaLoader = None
-
-import bs4
+from typing import Iterable, Iterator, List, Optional, Union
+
+from langchain_core.documents import Document
+
+from utils.documents import assign_chunk_ids
+from utils.instrument import timed
+from TextSplitter.registry import recursive_splitter, span_splitter
+
 import os
 
+DEFAULT_CSS_CLASSES = ("post-title", "post-content", "post-header")
+
 
 # ----------------------------
 # Core chunking helper
 # ----------------------------
+@timed("split.chunk_docs")
 def chunk_docs(
     docs,
     chunk_size: int = 1000,
     chunk_overlap: int = 150,
     add_start_index: bool = True,
+    engine: str = "langchain",
+    dedup: Optional[float] = None,
 ):
     """
     Split Documents into chunks for downstream embedding/RAG.
+    Each chunk gets a stable `id` (see utils.chunk_id).
+    engine: "langchain" or "span" (see TextSplitter.spans).
+    dedup: drop near-duplicate chunks at this similarity (see TextSplitter.dedup).
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        add_start_index=add_start_index,
-    )
-    return splitter.split_documents(docs)
+    chunks = assign_chunk_ids(_splitter(chunk_size, chunk_overlap, add_start_index, engine).split_documents(docs))
+    if dedup is not None:
+        from TextSplitter.dedup import NearDuplicateFilter
+        chunks = NearDuplicateFilter(dedup).filter(chunks)
+    return chunks
+
+
+def _splitter(chunk_size: int, chunk_overlap: int, add_start_index: bool, engine: str):
+    if engine == "span":
+        return span_splitter(chunk_size, chunk_overlap, add_start_index)
+    return recursive_splitter(chunk_size, chunk_overlap, add_start_index)
 
 
 # ----------------------------
 # File-based loaders
 # ----------------------------
-def load_from_text(path: str, encoding: str = "utf-8", autodetect_encoding: bool = True):
-    """
-    Load content from a plain text file.
-    """
+def _text_loader(path: str, encoding: str = "utf-8", autodetect_encoding: bool = True):
     if not os.path.exists(path):
         raise FileNotFoundError(f"Text file not found: {path}")
+    from langchain_community.document_loaders import TextLoader
+    return TextLoader(path, encoding=encoding, autodetect_encoding=autodetect_encoding)
+
+
+def _pdf_loader(path: str, backend: str = "pypdf", workers: Optional[int] = 1):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"PDF not found: {path}")
+    from .pdf import PdfLoader
+    return PdfLoader(path, backend=backend, workers=workers)
 
-    loader = TextLoader(path, encoding=encoding, autodetect_encoding=autodetect_encoding)
-    return loader.load()
 
+def _csv_loader(path: str, csv_args: Optional[dict] = None, columnar: bool = False,
+                rows_per_doc: int = 1, layout: str = "records", keep_table: bool = False):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"CSV not found: {path}")
+    if columnar or keep_table:   # only the columnar loader builds a typed table
+        from .columnar import ColumnarCSVLoader
+        return ColumnarCSVLoader(path, rows_per_doc=rows_per_doc, layout=layout, keep_table=keep_table,
+                                 csv_args=csv_args)
+    from langchain_community.document_loaders import CSVLoader
+    return CSVLoader(file_path=path, csv_args=csv_args or {})
 
-def load_from_pdf(path: str):
+
+def load_from_text(path: str, encoding: str = "utf-8", autodetect_encoding: bool = True):
     """
-    Load content from a PDF file using PyPDFLoader.
+    Load content from a plain text file.
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"PDF not found: {path}")
+    return _text_loader(path, encoding=encoding, autodetect_encoding=autodetect_encoding).load()
+
 
-    loader = PyPDFLoader(path)
-    return loader.load()
+def load_from_pdf(path: str, backend: str = "pypdf", workers: Optional[int] = 1):
+    """
+    Load content from a PDF file, one Document per page.
+    backend: "pypdf" (same output as PyPDFLoader), "pymupdf" (faster) or "auto".
+    workers: process-pool size for page-parallel extraction (1 = in-process,
+    the default; None = one per CPU).
+    """
+    return _pdf_loader(path, backend=backend, workers=workers).load()
 
 
-def load_from_csv(path: str, csv_args: Optional[dict] = None):
+def load_from_csv(path: str, csv_args: Optional[dict] = None, columnar: bool = False, rows_per_doc: int = 1,
+                  keep_table: bool = False):
     """
     Load content from a CSV file as Documents (each row -> one Document).
+    columnar=True: detect the header row, drop empty columns/cells and group
+    `rows_per_doc` rows per Document (see contentLoader.columnar); csv_args
+    go to csv.reader, with CSVLoader's `fieldnames` used as column names.
+    keep_table=True (implies columnar): the returned list also carries the
+    typed CsvTable as `.table`, for totals and date filters without retrieval.
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"CSV not found: {path}")
-
-    loader = CSVLoader(file_path=path, csv_args=csv_args or {})
-    return loader.load()
+    loader = _csv_loader(path, csv_args=csv_args, columnar=columnar, rows_per_doc=rows_per_doc,
+                         keep_table=keep_table)
+    docs = loader.load()
+    if keep_table:
+        from .columnar import CsvDocuments
+        return CsvDocuments(docs, loader.table)
+    return docs
 
 
 # ----------------------------
 # Web / API loaders
 # ----------------------------
-def load_from_web(
+def _web_loader(
     urls: Union[str, Iterable[str]],
-    css_classes: Iterable[str] = ("post-title", "post-content", "post-header"),
+    css_classes: Iterable[str] = DEFAULT_CSS_CLASSES,
 ):
-    """
-    Load content from one or many web pages.
-    """
+    import bs4
+    from langchain_community.document_loaders import WebBaseLoader
+
     if isinstance(urls, str):
         urls = (urls,)
-
-    loader = WebBaseLoader(
+    return WebBaseLoader(
         web_paths=tuple(urls),
         bs_kwargs=dict(parse_only=bs4.SoupStrainer(class_=tuple(css_classes))),
     )
-    return loader.load()
+
+
+def _arxiv_loader(query: str, load_max_docs: int = 2):
+    try:
+        from langchain_community.document_loaders import ArxivLoader
+    except Exception:
+        raise ImportError("ArxivLoader not available. Install langchain_community extras if needed.")
+    return ArxivLoader(query=query, load_max_docs=load_max_docs)
+
+
+def _wikipedia_loader(query: str, load_max_docs: int = 2, lang: str = "en"):
+    try:
+        from langchain_community.document_loaders import WikipediaLoader
+    except Exception:
+        raise ImportError("WikipediaLoader not available. Install langchain_community extras if needed.")
+    return WikipediaLoader(query=query, load_max_docs=load_max_docs, lang=lang)
+
+
+def parse_html(url: str, html: str, css_classes: Iterable[str] = DEFAULT_CSS_CLASSES) -> Document:
+    """HTML -> Document exactly as WebBaseLoader builds it (SoupStrainer on css_classes)."""
+    import bs4
+
+    css_classes = tuple(css_classes)
+    strainer = bs4.SoupStrainer(class_=css_classes) if css_classes else None
+    soup = bs4.BeautifulSoup(html, "html.parser", parse_only=strainer)
+    metadata = {"source": url}
+    if title := soup.find("title"):
+        metadata["title"] = title.get_text()
+    if description := soup.find("meta", attrs={"name": "description"}):
+        metadata["description"] = description.get("content", "No description found.")
+    if root := soup.find("html"):
+        metadata["language"] = root.get("lang", "No language found.")
+    return Document(page_content=soup.get_text(), metadata=metadata)
+
+
+def _load_web_cached(
+    urls: Union[str, Iterable[str]],
+    http_cache,
+    css_classes: Iterable[str] = DEFAULT_CSS_CLASSES,
+    chunk: bool = False,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 150,
+) -> List[Document]:
+    """
+    Web pages through a utils.HttpCache: unchanged pages (304) reuse the stored
+    body *and* the Documents/chunks already built from it.
+    """
+    if isinstance(urls, str):
+        urls = (urls,)
+    css_classes = tuple(css_classes)
+    split = (chunk_size, chunk_overlap) if chunk else None
+    out: List[Document] = []
+    with http_cache.batch():
+        for url in urls:
+            def build(resp, url=url):
+                docs = [parse_html(url, resp.text, css_classes)]
+                return chunk_docs(docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap) if chunk else docs
+            # the url is part of the key: Documents carry it as `source` (and in chunk ids),
+            # so a mirror serving the same bytes must not reuse them
+            out.extend(http_cache.derive(url, ("web", url, css_classes, split), build))
+    return out
+
+
+def load_from_web(
+    urls: Union[str, Iterable[str]],
+    css_classes: Iterable[str] = DEFAULT_CSS_CLASSES,
+    http_cache=None,
+):
+    """
+    Load content from one or many web pages.
+    Pass `http_cache` (utils.HttpCache) to revalidate with conditional requests
+    instead of downloading and parsing unchanged pages again.
+    """
+    if http_cache is not None:
+        return _load_web_cached(urls, http_cache, css_classes=css_classes)
+    return _web_loader(urls, css_classes=css_classes).load()
 
 
 def load_from_arxiv(query: str, load_max_docs: int = 2):
     """
     Load papers from ArXiv by query or ID (e.g., '1706.03762').
     """
-    if ArxivLoader is None:
-        raise ImportError("ArxivLoader not available. Install langchain_community extras if needed.")
-
-    loader = ArxivLoader(query=query, load_max_docs=load_max_docs)
-    return loader.load()
+    return _arxiv_loader(query, load_max_docs=load_max_docs).load()
 
 
 def load_from_wikipedia(query: str, load_max_docs: int = 2, lang: str = "en"):
     """
     Load pages from Wikipedia.
     """
-    if WikipediaLoader is None:
-        raise ImportError("WikipediaLoader not available. Install langchain_community extras if needed.")
-
-    loader = WikipediaLoader(query=query, load_max_docs=load_max_docs, lang=lang)
-    return loader.load()
+    return _wikipedia_loader(query, load_max_docs=load_max_docs, lang=lang).load()
 
 
 # ----------------------------
 # Auto-dispatch by source type
 # ----------------------------
+def infer_source_type(path: str) -> Optional[str]:
+    """
+    Infer the loader type from a file extension ("text", "pdf", "csv"), or None.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in {".txt", ".md", ".rst"}:
+        return "text"
+    elif ext in {".pdf"}:
+        return "pdf"
+    elif ext in {".csv"}:
+        return "csv"
+    return None
+
+
+@timed("load.documents")
 def load_documents(
     source: Union[str, Iterable[str]],
     source_type: Optional[str] = None,
     chunk: bool = False,
     chunk_size: int = 1000,
     chunk_overlap: int = 150,
+    dedup: Optional[float] = None,
     **kwargs,
 ):
     """
@@ -153,8 +267,15 @@ def load_documents(
         Whether to split documents into chunks.
     chunk_size : int
     chunk_overlap : int
+    dedup : Optional[float]
+        With chunk=True, drop near-duplicate chunks at this similarity
+        (MinHash-LSH, see TextSplitter.dedup) before they reach the embedder.
     kwargs : dict
-        Extra args passed to specific loaders (e.g., csv_args for CSV, lang for Wikipedia)
+        Extra args passed to specific loaders (e.g., csv_args for CSV, lang for Wikipedia,
+        pdf_backend / pdf_workers for PDF,
+        csv_columnar / csv_rows_per_doc / csv_layout for the columnar CSV loader,
+        csv_keep_table to get the typed CsvTable as `.table` on the returned list,
+        http_cache for web: a utils.HttpCache that also caches the split chunks)
 
     Returns
     -------
@@ -163,36 +284,109 @@ def load_documents(
 
     if source_type is None and isinstance(source, str):
         # try to infer from extension
-        ext = os.path.splitext(source)[1].lower()
-        if ext in {".txt", ".md", ".rst"}:
-            source_type = "text"
-        elif ext in {".pdf"}:
-            source_type = "pdf"
-        elif ext in {".csv"}:
-            source_type = "csv"
+        source_type = infer_source_type(source)
+
+    if source_type == "web" and kwargs.get("http_cache") is not None:
+        docs = _load_web_cached(
+            source, kwargs["http_cache"],
+            css_classes=kwargs.get("css_classes", DEFAULT_CSS_CLASSES),
+            chunk=chunk, chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+        )
+        if chunk and dedup is not None:
+            from TextSplitter.dedup import NearDuplicateFilter
+            return NearDuplicateFilter(dedup).filter(docs)
+        return docs
 
+    loader = _make_loader(source, source_type, **kwargs)
+    docs = loader.load()
+
+    if chunk:
+        docs = chunk_docs(docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap, dedup=dedup)
+    if source_type == "csv" and kwargs.get("csv_keep_table"):
+        from .columnar import CsvDocuments
+        return CsvDocuments(docs, loader.table)
+    return docs
+
+
+def _make_loader(source: Union[str, Iterable[str]], source_type: Optional[str], **kwargs):
+    """Build the LangChain loader for `source_type` (shared by load_documents/iter_documents)."""
     if source_type == "text":
-        docs = load_from_text(source, **{k: v for k, v in kwargs.items() if k in {"encoding", "autodetect_encoding"}})
+        return _text_loader(source, **{k: v for k, v in kwargs.items() if k in {"encoding", "autodetect_encoding"}})
     elif source_type == "pdf":
-        docs = load_from_pdf(source)
+        return _pdf_loader(source, backend=kwargs.get("pdf_backend", "pypdf"), workers=kwargs.get("pdf_workers", 1))
     elif source_type == "csv":
-        docs = load_from_csv(source, csv_args=kwargs.get("csv_args"))
+        return _csv_loader(source, csv_args=kwargs.get("csv_args"), columnar=kwargs.get("csv_columnar", False),
+                           rows_per_doc=kwargs.get("csv_rows_per_doc", 1), layout=kwargs.get("csv_layout", "records"),
+                           keep_table=kwargs.get("csv_keep_table", False))
     elif source_type == "web":
-        docs = load_from_web(source, css_classes=kwargs.get("css_classes", ("post-title", "post-content", "post-header")))
+        return _web_loader(source, css_classes=kwargs.get("css_classes", DEFAULT_CSS_CLASSES))
     elif source_type == "arxiv":
-        docs = load_from_arxiv(query=str(source), load_max_docs=int(kwargs.get("load_max_docs", 2)))
+        return _arxiv_loader(query=str(source), load_max_docs=int(kwargs.get("load_max_docs", 2)))
     elif source_type == "wikipedia":
-        docs = load_from_wikipedia(query=str(source), load_max_docs=int(kwargs.get("load_max_docs", 2)), lang=kwargs.get("lang", "en"))
-    else:
-        raise ValueError(
-            "Unable to determine source_type. "
-            "Pass source_type explicitly: one of {'text','pdf','csv','web','arxiv','wikipedia'} "
-            "or provide a file path with a known extension."
-        )
+        return _wikipedia_loader(query=str(source), load_max_docs=int(kwargs.get("load_max_docs", 2)), lang=kwargs.get("lang", "en"))
+    raise ValueError(
+        "Unable to determine source_type. "
+        "Pass source_type explicitly: one of {'text','pdf','csv','web','arxiv','wikipedia'} "
+        "or provide a file path with a known extension."
+    )
+
+
+# ----------------------------
+# Streaming (lazy) variants
+# ----------------------------
+@timed("split.iter_chunk_docs")
+def iter_chunk_docs(
+    docs: Iterable[Document],
+    chunk_size: int = 1000,
+    chunk_overlap: int = 150,
+    add_start_index: bool = True,
+    engine: str = "langchain",
+    dedup: Optional[float] = None,
+) -> Iterator[Document]:
+    """
+    Lazy `chunk_docs`: split each Document as it arrives and yield its chunks.
+    Output is identical to chunk_docs(list(docs)), but only one source
+    Document is held at a time (plus, with dedup, the filter's signatures).
+    """
+    splitter = _splitter(chunk_size, chunk_overlap, add_start_index, engine)
+    chunks = (c for doc in docs for c in assign_chunk_ids(splitter.split_documents([doc])))
+    if dedup is not None:
+        from TextSplitter.dedup import NearDuplicateFilter
+        chunks = NearDuplicateFilter(dedup).iter_filter(chunks)
+    yield from chunks
+
+
+@timed("load.iter_documents")
+def iter_documents(
+    source: Union[str, Iterable[str]],
+    source_type: Optional[str] = None,
+    chunk: bool = False,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 150,
+    dedup: Optional[float] = None,
+    **kwargs,
+) -> Iterator[Document]:
+    """
+    Lazy counterpart of `load_documents`.
 
+    Yields Documents through the loaders' `lazy_load()`: PDFs page by page,
+    CSVs row by row, text files whole. With chunk=True each Document is split
+    as soon as it is produced, so the first chunks are available before the
+    last page is parsed and memory stays bounded by one page plus its chunks.
+    Parameters are the same as `load_documents`.
+    """
+    if source_type is None and isinstance(source, str):
+        source_type = infer_source_type(source)
+
+    if source_type == "web" and kwargs.get("http_cache") is not None:
+        yield from load_documents(source, source_type, chunk, chunk_size, chunk_overlap, dedup, **kwargs)
+        return
+
+    docs = _make_loader(source, source_type, **kwargs).lazy_load()
     if chunk:
-        return chunk_docs(docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-    return docs
+        yield from iter_chunk_docs(docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap, dedup=dedup)
+    else:
+        yield from docs
 
 
 # ----------------------------
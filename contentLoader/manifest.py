@@ -0,0 +1,280 @@
+# contentLoader/manifest.py
+# Persistent, content-hashed ingestion manifest.
+# Unchanged files are served from cached Documents/chunks; only new or
+# modified files go back through the loaders and the splitter.
+
+from __future__ import annotations
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import hashlib
+import json
+import os
+
+from utils.documents import dump_documents, read_documents
+from .loader import load_documents, chunk_docs, infer_source_type
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+FILE_SOURCE_TYPES = {"text", "pdf", "csv"}
+
+# Loader kwargs that change what a file loads to (and so belong in the cache key)
+_LOADER_ARG_KEYS = {"encoding", "autodetect_encoding", "csv_args", "pdf_backend",
+                    "csv_columnar", "csv_rows_per_doc", "csv_layout"}
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """Streaming SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    source: str
+    source_type: str
+    sha256: str
+    size: int
+    mtime_ns: int
+    loader_args: Dict[str, Any] = field(default_factory=dict)
+    docs_file: str = ""
+    # Chunking parameters of the cached chunks (None -> nothing chunked yet)
+    split: Optional[Dict[str, Any]] = None
+    chunks_file: Optional[str] = None
+
+
+@dataclass
+class ManifestStats:
+    hits: int = 0        # served from cached chunks/docs, no parsing
+    resplits: int = 0    # file unchanged, chunking params changed -> re-split only
+    loads: int = 0       # file new or modified -> loaded and split
+
+
+class IngestionManifest:
+    """
+    Cache of loaded/split file sources keyed by path, validated by content hash.
+
+    Each entry records the file's SHA-256, size, mtime, loader type, loader args
+    and the chunking parameters of its cached chunks. On lookup:
+      - size+mtime unchanged          -> cached result (no hashing)
+      - mtime changed, hash unchanged -> cached result (mtime refreshed)
+      - hash/loader args changed      -> reload + re-split
+      - only chunking params changed  -> re-split the cached raw Documents
+
+    Non-file sources (web, arxiv, wikipedia) pass straight through to
+    `load_documents`.
+    """
+
+    def __init__(self, cache_dir: str = ".ingest_cache"):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, MANIFEST_FILE)
+        self.stats = ManifestStats()
+        self.entries: Dict[str, ManifestEntry] = {}
+        self._dirty = False
+        os.makedirs(os.path.join(cache_dir, "docs"), exist_ok=True)
+        self._read()
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def _read(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return  # corrupt manifest -> start fresh, files are re-ingested
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        for key, raw in data.get("entries", {}).items():
+            self.entries[key] = ManifestEntry(**raw)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"version": MANIFEST_VERSION, "entries": {k: asdict(e) for k, e in self.entries.items()}},
+                fh,
+                indent=1,
+            )
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def _save_if_dirty(self) -> None:
+        if self._dirty:
+            self.save()
+
+    def _blob(self, key: str, kind: str) -> str:
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.cache_dir, "docs", f"{name}.{kind}.jsonl")
+
+    # ----------------------------
+    # Lookup
+    # ----------------------------
+    @staticmethod
+    def split_params(
+        chunk_size: int = 1000,
+        chunk_overlap: int = 150,
+        add_start_index: bool = True,
+        cfg=None,
+        dedup: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Chunking parameters as stored in the manifest (chunk_docs kwargs); `cfg` (a SplitConfig) wins if given."""
+        if cfg is not None:
+            chunk_size = cfg.chunk_size
+            chunk_overlap = cfg.chunk_overlap
+            add_start_index = cfg.add_start_index
+            dedup = cfg.dedup
+        params = {"chunk_size": int(chunk_size), "chunk_overlap": int(chunk_overlap), "add_start_index": bool(add_start_index)}
+        engine = getattr(cfg, "engine", "langchain")
+        # non-default options only, so entries written before they existed stay valid
+        if engine != "langchain":
+            params["engine"] = engine   # start_index may differ
+        if dedup is not None:
+            params["dedup"] = float(dedup)
+        return params
+
+    def is_fresh(self, path: str, source_type: Optional[str] = None) -> bool:
+        """True if `path` has a manifest entry whose content still matches the file."""
+        entry = self.entries.get(self._key(path))
+        if entry is None or not os.path.exists(path):
+            return False
+        if source_type is not None and entry.source_type != source_type:
+            return False
+        return self._content_matches(entry, path)
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _content_matches(self, entry: ManifestEntry, path: str) -> bool:
+        st = os.stat(path)
+        if st.st_size != entry.size:
+            return False
+        if st.st_mtime_ns == entry.mtime_ns:
+            return True
+        # touched but maybe not modified: fall back to the content hash
+        if file_sha256(path) != entry.sha256:
+            return False
+        entry.mtime_ns = st.st_mtime_ns
+        self._dirty = True
+        return True
+
+    def load_documents(
+        self,
+        source: Union[str, Iterable[str]],
+        source_type: Optional[str] = None,
+        chunk: bool = False,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 150,
+        cfg=None,
+        dedup: Optional[float] = None,
+        **kwargs,
+    ) -> List:
+        """
+        Drop-in for `contentLoader.load_documents` backed by the manifest.
+
+        Parameters
+        ----------
+        cfg : Optional[SplitConfig]
+            If given, its chunk_size/chunk_overlap/add_start_index/engine/dedup are used for chunking.
+        dedup : Optional[float]
+            Near-duplicate threshold for the chunks (per source; see TextSplitter.dedup).
+        Other parameters as in `load_documents`.
+        """
+        if source_type is None and isinstance(source, str):
+            source_type = infer_source_type(source)
+
+        # cached Documents do not carry a CsvTable, so table loads always parse the file
+        if source_type not in FILE_SOURCE_TYPES or not isinstance(source, str) or kwargs.get("csv_keep_table"):
+            return load_documents(source, source_type=source_type, chunk=chunk,
+                                  chunk_size=chunk_size, chunk_overlap=chunk_overlap, dedup=dedup, **kwargs)
+        if not os.path.exists(source):
+            # let the loader raise its usual FileNotFoundError
+            return load_documents(source, source_type=source_type, chunk=False, **kwargs)
+
+        key = self._key(source)
+        loader_args = {k: v for k, v in kwargs.items() if k in _LOADER_ARG_KEYS}
+        split = self.split_params(chunk_size, chunk_overlap, cfg=cfg, dedup=dedup) if chunk else None
+        entry = self.entries.get(key)
+
+        if (
+            entry is not None
+            and entry.source_type == source_type
+            and entry.loader_args == json.loads(json.dumps(loader_args))
+            and os.path.exists(entry.docs_file)
+            and self._content_matches(entry, source)
+        ):
+            if not chunk:
+                self.stats.hits += 1
+                self._save_if_dirty()
+                return read_documents(entry.docs_file)
+            if entry.split == split and entry.chunks_file and os.path.exists(entry.chunks_file):
+                self.stats.hits += 1
+                self._save_if_dirty()
+                return read_documents(entry.chunks_file)
+            # only the chunking parameters changed: re-split cached raw docs
+            self.stats.resplits += 1
+            chunks = chunk_docs(read_documents(entry.docs_file), **split)
+            self._store_chunks(entry, key, split, chunks)
+            self.save()
+            return chunks
+
+        self.stats.loads += 1
+        st = os.stat(source)
+        docs = load_documents(source, source_type=source_type, chunk=False, **kwargs)
+        entry = ManifestEntry(
+            source=source,
+            source_type=source_type,
+            sha256=file_sha256(source),
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            loader_args=loader_args,
+            docs_file=self._blob(key, "docs"),
+        )
+        dump_documents(docs, entry.docs_file)
+        self.entries[key] = entry
+        if not chunk:
+            self.save()
+            return docs
+        chunks = chunk_docs(docs, **split)
+        self._store_chunks(entry, key, split, chunks)
+        self.save()
+        return chunks
+
+    def _store_chunks(self, entry: ManifestEntry, key: str, split: Dict[str, Any], chunks: List) -> None:
+        entry.split = split
+        entry.chunks_file = self._blob(key, "chunks")
+        dump_documents(chunks, entry.chunks_file)
+
+    # ----------------------------
+    # Maintenance
+    # ----------------------------
+    def invalidate(self, source: Optional[str] = None) -> None:
+        """Forget one source (or every source if None) and remove its cached files."""
+        keys = [self._key(source)] if source is not None else list(self.entries)
+        for key in keys:
+            self._drop(key)
+        self.save()
+
+    def prune(self) -> int:
+        """Drop entries whose source file no longer exists. Returns how many were removed."""
+        gone = [key for key, e in self.entries.items() if not os.path.exists(e.source)]
+        for key in gone:
+            self._drop(key)
+        if gone:
+            self.save()
+        return len(gone)
+
+    def _drop(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for blob in (entry.docs_file, entry.chunks_file):
+            if blob and os.path.exists(blob):
+                os.remove(blob)
@@ -0,0 +1,240 @@
+# contentLoader/pdf.py
+# Page-parallel PDF extraction with selectable backends.
+#
+# - backends: "pypdf" (same text as PyPDFLoader) and "pymupdf" (much faster)
+# - page ranges are sharded across a process pool; each worker opens the file
+#   itself, so only (page, text) tuples cross the process boundary
+# - pages are yielded lazily, in page order, with per-page timing
+#
+# Documents carry the same metadata as PyPDFLoader (source, page, page_label,
+# total_pages and the normalized PDF info dict).
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import importlib
+import importlib.util
+import os
+import time
+
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+PDF_BACKENDS = ("pypdf", "pymupdf")
+
+# Importable module names per backend (PyMuPDF < 1.24 is only `fitz`)
+_BACKEND_MODULES = {"pypdf": ("pypdf",), "pymupdf": ("pymupdf", "fitz")}
+_loaded: Dict[str, Any] = {}
+
+# Below this many pages a process pool costs more than it saves
+MIN_PAGES_PER_WORKER = 8
+
+
+@dataclass
+class PageTiming:
+    page: int
+    seconds: float
+    chars: int
+
+
+def _installed(backend: str) -> bool:
+    """True if the backend can be imported (checked without importing it)."""
+    return any(importlib.util.find_spec(mod) is not None for mod in _BACKEND_MODULES[backend])
+
+
+def _backend(backend: str):
+    """Import a backend on first use (the PDF libraries are slow to import)."""
+    mod = _loaded.get(backend)
+    if mod is None:
+        for name in _BACKEND_MODULES[backend]:
+            try:
+                mod = importlib.import_module(name)
+                break
+            except Exception:
+                continue
+        else:
+            raise ImportError(f"PDF backend {backend!r} is not installed. Install it with `pip install {backend}`.")
+        _loaded[backend] = mod
+    return mod
+
+
+def available_backends() -> List[str]:
+    """Installed PDF backends, fastest first."""
+    return [name for name in ("pymupdf", "pypdf") if _installed(name)]
+
+
+def resolve_backend(backend: str = "pypdf") -> str:
+    """Validate `backend`; "auto" picks the fastest installed one."""
+    if backend == "auto":
+        found = available_backends()
+        if not found:
+            raise ImportError("No PDF backend installed. Install `pymupdf` or `pypdf`.")
+        return found[0]
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}; choose one of {PDF_BACKENDS + ('auto',)}")
+    _backend(backend)
+    return backend
+
+
+# ----------------------------
+# Backend primitives
+# ----------------------------
+def _normalize_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    """PDF info dict -> PyPDFLoader-style metadata (lowercase keys, ISO dates, stripped strings)."""
+    out: Dict[str, Any] = {}
+    for k, v in info.items():
+        if type(v) not in (str, int):
+            v = str(v)
+        k = k.lstrip("/").lower()
+        if k in ("creationdate", "moddate"):
+            try:
+                out[k] = datetime.strptime(v.replace("'", ""), "D:%Y%m%d%H%M%S%z").isoformat("T")
+            except ValueError:
+                out[k] = v
+        else:
+            out[k] = v.strip() if isinstance(v, str) else v
+    return out
+
+
+def _document_info(path: str, backend: str) -> Tuple[Dict[str, Any], int]:
+    """(document-level metadata, page count) without extracting any text."""
+    if backend == "pypdf":
+        reader = _backend("pypdf").PdfReader(path)
+        info = {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""}
+        info.update(reader.metadata or {})
+        n_pages = len(reader.pages)
+    else:
+        with _backend("pymupdf").open(path) as doc:
+            info = {"producer": "", "creator": "", "creationdate": ""}
+            info.update({k: v for k, v in (doc.metadata or {}).items() if k not in ("format", "encryption")})
+            n_pages = doc.page_count
+    meta = _normalize_info(info)
+    meta.update(source=path, total_pages=n_pages)
+    return meta, n_pages
+
+
+def _iter_range(path: str, backend: str, start: int, stop: int) -> Iterator[Tuple[int, str, str, float]]:
+    """Extract pages [start, stop) one at a time -> (page, text, page_label, seconds)."""
+    if backend == "pypdf":
+        reader = _backend("pypdf").PdfReader(path)
+        labels = reader.page_labels   # computed for the whole file, so fetch once per range
+        for i in range(start, stop):
+            t0 = time.perf_counter()
+            text = reader.pages[i].extract_text(extraction_mode="plain").strip()
+            yield i, text, labels[i], time.perf_counter() - t0
+    else:
+        with _backend("pymupdf").open(path) as doc:
+            for i in range(start, stop):
+                t0 = time.perf_counter()
+                page = doc[i]
+                text = page.get_text().strip()
+                yield i, text, page.get_label() or str(i + 1), time.perf_counter() - t0
+
+
+def _extract_range(path: str, backend: str, start: int, stop: int) -> List[Tuple[int, str, str, float]]:
+    """Process-pool task: a whole shard at once."""
+    return list(_iter_range(path, backend, start, stop))
+
+
+def _shards(pages: Sequence[int], n_shards: int) -> List[Tuple[int, int]]:
+    """Split sorted page numbers into contiguous [start, stop) ranges, about equal in size."""
+    ranges: List[Tuple[int, int]] = []
+    for p in pages:
+        if ranges and ranges[-1][1] == p:
+            ranges[-1] = (ranges[-1][0], p + 1)
+        else:
+            ranges.append((p, p + 1))
+    size = max(1, -(-len(pages) // max(1, n_shards)))
+    out = []
+    for start, stop in ranges:
+        out.extend((s, min(s + size, stop)) for s in range(start, stop, size))
+    return out
+
+
+# ----------------------------
+# Public API
+# ----------------------------
+def iter_pdf_pages(
+    path: str,
+    backend: str = "pypdf",
+    pages: Optional[Sequence[int]] = None,
+    workers: Optional[int] = 1,
+    timings: Optional[List[PageTiming]] = None,
+) -> Iterator[Document]:
+    """
+    Lazily yield one Document per page, in page order.
+
+    Parameters
+    ----------
+    path : str
+    backend : str
+        "pypdf" (text identical to PyPDFLoader), "pymupdf" (fastest) or "auto".
+    pages : Optional[Sequence[int]]
+        0-based page numbers to extract (default: all).
+    workers : Optional[int]
+        Process-pool size for page sharding. 1 (default) -> in-process, like
+        PyPDFLoader; parallel extraction is opt-in: None -> cpu count. Small documents (< MIN_PAGES_PER_WORKER pages per worker) use fewer workers.
+    timings : Optional[list]
+        If given, a PageTiming per page is appended as pages are produced.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"PDF not found: {path}")
+    backend = resolve_backend(backend)
+    base_meta, n_pages = _document_info(path, backend)
+    wanted = sorted({p for p in pages if 0 <= p < n_pages}) if pages is not None else list(range(n_pages))
+    if not wanted:
+        return
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(wanted) // MIN_PAGES_PER_WORKER))
+
+    def emit(rows):
+        for page, text, label, seconds in rows:
+            if timings is not None:
+                timings.append(PageTiming(page, seconds, len(text)))
+            yield Document(page_content=text, metadata={**base_meta, "page": page, "page_label": label})
+
+    if workers == 1:
+        for start, stop in _shards(wanted, 1):
+            yield from emit(_iter_range(path, backend, start, stop))
+        return
+
+    # ~4 shards per worker for load balancing; at most 2 shards per worker in flight
+    shards = _shards(wanted, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        next_shard = 0
+        while next_shard < len(shards) or pending:
+            while next_shard < len(shards) and len(pending) < workers * 2:
+                pending.append(pool.submit(_extract_range, path, backend, *shards[next_shard]))
+                next_shard += 1
+            yield from emit(pending.pop(0).result())
+
+
+def load_pdf(path: str, backend: str = "pypdf", **kwargs) -> List[Document]:
+    """Eager iter_pdf_pages (same arguments)."""
+    return list(iter_pdf_pages(path, backend=backend, **kwargs))
+
+
+class PdfLoader(BaseLoader):
+    """
+    LangChain loader over iter_pdf_pages (drop-in for PyPDFLoader).
+    Per-page timings of the last load are kept in `self.timings`.
+    """
+
+    def __init__(self, path: str, backend: str = "pypdf", workers: Optional[int] = 1,
+                 pages: Optional[Sequence[int]] = None):
+        self.path = path
+        self.backend = backend
+        self.workers = workers
+        self.pages = pages
+        self.timings: List[PageTiming] = []
+
+    def lazy_load(self) -> Iterator[Document]:
+        self.timings = []
+        yield from iter_pdf_pages(self.path, backend=self.backend, pages=self.pages,
+                                  workers=self.workers, timings=self.timings)
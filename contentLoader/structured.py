@@ -0,0 +1,397 @@
+# contentLoader/structured.py
+# Structured fast path for line-oriented key/value logs.
+#
+# Attendance and sensor logs are regular records, one per line:
+#
+#   EmpID:001,Entry: "09:15", Exit:"17:23"
+#   ts=2025-08-01 07:00:05; room=kitchen; temp=23.5
+#
+# Chunking and embedding them to answer "who left after 17:30?" costs an
+# embedding call and an LLM round-trip for what is a range lookup. This module:
+#
+# - detects the format at load time (most non-blank lines parse completely
+#   into key/value pairs over a shared key set)
+# - parses the records into a compact column table: times and numbers go to
+#   array('d') columns with a sorted index each (bisect range lookups), text
+#   columns get a value -> rows hash index
+# - turns simple questions ("who left after 17:30", "how many entered before
+#   9:20", "when did 003 leave", "who left last") into conditions on that
+#   table, and returns None for anything else so the caller falls back to
+#   retrieval
+#
+# Only the standard library is used, so building the table at CLI start-up
+# does not pull in numpy or LangChain.
+
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import bisect
+import re
+
+from utils import instrument
+
+DETECT_THRESHOLD = 0.9   # share of non-blank lines that must parse as records
+MIN_RECORDS = 2
+TYPE_THRESHOLD = 0.8     # share of non-empty values that must parse for a typed column
+
+_PAIR_RE = re.compile(
+    r"""\s*(?P<key>[A-Za-z_][\w.\- ]{0,40}?)\s*[:=]\s*"""
+    r"""(?P<val>"[^"]*"|'[^']*'|[^,;|]*?)\s*(?:[,;|]|$)"""
+)
+_TIME_RE = re.compile(r"^(\d{1,2})(?:[:.](\d{2})(?:[:.](\d{2}))?)?(?:\s*([ap])\.?m\.?)?$", re.I)
+_NUMBER_RE = re.compile(r"^[+-]?(\d+(\.\d*)?|\.\d+)$")
+_NAN = float("nan")
+
+
+def parse_record(line: str) -> Optional[Dict[str, str]]:
+    """'EmpID:001,Entry: "09:15"' -> {'EmpID': '001', 'Entry': '09:15'}; None unless the whole line parses."""
+    line = line.strip()
+    if not line:
+        return None
+    record: Dict[str, str] = {}
+    pos = 0
+    while pos < len(line):
+        m = _PAIR_RE.match(line, pos)
+        if m is None or m.end() == pos:
+            return None
+        record[m.group("key").strip()] = m.group("val").strip().strip("\"'")
+        pos = m.end()
+    return record if len(record) >= 2 else None
+
+
+def parse_time(value: str) -> Optional[float]:
+    """
+    '09:15' / '9.15' / '17:23:40' / '5:30 pm' / '5pm' -> seconds since midnight;
+    None otherwise. A bare hour needs am/pm, and 12-hour times need 1 <= h <= 12.
+    """
+    m = _TIME_RE.match(value.strip())
+    if m is None or (m.group(2) is None and m.group(4) is None):
+        return None
+    h, mi, s = int(m.group(1)), int(m.group(2) or 0), int(m.group(3) or 0)
+    if m.group(4):
+        if not 1 <= h <= 12:
+            return None
+        h = h % 12 + (12 if m.group(4).lower() == "p" else 0)
+    if h > 23 or mi > 59 or s > 59:
+        return None
+    return float(h * 3600 + mi * 60 + s)
+
+
+def format_time(seconds: float) -> str:
+    s = int(seconds)
+    h, m, s = s // 3600, s // 60 % 60, s % 60
+    return f"{h:02d}:{m:02d}" + (f":{s:02d}" if s else "")
+
+
+def _parse_number(value: str) -> Optional[float]:
+    v = value.strip().replace(",", "")
+    return float(v) if _NUMBER_RE.match(v) else None
+
+
+_PARSERS = {"time": parse_time, "number": _parse_number}
+
+
+# ----------------------------
+# Record table
+# ----------------------------
+@dataclass
+class RecordTable:
+    """
+    Column-oriented copy of a log's records.
+
+    "time" columns hold seconds since midnight and "number" columns floats,
+    both in array('d') (NaN when missing) with a sorted index for range
+    lookups; "text" columns are lists of str with a lowercase value -> rows
+    index. `key` is the first text column whose values are all distinct (the
+    record identifier, e.g. EmpID).
+    """
+    source: str
+    columns: List[str]
+    types: Dict[str, str]
+    data: Dict[str, Sequence] = field(repr=False)
+    lines: List[int] = field(repr=False)          # 0-based line number of each record
+    key: Optional[str] = None
+    _sorted: Dict[str, Tuple[array, array]] = field(default_factory=dict, repr=False)
+    _lookup: Dict[str, Dict[str, List[int]]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        for name in self.columns:
+            col = self.data[name]
+            if self.types[name] == "text":
+                index: Dict[str, List[int]] = {}
+                for i, v in enumerate(col):
+                    if v:
+                        index.setdefault(v.lower(), []).append(i)
+                self._lookup[name] = index
+            else:
+                order = sorted((i for i, v in enumerate(col) if v == v), key=col.__getitem__)
+                self._sorted[name] = (array("d", (col[i] for i in order)), array("l", order))
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def ordered(self) -> List[str]:
+        """Typed (time / number) columns, in file order."""
+        return [c for c in self.columns if self.types[c] != "text"]
+
+    def range(self, name: str, lo: Optional[float] = None, hi: Optional[float] = None,
+              lo_open: bool = False, hi_open: bool = False) -> List[int]:
+        """Rows with lo <= value <= hi (strict when *_open), via bisect on the sorted index."""
+        values, order = self._sorted[name]
+        start = 0 if lo is None else (bisect.bisect_right if lo_open else bisect.bisect_left)(values, lo)
+        stop = len(values) if hi is None else (bisect.bisect_left if hi_open else bisect.bisect_right)(values, hi)
+        return list(order[start:stop]) if start < stop else []
+
+    def equals(self, name: str, value: str) -> List[int]:
+        if self.types[name] == "text":
+            return list(self._lookup[name].get(value.lower(), ()))
+        parsed = _PARSERS[self.types[name]](value)
+        return [] if parsed is None else self.range(name, parsed, parsed)
+
+    def extreme(self, name: str, largest: bool) -> List[int]:
+        """Rows holding the min (or max) of a typed column (ties included)."""
+        values, order = self._sorted[name]
+        if not values:
+            return []
+        target = values[-1] if largest else values[0]
+        return self.range(name, target, target)
+
+    def value(self, name: str, row: int) -> str:
+        v = self.data[name][row]
+        if self.types[name] == "text":
+            return v
+        if v != v:
+            return ""
+        return format_time(v) if self.types[name] == "time" else f"{v:g}"
+
+    def record(self, row: int) -> Dict[str, str]:
+        return {c: self.value(c, row) for c in self.columns}
+
+    def label(self, row: int) -> str:
+        return f"{self.key} {self.value(self.key, row)}" if self.key else f"line {self.lines[row] + 1}"
+
+
+def _column_type(name: str, values: List[str]) -> str:
+    present = [v for v in values if v]
+    if not present:
+        return "text"
+    # identifiers stay text: "EmpID", "sensor_id", zero-padded codes like "001"
+    if re.search(r"(^|[^a-z])id$|ID$|Id$", name) or any(len(v) > 1 and v[0] == "0" and v.isdigit() for v in present):
+        return "text"
+    for kind, parse in _PARSERS.items():
+        if sum(parse(v) is not None for v in present) >= TYPE_THRESHOLD * len(present):
+            return kind
+    return "text"
+
+
+def detect_records(text: str, source: str = "") -> Optional[RecordTable]:
+    """RecordTable if `text` is a line-oriented key/value log, else None."""
+    with instrument.timer("structured.detect"):
+        parsed: List[Tuple[int, Dict[str, str]]] = []
+        total = 0
+        for no, line in enumerate(text.splitlines()):
+            if not line.strip():
+                continue
+            total += 1
+            rec = parse_record(line)
+            if rec is not None:
+                parsed.append((no, rec))
+        if len(parsed) < MIN_RECORDS or len(parsed) < DETECT_THRESHOLD * total:
+            return None
+
+        # keys present in at least half of the records, in first-seen order
+        seen: Dict[str, int] = {}
+        for _, rec in parsed:
+            for k in rec:
+                seen[k] = seen.get(k, 0) + 1
+        columns = [k for k, n in seen.items() if n * 2 >= len(parsed)]
+        if len(columns) < 2:
+            return None
+
+        types: Dict[str, str] = {}
+        data: Dict[str, Sequence] = {}
+        for name in columns:
+            raw = [rec.get(name, "") for _, rec in parsed]
+            kind = types[name] = _column_type(name, raw)
+            if kind == "text":
+                data[name] = raw
+            else:
+                parse = _PARSERS[kind]
+                data[name] = array("d", (_NAN if (p := parse(v)) is None else p for v in raw))
+        key = next((c for c in columns if types[c] == "text"
+                    and len(set(data[c])) == len(parsed) and all(data[c])), None)
+        return RecordTable(source, columns, types, data, [no for no, _ in parsed], key)
+
+
+def detect_from_documents(docs: Iterable) -> Optional[RecordTable]:
+    """Run detect_records over loaded text Documents (first source that qualifies)."""
+    by_source: Dict[str, List[str]] = {}
+    for d in docs:
+        by_source.setdefault(str(d.metadata.get("source", "")), []).append(d.page_content)
+    for source, parts in by_source.items():
+        table = detect_records("\n".join(parts), source)
+        if table is not None:
+            return table
+    return None
+
+
+# ----------------------------
+# Query routing
+# ----------------------------
+# Comparators, longest phrases first; values are (lower-bound, upper-bound, strict) operators
+_COMPARATORS = [
+    (r"at or after|no earlier than|not before|>=", "ge"),
+    (r"at or before|no later than|not after|<=", "le"),
+    (r"later than|after|past|over|more than|greater than|above|>", "gt"),
+    (r"earlier than|before|under|less than|below|<", "lt"),
+    (r"at|on|exactly|equal to|=", "eq"),
+]
+# times (optionally am/pm, which makes a bare hour a time too) before plain numbers
+_MERIDIEM = r"\s*[ap]\.?m\b\.?"
+_VALUE = rf"(\d{{1,2}}[:.]\d{{2}}(?::\d{{2}})?(?:{_MERIDIEM})?|\d{{1,2}}{_MERIDIEM}|[+-]?\d+(?:\.\d+)?)"
+_BETWEEN_RE = re.compile(rf"\bbetween\s+{_VALUE}\s+(?:and|to|-)\s+{_VALUE}", re.I)
+_COMPARE_RE = re.compile(rf"(?<!\w)({'|'.join(p for p, _ in _COMPARATORS)})\s*{_VALUE}(?![\w:])", re.I)
+_OPS = {}
+for _pattern, _op in _COMPARATORS:
+    for _phrase in _pattern.split("|"):
+        _OPS[_phrase] = _op
+
+# Verbs that name a field without saying it ("who left ..." -> a column named like exit)
+FIELD_ALIASES = {
+    "exit": ("left", "leave", "leaves", "leaving", "exited", "exits", "departed", "went out", "checked out", "exit"),
+    "entry": ("entered", "enter", "enters", "arrived", "arrive", "arrives", "came", "come", "entry", "checked in"),
+}
+_COUNT_RE = re.compile(r"\b(how many|count|number of)\b", re.I)
+_EXTREME_RE = re.compile(r"\b(first|earliest|last|latest|highest|lowest|max(?:imum)?|min(?:imum)?)\b", re.I)
+_LARGEST = {"last", "latest", "highest", "max", "maximum"}
+
+
+@dataclass
+class StructuredAnswer:
+    text: str
+    rows: List[int]
+    conditions: List[str]
+
+
+class StructuredQuery:
+    """
+    Answer simple questions from a RecordTable; `answer()` returns None when
+    the question does not map onto the table, so the caller can use retrieval.
+
+        table = detect_records(open("Content/Attendance.txt").read())
+        StructuredQuery(table).answer("who left after 17:30?")
+    """
+
+    def __init__(self, table: RecordTable, aliases: Optional[Dict[str, Sequence[str]]] = None):
+        self.table = table
+        self._fields: List[Tuple[re.Pattern, str]] = []
+        for name in table.columns:
+            self._fields.append((re.compile(rf"\b{re.escape(name)}\b", re.I), name))
+        for target, words in (aliases or FIELD_ALIASES).items():
+            name = next((c for c in table.ordered() if c.lower() == target
+                         or c.lower().startswith(target)), None)
+            if name is not None:
+                for w in words:
+                    self._fields.append((re.compile(rf"\b{re.escape(w)}\b", re.I), name))
+
+    def _field_before(self, query: str, pos: int, value: Optional[str] = None) -> Optional[str]:
+        """
+        Typed column mentioned closest before `pos`, else first after it, else
+        the only candidate. A `value` with a colon or am/pm ("22:00", "5 pm")
+        only matches time columns.
+        """
+        is_time = value is not None and (":" in value or re.search(_MERIDIEM + "$", value, re.I))
+        kinds = ("time",) if is_time else ("time", "number")
+        candidates = [c for c in self.table.ordered() if self.table.types[c] in kinds]
+        best, where, after, after_at = None, -1, None, len(query)
+        for pattern, name in self._fields:
+            if name not in candidates:
+                continue
+            for m in pattern.finditer(query):
+                if m.start() < pos and m.start() > where:
+                    best, where = name, m.start()
+                elif m.start() >= pos and m.start() < after_at:
+                    after, after_at = name, m.start()
+        best = best or after
+        if best is None and len(candidates) == 1:
+            return candidates[0]
+        return best
+
+    def _parse(self, name: str, raw: str) -> Optional[float]:
+        return _PARSERS[self.table.types[name]](raw)
+
+    def answer(self, query: str) -> Optional[StructuredAnswer]:
+        with instrument.timer("structured.query"):
+            return self._answer(query)
+
+    def _answer(self, query: str) -> Optional[StructuredAnswer]:
+        table = self.table
+        rows: Optional[set] = None
+        conditions: List[str] = []
+        asked: Optional[str] = None     # field the question is about ("when did 003 leave")
+
+        def narrow(found: Iterable[int], desc: str) -> None:
+            nonlocal rows
+            rows = set(found) if rows is None else rows & set(found)
+            conditions.append(desc)
+
+        taken: List[Tuple[int, int]] = []
+        for m in _BETWEEN_RE.finditer(query):
+            name = self._field_before(query, m.start(), m.group(1))
+            lo, hi = (self._parse(name, m.group(i)) for i in (1, 2)) if name else (None, None)
+            if lo is None or hi is None:
+                continue
+            narrow(table.range(name, min(lo, hi), max(lo, hi)), f"{name} between {m.group(1)} and {m.group(2)}")
+            taken.append(m.span())
+        for m in _COMPARE_RE.finditer(query):
+            if any(a <= m.start() < b for a, b in taken):
+                continue
+            name = self._field_before(query, m.start(), m.group(2))
+            value = self._parse(name, m.group(2)) if name else None
+            if value is None:
+                continue
+            op = _OPS[m.group(1).lower()]
+            if op == "eq":
+                found = table.range(name, value, value)
+            elif op in ("gt", "ge"):
+                found = table.range(name, lo=value, lo_open=op == "gt")
+            else:
+                found = table.range(name, hi=value, hi_open=op == "lt")
+            narrow(found, f"{name} {m.group(1).lower()} {m.group(2)}")
+            taken.append(m.span())
+
+        # record identifiers mentioned by value ("when did 003 leave?")
+        if table.key is not None:
+            for token in re.findall(r"[\w-]+", query):
+                hit = table.equals(table.key, token)
+                if hit:
+                    narrow(hit, f"{table.key} = {token}")
+                    asked = self._field_before(query, len(query))
+
+        extreme = _EXTREME_RE.search(query)
+        if extreme and not taken:
+            name = self._field_before(query, len(query))
+            if name is not None:
+                largest = extreme.group(1).lower().startswith(tuple(_LARGEST))
+                found = table.extreme(name, largest)
+                narrow(found, f"{'max' if largest else 'min'} {name}")
+                asked = name
+
+        if rows is None:
+            return None
+        ordered = sorted(rows)
+        shown = self._show(ordered, asked, conditions, bool(_COUNT_RE.search(query)))
+        return StructuredAnswer(shown, ordered, conditions)
+
+    def _show(self, rows: List[int], asked: Optional[str], conditions: List[str], count_only: bool) -> str:
+        table = self.table
+        where = " and ".join(conditions)
+        if count_only or not rows:
+            return f"{len(rows)} record(s) where {where}."
+        if asked is not None and len(rows) <= 3:
+            parts = [f"{table.label(r)}: {asked} {table.value(asked, r)}" for r in rows]
+            return "; ".join(parts) + "."
+        body = "\n".join(", ".join(f"{k}: {v}" for k, v in table.record(r).items()) for r in rows)
+        return f"{len(rows)} record(s) where {where}:\n{body}"
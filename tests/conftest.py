@@ -0,0 +1,10 @@
+# tests/conftest.py
+# Offline test suite: run `python -m pytest -q` from the repository root.
+# Modules import as top-level packages (Embedding, VectorDB, ...), as in the CLI.
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
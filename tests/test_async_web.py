@@ -0,0 +1,129 @@
+# tests/test_async_web.py
+# AsyncFetcher / aload_from_web against a local aiohttp stand-in server that
+# serves the fixture pages in tests/fixtures/web (no network access).
+
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+
+from contentLoader.async_web import AsyncFetcher, aload_from_web
+from contentLoader.loader import parse_html
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "web")
+
+
+def _app(state):
+    async def page(request):
+        path = os.path.join(FIXTURES, request.match_info["name"])
+        if not os.path.exists(path):
+            raise web.HTTPNotFound()
+        with open(path, encoding="utf-8") as fh:
+            return web.Response(text=fh.read(), content_type="text/html")
+
+    async def flaky(request):
+        key = request.match_info["key"]
+        state.calls[key] += 1
+        if state.calls[key] <= int(request.query.get("fail", "0")):
+            return web.Response(status=503, text="busy")
+        return web.Response(text="<p class='post-content'>recovered</p>", content_type="text/html")
+
+    async def slow(request):
+        host = request.headers["Host"].split(":")[0]
+        state.inflight[host] += 1
+        state.max_inflight[host] = max(state.max_inflight[host], state.inflight[host])
+        state.max_total = max(state.max_total, sum(state.inflight.values()))
+        try:
+            await asyncio.sleep(float(request.query.get("d", "0.1")))
+        finally:
+            state.inflight[host] -= 1
+        return web.Response(text="<p class='post-content'>done</p>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/pages/{name}", page)
+    app.router.add_get("/flaky/{key}", flaky)
+    app.router.add_get("/slow", slow)
+    return app
+
+
+@pytest.fixture
+def server():
+    """The stand-in server runs on its own loop in a thread, so tests can call asyncio.run freely."""
+    state = SimpleNamespace(calls=Counter(), inflight=Counter(), max_inflight=Counter(), max_total=0)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    runner = web.AppRunner(_app(state))
+    asyncio.run_coroutine_threadsafe(runner.setup(), loop).result()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    asyncio.run_coroutine_threadsafe(site.start(), loop).result()
+    port = site._server.sockets[0].getsockname()[1]
+    yield SimpleNamespace(url=lambda path, host="127.0.0.1": f"http://{host}:{port}{path}", state=state)
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def _fetch_all(urls, **kwargs):
+    async def go():
+        async with AsyncFetcher(backoff=0.01, **kwargs) as fetcher:
+            return await asyncio.gather(*(fetcher.fetch(u) for u in urls))
+
+    return asyncio.run(go())
+
+
+def test_documents_match_parse_html_in_input_order(server):
+    urls = [server.url("/pages/post.html"), server.url("/pages/missing.html"), server.url("/pages/thermostat.html")]
+    errors = []
+    docs = asyncio.run(aload_from_web(urls, errors=errors, retries=0))
+    for url, doc, name in zip((urls[0], urls[2]), docs, ("post.html", "thermostat.html")):
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as fh:
+            expected = parse_html(url, fh.read())
+        assert doc.page_content == expected.page_content and doc.metadata == expected.metadata
+    assert "Site navigation" not in docs[0].page_content
+    assert [e.url for e in errors] == [urls[1]] and errors[0].status == 404
+
+
+def test_retries_transient_status_then_succeeds(server):
+    (res,) = _fetch_all([server.url("/flaky/a?fail=2")], retries=2)
+    assert res.ok and res.attempts == 3 and "recovered" in res.text
+
+
+def test_gives_up_after_retries(server):
+    (res,) = _fetch_all([server.url("/flaky/b?fail=5")], retries=1)
+    assert not res.ok and res.status == 503 and res.attempts == 2 and res.error == "HTTP 503"
+    assert server.state.calls["b"] == 2
+
+
+def test_timeout_is_reported_not_raised(server):
+    start = time.perf_counter()
+    (res,) = _fetch_all([server.url("/slow?d=2")], timeout=0.2, retries=1)
+    assert not res.ok and "Timeout" in res.error and res.attempts == 2
+    assert time.perf_counter() - start < 1.5
+
+
+def test_per_host_limit(server):
+    urls = [server.url("/slow?d=0.1", host) for host in ("127.0.0.1", "localhost") for _ in range(6)]
+    results = _fetch_all(urls, per_host=2, retries=0)
+    assert all(r.ok for r in results)
+    assert server.state.max_inflight["127.0.0.1"] == 2 and server.state.max_inflight["localhost"] == 2
+    assert server.state.max_total > 2     # hosts are limited separately
+
+
+def test_fetcher_reused_across_event_loops(server):
+    fetcher = AsyncFetcher(per_host=1, retries=0)
+    urls = [server.url("/slow?d=0.02") for _ in range(3)]
+
+    async def go():
+        async with fetcher:
+            return await asyncio.gather(*(fetcher.fetch(u) for u in urls))
+
+    for _ in range(2):      # the second run has a new loop
+        assert all(r.ok for r in asyncio.run(go()))
@@ -0,0 +1,46 @@
+# tests/test_batch_search.py
+# similarity_search_many matches a loop of similarity_search calls.
+
+from Embedding import HashEmbeddings
+from VectorDB import NumpyVectorStore
+
+
+class PrefixEmbeddings(HashEmbeddings):
+    """Asymmetric embedder: queries are embedded with an instruction prefix."""
+
+    def embed_query(self, text):
+        return super().embed_query("query: " + text)
+
+
+TEXTS = ["kitchen light schedule", "garage door opener", "thermostat at night", "query: garage",
+         "porch camera motion", "living room lamp"]
+QUERIES = ["garage", "kitchen light", "night thermostat"]
+
+
+def _ids(hits):
+    return [[doc.page_content for doc, _ in per_query] for per_query in hits]
+
+
+def test_many_uses_query_embeddings():
+    emb = PrefixEmbeddings(64)
+    store = NumpyVectorStore.from_texts(TEXTS, emb)
+    loop = [store.similarity_search_with_score(q, k=3) for q in QUERIES]
+    many = store.similarity_search_many_with_score(QUERIES, k=3)
+    assert _ids(many) == _ids(loop)
+    for a, b in zip(loop, many):
+        assert [s for _, s in a] == [s for _, s in b]
+
+
+def test_queries_as_documents_opt_in():
+    emb = PrefixEmbeddings(64)
+    store = NumpyVectorStore.from_texts(TEXTS, emb)
+    as_docs = store.similarity_search_many_with_score(QUERIES, k=3, queries_as_documents=True)
+    expected = [store.similarity_search_with_score_by_vector(v, k=3) for v in emb.embed_documents(QUERIES)]
+    assert _ids(as_docs) == _ids(expected)
+
+
+def test_many_with_filter_and_empty():
+    store = NumpyVectorStore.from_texts(TEXTS, HashEmbeddings(64), metadatas=[{"i": i} for i in range(len(TEXTS))])
+    assert store.similarity_search_many([], k=2) == []
+    hits = store.similarity_search_many(QUERIES, k=2, filter={"i": {"$lt": 3}})
+    assert all(d.metadata["i"] < 3 for per_query in hits for d in per_query)
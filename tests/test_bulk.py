@@ -0,0 +1,47 @@
+# tests/test_bulk.py
+# load_directory: results in sorted path order, per-file errors without
+# aborting the run, in-process and with the process pool.
+
+import pytest
+
+from contentLoader.bulk import expand_sources, flatten_results, load_directory
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "content"
+    (root / "sub").mkdir(parents=True)
+    (root / "b.txt").write_text("Boiler manual.\n", encoding="utf-8")
+    (root / "a.txt").write_text("Alarm codes.\n", encoding="utf-8")
+    # largest file: submitted first to the pool, must still come back in path order
+    (root / "sub" / "z.txt").write_text("Zone heating schedule. " * 2000, encoding="utf-8")
+    (root / "c_broken.pdf").write_bytes(b"this is not a pdf")
+    (root / "notes.xyz").write_text("no loader for this", encoding="utf-8")
+    return root
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sorted_results_and_per_file_errors(tree, workers):
+    results = load_directory(str(tree), workers=workers, chunk=True, chunk_size=500, chunk_overlap=0)
+    names = [r.source[len(str(tree)) + 1:].replace("\\", "/") for r in results]
+    assert names == ["a.txt", "b.txt", "c_broken.pdf", "sub/z.txt"]     # sorted; .xyz skipped
+
+    by_name = dict(zip(names, results))
+    broken = by_name["c_broken.pdf"]
+    assert not broken.ok and broken.documents == [] and broken.source_type == "pdf"
+    assert ":" in broken.error                                           # "<ExceptionType>: message"
+    for name in ("a.txt", "b.txt", "sub/z.txt"):
+        assert by_name[name].ok and by_name[name].documents
+    assert len(by_name["sub/z.txt"].documents) > 1                       # chunked
+
+    docs = flatten_results(results)
+    assert docs[0].page_content.startswith("Alarm codes")
+    assert sum(len(r.documents) for r in results if r.ok) == len(docs)
+
+
+def test_expand_sources_non_recursive_and_glob(tree):
+    assert [p.rsplit("/", 1)[-1] for p in expand_sources(str(tree), recursive=False)] == \
+        ["a.txt", "b.txt", "c_broken.pdf"]
+    assert [p.rsplit("/", 1)[-1] for p in expand_sources(str(tree / "**" / "*.txt"))] == \
+        ["a.txt", "b.txt", "z.txt"]
+    assert load_directory(str(tree / "*.md")) == []
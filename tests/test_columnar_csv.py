@@ -0,0 +1,70 @@
+# tests/test_columnar_csv.py
+# load_from_csv(columnar=True) accepts CSVLoader-style csv_args; keep_table
+# surfaces the typed table, and sparse columns are not typed.
+
+from contentLoader.loader import load_from_csv
+from contentLoader.columnar import TYPE_MIN_VALUES, ColumnarCSVLoader, load_csv_table
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "data.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_detects_header_and_drops_empty_columns(tmp_path):
+    path = _write(tmp_path, "\n\nName,,Amount\nTea,,12\nCoffee,,30\n")
+    docs = load_from_csv(path, columnar=True)
+    assert [d.page_content for d in docs] == ["Name: Tea\nAmount: 12", "Name: Coffee\nAmount: 30"]
+    assert [d.metadata["row"] for d in docs] == [0, 1]
+
+
+def test_fieldnames_name_columns_and_every_row_is_data(tmp_path):
+    path = _write(tmp_path, "Tea;12\nCoffee;30;extra\n")
+    args = {"fieldnames": ["item", "price"], "delimiter": ";", "restkey": "rest", "restval": ""}
+    docs = load_from_csv(path, csv_args=args, columnar=True)
+    assert [d.page_content for d in docs] == ["item: Tea\nprice: 12", "item: Coffee\nprice: 30\ncolumn_3: extra"]
+
+
+def test_fieldnames_with_explicit_header_row(tmp_path):
+    path = _write(tmp_path, "a,b\n1,2\n")
+    loader = ColumnarCSVLoader(path, header=0, csv_args={"fieldnames": ["x", "y"]})
+    assert [d.page_content for d in loader.load()] == ["x: 1\ny: 2"]
+
+
+def _ledger(tmp_path, rows=12):
+    lines = ["", "DATE,ITEM,PAY,NOTE"]
+    lines += [f"{i + 1:02d}.08.2025,item {i},{100 * (i + 1)}.00," for i in range(rows)]
+    lines += [",,,3", ",,,4"]                     # a couple of numbers in a notes column
+    return _write(tmp_path, "\n".join(lines) + "\n")
+
+
+def test_keep_table_through_load_from_csv_and_load_documents(tmp_path):
+    from datetime import date
+    from contentLoader import load_documents
+
+    path = _ledger(tmp_path)
+    docs = load_from_csv(path, keep_table=True)       # implies columnar
+    assert len(docs) == 14 and docs[0].page_content.startswith("DATE: 01.08.2025")
+    table = docs.table
+    assert table.types == {"DATE": "date", "ITEM": "text", "PAY": "number", "NOTE": "text"}
+    assert table.total("PAY", table.mask(DATE=(date(2025, 8, 1), date(2025, 8, 3)))) == 600.0
+
+    chunks = load_documents(path, csv_columnar=True, csv_keep_table=True, chunk=True, chunk_size=200)
+    assert chunks.table.total("PAY") == table.total("PAY") and chunks[0].id
+    assert not hasattr(load_documents(path, csv_columnar=True), "table")
+
+
+def test_few_values_stay_text(tmp_path):
+    path = _ledger(tmp_path, rows=TYPE_MIN_VALUES - 1)
+    table = load_from_csv(path, keep_table=True).table
+    assert table.types["DATE"] == "text" and table.types["PAY"] == "text"
+
+
+def test_sample_csv_side_column_is_not_typed():
+    import os
+    path = os.path.join(os.path.dirname(__file__), os.pardir, "Content", "AUG 2025.csv")
+    table = load_csv_table(path)
+    assert table.types["DATE"] == "date" and table.types["PAY"] == "number"
+    assert table.types["column_4"] == "text"          # 6 numbers and a note: too few to type
+    assert "13000" in table.column("column_4")
@@ -0,0 +1,91 @@
+# tests/test_dedup.py
+# NearDuplicateFilter: exact vs near drops, merge provenance, min_chars, LSH banding.
+
+import pytest
+from langchain_core.documents import Document
+
+from TextSplitter.dedup import NearDuplicateFilter, dedup_chunks, lsh_bands
+
+BASE = ("The thermostat in the living room follows the weekday schedule: 21 degrees from seven "
+        "in the morning, 18 degrees overnight, and eco mode while everyone is away at work.")
+
+
+def _doc(text, source="a.txt", id_=None):
+    return Document(id=id_, page_content=text, metadata={"source": source})
+
+
+def test_exact_and_near_are_counted_separately():
+    docs = [
+        _doc(BASE, id_="a0"),
+        _doc("  " + BASE.upper() + "\n", id_="a1"),            # exact after normalisation
+        _doc(BASE.replace("18 degrees", "17 degrees"), id_="a2"),   # near
+        _doc("Garage door opens at 22:00 when the car is detected in the driveway by the camera.", id_="a3"),
+    ]
+    kept, stats = dedup_chunks(docs, threshold=0.8)
+    assert [d.id for d in kept] == ["a0", "a3"]
+    assert (stats.seen, stats.kept, stats.exact, stats.near) == (4, 2, 1, 1)
+    assert stats.embeddings_avoided == 2 and stats.drop_rate == 0.5
+
+
+def test_merge_records_provenance():
+    flt = NearDuplicateFilter(0.8)
+    kept = flt.filter([
+        _doc(BASE, "a.txt", "a0"),
+        _doc(BASE, "b.txt", "b0"),
+        _doc(BASE.replace("eco", "away"), "c.txt", "c0"),
+        _doc(BASE, "b.txt", "b1"),
+        _doc(BASE, "a.txt", "a1"),
+    ])
+    assert len(kept) == 1
+    meta = kept[0].metadata
+    assert meta["duplicates"] == 4
+    assert meta["duplicate_sources"] == ["b.txt", "c.txt"]
+    assert meta["duplicate_ids"] == ["b0", "c0", "b1", "a1"]
+
+
+def test_drop_mode_leaves_metadata_alone():
+    kept = NearDuplicateFilter(0.8, mode="drop").filter([_doc(BASE, id_="a0"), _doc(BASE, "b.txt", "b0")])
+    assert [d.id for d in kept] == ["a0"] and kept[0].metadata == {"source": "a.txt"}
+
+
+def test_short_chunks_only_dedup_exactly():
+    short = ["Copyright 2025 Acme Corp. All rights reserved.", "Copyright 2024 Acme Corp. All rights reserved.",
+             "copyright 2025 acme corp.  all rights reserved."]
+    flt = NearDuplicateFilter(0.6, min_chars=64)
+    kept = flt.filter([_doc(t) for t in short])
+    assert [d.page_content for d in kept] == short[:2]
+    assert (flt.stats.exact, flt.stats.near) == (1, 0)
+    # the same strings go through MinHash once min_chars allows it
+    flt = NearDuplicateFilter(0.6, min_chars=1)
+    assert len(flt.filter([_doc(t) for t in short])) == 1 and (flt.stats.exact, flt.stats.near) == (1, 1)
+
+
+def test_below_threshold_pairs_are_kept():
+    half = BASE[: len(BASE) // 2] + " Lights in the hallway dim to thirty percent after ten in the evening."
+    flt = NearDuplicateFilter(0.9)
+    sim = (flt.signature(BASE) == flt.signature(half)).mean()
+    assert 0.2 < sim < 0.9
+    assert len(flt.filter([_doc(BASE), _doc(half)])) == 2 and flt.stats.dropped == 0
+
+
+@pytest.mark.parametrize("threshold,num_perm", [(0.9, 128), (0.8, 128), (0.5, 64), (0.95, 256)])
+def test_lsh_bands_highest_curve_not_above_threshold(threshold, num_perm):
+    bands, rows = lsh_bands(threshold, num_perm)
+    assert bands * rows == num_perm
+    assert (1.0 / bands) ** (1.0 / rows) <= threshold
+    higher = [r for r in range(rows + 1, num_perm + 1) if num_perm % r == 0]
+    assert all((r / num_perm) ** (1.0 / r) > threshold for r in higher)
+    flt = NearDuplicateFilter(threshold, num_perm=num_perm)
+    assert (flt.bands, flt.rows) == (bands, rows)
+
+
+def test_lsh_bands_known_values():
+    assert lsh_bands(0.9, 128) == (8, 16)      # curve at (1/8) ** (1/16) ~ 0.88
+    assert lsh_bands(0.5, 128) == (32, 4)      # (1/32) ** (1/4) ~ 0.42
+
+
+def test_state_persists_across_batches():
+    flt = NearDuplicateFilter(0.8)
+    assert len(flt.filter([_doc(BASE, id_="a0")])) == 1
+    assert flt.filter([_doc(BASE, "b.txt", "b0")]) == []
+    assert flt.stats.seen == 2 and flt.stats.exact == 1
@@ -0,0 +1,70 @@
+# tests/test_embedding_cache.py
+# VectorCache / CachedEmbeddings with the offline HashEmbeddings stand-in.
+
+import os
+
+import numpy as np
+
+from Embedding import CachedEmbeddings, HashEmbeddings, VectorCache
+
+
+def _vec(i: int, dim: int = 8):
+    v = np.zeros(dim, dtype=np.float32)
+    v[i % dim] = i + 1
+    return v
+
+
+def test_put_many_with_cached_digest_at_capacity(tmp_path):
+    cache = VectorCache(str(tmp_path), max_entries=2)
+    cache.put_many([("A", _vec(0)), ("B", _vec(1))])
+    cache.put_many([("A", _vec(0)), ("C", _vec(2))])    # used to raise IndexError
+    assert "A" in cache and "C" in cache and "B" not in cache
+    a, c = cache.get_many(["A", "C"])
+    np.testing.assert_array_equal(a, _vec(0))
+    np.testing.assert_array_equal(c, _vec(2))
+    assert cache.stats.evictions == 1
+
+
+def test_cached_embeddings_lru_matches_underlying(tmp_path):
+    base = HashEmbeddings(32)
+    emb = CachedEmbeddings(base, cache_dir=str(tmp_path), max_entries=2)
+    emb.embed_documents(["alpha", "beta"])
+    out = emb.embed_documents(["alpha", "gamma"])
+    np.testing.assert_allclose(out, base.embed_documents(["alpha", "gamma"]), rtol=1e-6)
+    assert len(emb.store) == 2
+    assert emb.embed_documents(["alpha"]) == out[:1] and emb.stats.hits >= 2
+
+
+def test_puts_append_to_log_and_survive_reopen(tmp_path):
+    cache = VectorCache(str(tmp_path), max_entries=4)
+    cache.put_many([("A", _vec(0)), ("B", _vec(1))])     # first put grows the file: snapshot
+    snapshot = os.path.getmtime(tmp_path / "index.json"), (tmp_path / "index.json").read_bytes()
+    for i, d in enumerate("CDEF"):
+        cache.put_many([(d, _vec(i + 2))])               # E and F evict A and B
+    assert (tmp_path / "index.json").read_bytes() == snapshot[1]
+    assert len((tmp_path / "index.log").read_text().splitlines()) == 4
+
+    reopened = VectorCache(str(tmp_path), max_entries=4)
+    assert sorted(reopened._slots) == ["C", "D", "E", "F"]
+    np.testing.assert_array_equal(reopened.get_many(["F"])[0], _vec(5))
+    reopened.put_many([("G", _vec(6))])                  # evicts C, reusing a free slot
+    assert "C" not in reopened and len(reopened) == 4
+
+
+def test_torn_log_line_is_ignored(tmp_path):
+    cache = VectorCache(str(tmp_path), max_entries=8)
+    cache.put_many([("A", _vec(0))])
+    cache.put_many([("B", _vec(1))])
+    with open(tmp_path / "index.log", "a", encoding="utf-8") as fh:
+        fh.write('["C", 5')
+    reopened = VectorCache(str(tmp_path), max_entries=8)
+    assert sorted(reopened._slots) == ["A", "B"]
+
+
+def test_flush_writes_snapshot_and_clears_log(tmp_path):
+    cache = VectorCache(str(tmp_path), max_entries=8)
+    cache.put_many([("A", _vec(0))])
+    cache.put_many([("B", _vec(1))])
+    cache.flush()
+    assert not (tmp_path / "index.log").exists()
+    assert sorted(VectorCache(str(tmp_path))._slots) == ["A", "B"]
@@ -0,0 +1,151 @@
+# tests/test_embedding_engine.py
+# EmbeddingEngine against an in-process fake model: batching limits, retry
+# with backoff, and query coalescing (order and query-vs-document semantics).
+
+import threading
+import time
+
+import pytest
+
+from Embedding import EmbeddingEngine, HashEmbeddings, make_batches
+from Embedding import engine as engine_module
+
+
+class FakeModel(HashEmbeddings):
+    """Asymmetric model (queries get a prefix) that records calls and can fail or stall."""
+
+    def __init__(self, fail_times: int = 0, delay: float = 0.0):
+        super().__init__(16)
+        self.fail_times = fail_times
+        self.delay = delay
+        self.doc_calls = []
+        self.query_calls = []
+        self._lock = threading.Lock()
+
+    def _maybe_fail(self):
+        with self._lock:
+            if self.fail_times > 0:
+                self.fail_times -= 1
+                raise ConnectionError("transient")
+        if self.delay:
+            time.sleep(self.delay)
+
+    def embed_documents(self, texts):
+        self._maybe_fail()
+        with self._lock:
+            self.doc_calls.append(list(texts))
+        return super().embed_documents(["passage: " + t for t in texts])
+
+    def embed_query(self, text):
+        self._maybe_fail()
+        with self._lock:
+            self.query_calls.append(text)
+        return super().embed_query("query: " + text)
+
+
+def test_make_batches_respects_count_and_token_limits():
+    texts = ["a" * 40] * 10 + ["b" * 400] + ["c"] * 3
+    ranges = make_batches(texts, max_batch_texts=4, max_batch_tokens=30, token_counter=lambda t: len(t) // 4 + 1)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(texts)
+    assert all(a < b for a, b in ranges) and all(r[1] == s[0] for r, s in zip(ranges, ranges[1:]))
+    for a, b in ranges:
+        tokens = sum(len(t) // 4 + 1 for t in texts[a:b])
+        assert b - a <= 4
+        assert tokens <= 30 or b - a == 1     # an oversized text gets its own batch
+
+
+def test_embed_documents_batches_concurrently_in_order():
+    model = FakeModel(delay=0.01)
+    texts = [f"text number {i}" for i in range(50)]
+    with EmbeddingEngine(model, max_batch_texts=7, concurrency=4) as engine:
+        out = engine.embed_documents(texts)
+    assert out == model.embed_documents(texts)
+    assert max(len(call) for call in model.doc_calls[:-1]) <= 7
+    assert engine.stats.texts == 50 and engine.stats.batches == 8
+
+
+def test_retry_with_exponential_backoff(monkeypatch):
+    delays = []
+    monkeypatch.setattr(engine_module.time, "sleep", delays.append)
+    model = FakeModel(fail_times=2)
+    with EmbeddingEngine(model, max_retries=3, backoff=0.1, concurrency=1) as engine:
+        assert engine.embed_documents(["x"]) == model.embed_documents(["x"])
+        assert engine.stats.retries == 2 and engine.stats.failures == 0
+    assert 0.05 <= delays[0] <= 0.1 and 0.1 <= delays[1] <= 0.2   # jittered base * 2**attempt
+
+
+def test_retry_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(engine_module.time, "sleep", lambda s: None)
+    with EmbeddingEngine(FakeModel(fail_times=5), max_retries=2, concurrency=1) as engine:
+        with pytest.raises(ConnectionError):
+            engine.embed_documents(["x"])
+        assert engine.stats.failures == 1 and engine.stats.retries == 2
+
+
+def test_embed_query_defaults_to_direct_call():
+    model = FakeModel()
+    with EmbeddingEngine(model) as engine:
+        assert engine.coalesce_window == 0
+        assert engine.embed_query("hall light") == model.embed_query("hall light")
+    assert not model.doc_calls
+
+
+def _concurrent_queries(engine, texts):
+    results = {}
+    barrier = threading.Barrier(len(texts))
+
+    def ask(text):
+        barrier.wait()
+        results[text] = engine.embed_query(text)
+
+    threads = [threading.Thread(target=ask, args=(t,)) for t in texts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_coalesced_queries_keep_query_semantics_and_order():
+    model = FakeModel()
+    texts = [f"question {i}" for i in range(8)]
+    with EmbeddingEngine(model, coalesce_window=0.05) as engine:
+        results = _concurrent_queries(engine, texts)
+    for text in texts:
+        assert results[text] == model.embed_query(text)
+    assert not model.doc_calls    # asymmetric model never sees queries as documents
+
+
+def test_coalesced_identical_queries_share_one_call():
+    model = FakeModel(delay=0.01)
+    texts = ["is the garage door open"] * 6 + ["hall light"] * 2
+    results = [None] * len(texts)
+    barrier = threading.Barrier(len(texts))
+
+    def ask(i):
+        barrier.wait()
+        results[i] = engine.embed_query(texts[i])
+
+    with EmbeddingEngine(model, coalesce_window=0.2) as engine:
+        threads = [threading.Thread(target=ask, args=(i,)) for i in range(len(texts))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert engine.stats.coalesced >= 4    # 6 + 2 identical queries, at worst split over two windows
+    for text, vec in zip(texts, results):
+        assert vec == model.embed_query(text)
+    assert results[0] is not results[1]
+    calls = model.query_calls[: -len(texts)]      # drop the reference calls above
+    assert sorted(set(calls)) == ["hall light", "is the garage door open"]
+    assert len(calls) <= 4 and not model.doc_calls
+
+
+def test_coalesce_as_documents_batches_in_order():
+    model = FakeModel()
+    texts = [f"question {i}" for i in range(8)]
+    with EmbeddingEngine(model, coalesce_window=0.05, coalesce_as_documents=True) as engine:
+        results = _concurrent_queries(engine, texts)
+    for text in texts:
+        assert results[text] == model.embed_documents([text])[0]
+    assert any(len(call) > 1 for call in model.doc_calls)
@@ -0,0 +1,76 @@
+# tests/test_filtered_ann.py
+# Broad filters on IVF / quantized stores go through the store's own search
+# (cells, codes) restricted to the filter; selective ones are scored exactly.
+
+import numpy as np
+import pytest
+
+from Embedding import HashEmbeddings
+from VectorDB import IVFVectorStore, NumpyVectorStore, QuantizedVectorStore
+
+EMB = HashEmbeddings(32)
+N = 600
+
+
+def _fill(store):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((N, 32)).astype(np.float32)
+    store.add_embeddings([f"row {i}" for i in range(N)], vectors,
+                         [{"half": i % 2, "one": i == 7} for i in range(N)], [str(i) for i in range(N)])
+    return store, vectors
+
+
+def _spy(monkeypatch, cls):
+    calls = []
+    original = cls._search
+
+    def search(self, query, k, *args, **kwargs):
+        calls.append(kwargs.get("mask"))
+        return original(self, query, k, *args, **kwargs)
+
+    monkeypatch.setattr(cls, "_search", search)
+    return calls
+
+
+@pytest.mark.parametrize("make", [
+    lambda: IVFVectorStore(EMB, nlist=8, min_train=100),
+    lambda: QuantizedVectorStore(EMB, codec="pq", pq_m=8, min_train=100),
+], ids=["ivf", "pq"])
+def test_broad_filter_uses_store_search(monkeypatch, make):
+    store, vectors = _fill(make())
+    store.train()
+    calls = _spy(monkeypatch, type(store))
+    hits = store.similarity_search_with_score_by_vector(vectors[3], k=5, filter={"half": 1})
+    assert calls and calls[-1] is not None and calls[-1].sum() == N // 2
+    assert hits and all(doc.metadata["half"] == 1 for doc, _ in hits)
+    assert hits[0][0].id == "3"
+
+
+def test_selective_filter_is_exact(monkeypatch):
+    store, vectors = _fill(IVFVectorStore(EMB, nlist=8, nprobe=1, min_train=100))
+    store.train()
+    calls = _spy(monkeypatch, IVFVectorStore)
+    hits = store.similarity_search_by_vector(vectors[0], k=3, filter={"one": True})
+    assert [d.id for d in hits] == ["7"] and not calls
+
+
+def test_full_probe_and_rerank_match_exact():
+    exact, vectors = _fill(NumpyVectorStore(EMB))
+    ivf, _ = _fill(IVFVectorStore(EMB, nlist=8, min_train=100))
+    ivf.train()
+    quant, _ = _fill(QuantizedVectorStore(EMB, codec="int8", rerank=N, min_train=100))
+    quant.train()
+    queries = vectors[:4] + 0.1
+    want = [[d.id for d in hits] for hits in exact.similarity_search_many_by_vector(queries, 10, filter={"half": 0})]
+    got_ivf = ivf.similarity_search_many_by_vector(queries, 10, filter={"half": 0}, nprobe=8)
+    got_quant = quant.similarity_search_many_by_vector(queries, 10, filter={"half": 0})
+    assert [[d.id for d in hits] for hits in got_ivf] == want
+    assert [[d.id for d in hits] for hits in got_quant] == want
+
+
+def test_broad_filter_after_delete():
+    store, vectors = _fill(QuantizedVectorStore(EMB, codec="int8", min_train=100))
+    store.train()
+    store.delete(["1", "3", "5"])
+    hits = store.similarity_search_by_vector(vectors[3], k=20, filter={"half": 1})
+    assert len(hits) == 20 and not {"1", "3", "5"} & {d.id for d in hits}
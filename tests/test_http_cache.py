@@ -0,0 +1,134 @@
+# tests/test_http_cache.py
+# utils.HttpCache against a fake requests session (no network).
+
+import os
+
+import pytest
+from langchain_core.documents import Document
+
+from contentLoader.loader import _load_web_cached
+from utils.http_cache import CacheMiss, HttpCache
+
+PAGE = b"<html><body><div class='post-content'>Thermostat schedule: 21C from 7am.</div></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, status, content=b"", headers=None):
+        self.status_code = status
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Serves `pages` (url -> bytes) with an ETag per body; honours If-None-Match."""
+
+    def __init__(self, pages):
+        self.pages = dict(pages)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        headers = headers or {}
+        self.requests.append((url, dict(headers)))
+        if url not in self.pages:
+            return FakeResponse(404)
+        body = self.pages[url]
+        etag = f'"{hash(body) & 0xffffffff:x}"'
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304, headers={"ETag": etag})
+        return FakeResponse(200, body, {"ETag": etag, "Content-Type": "text/html"})
+
+
+def _build(resp):
+    return [Document(page_content=resp.text.upper(), metadata={"n": len(resp.content)})]
+
+
+def _cache(tmp_path, session, **kwargs):
+    return HttpCache(str(tmp_path / "cache"), session=session, **kwargs)
+
+
+def test_304_reuses_body_and_derived(tmp_path):
+    session = FakeSession({"https://a.example/p": PAGE})
+    cache = _cache(tmp_path, session)
+    calls = []
+
+    def build(resp):
+        calls.append(resp.from_cache)
+        return _build(resp)
+
+    first = cache.derive("https://a.example/p", ("upper", 1), build)
+    again = _cache(tmp_path, session).derive("https://a.example/p", ("upper", 1), build)   # re-opened index
+    assert calls == [False]
+    assert [d.page_content for d in again] == [d.page_content for d in first]
+    assert "If-None-Match" in session.requests[-1][1]
+
+    cache2 = _cache(tmp_path, session)
+    resp = cache2.get("https://a.example/p")
+    assert resp.from_cache and resp.content == PAGE and cache2.stats.not_modified == 1
+
+    session.pages["https://a.example/p"] = PAGE.replace(b"21C", b"19C")
+    changed = cache2.derive("https://a.example/p", ("upper", 1), build)
+    assert calls == [False, False] and "19C" in changed[0].page_content
+    assert len(os.listdir(tmp_path / "cache" / "derived")) == 1      # the old body's chunks went with it
+
+
+def test_offline_serves_cache_or_raises(tmp_path):
+    session = FakeSession({"https://a.example/p": PAGE})
+    _cache(tmp_path, session).get("https://a.example/p")
+    offline = _cache(tmp_path, None, offline=True, max_age=0)
+    assert offline.get("https://a.example/p").content == PAGE       # age is ignored offline
+    assert offline.stats.offline_hits == 1
+    with pytest.raises(CacheMiss):
+        offline.get("https://b.example/q")
+
+
+def test_max_bytes_evicts_least_recently_used(tmp_path):
+    pages = {f"https://a.example/{i}": PAGE + bytes([48 + i]) for i in range(3)}
+    cache = _cache(tmp_path, FakeSession(pages), max_bytes=2 * len(PAGE) + 2)
+    for url in pages:
+        cache.get(url)
+    assert "https://a.example/0" not in cache and len(cache) == 2
+    assert cache.stats.evictions == 1
+    assert len(os.listdir(tmp_path / "cache" / "bodies")) == 2
+
+
+def test_max_age_refetches_unconditionally(tmp_path):
+    session = FakeSession({"https://a.example/p": PAGE})
+    cache = _cache(tmp_path, session, max_age=60)
+    cache.get("https://a.example/p")
+    cache.entries["https://a.example/p"].fetched -= 3600
+    resp = cache.get("https://a.example/p")
+    assert not resp.from_cache and session.requests[-1][1] == {}
+    cache.entries["https://a.example/p"].fetched -= 3600
+    assert cache.prune() == 1 and len(cache) == 0
+
+
+def test_shared_body_files_survive_dropping_one_url(tmp_path):
+    session = FakeSession({"https://a.example/p": PAGE, "https://mirror.example/p": PAGE})
+    cache = _cache(tmp_path, session)
+    cache.derive("https://a.example/p", ("upper", 1), _build)
+    cache.derive("https://mirror.example/p", ("upper", 1), _build)
+    cache._drop("https://a.example/p")
+    assert cache.derive("https://mirror.example/p", ("upper", 1), _build)
+    assert cache.stats.derived_hits == 2
+    assert len(os.listdir(tmp_path / "cache" / "bodies")) == 1
+    cache.clear()
+    assert os.listdir(tmp_path / "cache" / "bodies") == os.listdir(tmp_path / "cache" / "derived") == []
+
+
+@pytest.mark.parametrize("chunk", [False, True])
+def test_mirror_url_gets_its_own_documents(tmp_path, chunk):
+    session = FakeSession({"https://a.example/p": PAGE, "https://mirror.example/p": PAGE})
+    cache = _cache(tmp_path, session)
+    a = _load_web_cached("https://a.example/p", cache, chunk=chunk)
+    mirror = _load_web_cached("https://mirror.example/p", cache, chunk=chunk)
+    assert {d.metadata["source"] for d in a} == {"https://a.example/p"}
+    assert {d.metadata["source"] for d in mirror} == {"https://mirror.example/p"}
+    if chunk:
+        assert not {d.id for d in a} & {d.id for d in mirror}
+    again = _load_web_cached("https://mirror.example/p", cache, chunk=chunk)
+    assert [d.metadata["source"] for d in again] == [d.metadata["source"] for d in mirror]
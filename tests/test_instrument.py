@@ -0,0 +1,106 @@
+# tests/test_instrument.py
+# utils.instrument: the disabled path records nothing; @timed generators are
+# charged only for the time spent inside them.
+
+import time
+
+import pytest
+
+from utils import instrument
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    was = instrument.is_enabled()
+    instrument.reset()
+    yield
+    instrument.reset()
+    (instrument.enable if was else instrument.disable)()
+
+
+@instrument.timed("t.work")
+def work(x):
+    return x * 2
+
+
+@instrument.timed("t.produce")
+def produce(n, pause):
+    for i in range(n):
+        time.sleep(pause)
+        yield i
+    return "done"
+
+
+def test_disabled_path_is_a_noop():
+    instrument.disable()
+    assert instrument.timer("t.block") is instrument.timer("t.other")     # shared no-op
+    with instrument.timer("t.block"):
+        pass
+    with instrument.trace("req") as tr:
+        assert tr is None
+        assert work(3) == 6
+        assert list(produce(2, 0)) == [0, 1]
+    instrument.count("t.count")
+    instrument.observe("t.hist", 1.0)
+    assert instrument.stats() == {"counters": {}, "histograms": {}}
+
+
+def test_timed_function_and_counters():
+    instrument.enable()
+    with instrument.trace("req") as tr:
+        assert work(2) == 4
+        instrument.count("t.count", 3)
+    snap = instrument.stats()
+    assert snap["histograms"]["t.work"]["count"] == 1
+    assert snap["counters"] == {"t.count": 3}
+    assert [s.name for s in tr.spans] == ["t.work"]
+
+
+def test_timed_generator_excludes_consumer_time():
+    instrument.enable()
+    with instrument.trace("req") as tr:
+        with instrument.timer("t.consume"):
+            gen = produce(3, 0.02)
+            for _ in gen:
+                time.sleep(0.05)        # consumer work, must not be charged to t.produce
+    spans = {s.name: s for s in tr.spans}
+    assert 0.05 <= spans["t.produce"].seconds < 0.12
+    assert spans["t.consume"].seconds >= 0.2
+    assert spans["t.produce"].depth == 1 and spans["t.consume"].depth == 0
+    assert instrument.stats()["histograms"]["t.produce"]["count"] == 1
+
+
+def test_timed_generator_keeps_return_value_and_closes():
+    instrument.enable()
+
+    def outer():
+        result = yield from produce(2, 0)
+        return result
+
+    gen = outer()
+    assert list(gen) == [0, 1]
+    partial = produce(5, 0)
+    next(partial)
+    partial.close()                     # abandoned early: still recorded once
+    assert instrument.stats()["histograms"]["t.produce"]["count"] == 2
+
+
+def test_run_cli_trace_restores_disabled_state(monkeypatch):
+    from cli import cli as cli_module
+
+    instrument.disable()
+    monkeypatch.setattr(cli_module, "_session", lambda *a, **k: None)
+    cli_module.run_cli(trace=True)
+    assert not instrument.is_enabled()
+
+    def boom(*a, **k):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(cli_module, "_session", boom)
+    with pytest.raises(KeyboardInterrupt):
+        cli_module.run_cli(trace=True)
+    assert not instrument.is_enabled()
+
+    instrument.enable()
+    monkeypatch.setattr(cli_module, "_session", lambda *a, **k: None)
+    cli_module.run_cli(trace=True)
+    assert instrument.is_enabled()
@@ -0,0 +1,111 @@
+# tests/test_manifest.py
+# IngestionManifest: size+mtime fast path, sha256 fallback on touch, and
+# re-splitting cached Documents when only the chunking parameters change.
+
+import os
+
+import pytest
+
+from contentLoader import manifest as manifest_module
+from contentLoader.manifest import IngestionManifest
+
+TEXT = "\n\n".join(f"Paragraph {i}: the boiler service is due every spring." for i in range(40))
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    """Counts of file hashes and real loader calls made by the manifest."""
+    calls = {"sha256": 0, "load": 0}
+    real_sha, real_load = manifest_module.file_sha256, manifest_module.load_documents
+
+    def sha(path, *args, **kwargs):
+        calls["sha256"] += 1
+        return real_sha(path, *args, **kwargs)
+
+    def load(*args, **kwargs):
+        calls["load"] += 1
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(manifest_module, "file_sha256", sha)
+    monkeypatch.setattr(manifest_module, "load_documents", load)
+    return calls
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    return str(path)
+
+
+def _touch(path, delta_ns=5_000_000_000):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + delta_ns))
+
+
+def test_unchanged_file_is_a_hit_without_hashing(tmp_path, source, counted):
+    m = IngestionManifest(str(tmp_path / "cache"))
+    first = m.load_documents(source, chunk=True, chunk_size=200, chunk_overlap=20)
+    assert m.stats.loads == 1 and counted == {"sha256": 1, "load": 1}
+
+    again = IngestionManifest(str(tmp_path / "cache"))      # re-read from disk
+    second = again.load_documents(source, chunk=True, chunk_size=200, chunk_overlap=20)
+    assert [d.page_content for d in second] == [d.page_content for d in first]
+    assert again.stats.hits == 1 and again.stats.loads == 0
+    assert counted == {"sha256": 1, "load": 1}               # size+mtime matched: no hash, no parse
+
+
+def test_mtime_only_touch_falls_back_to_sha256_and_hits(tmp_path, source, counted):
+    m = IngestionManifest(str(tmp_path / "cache"))
+    m.load_documents(source, chunk=True, chunk_size=200, chunk_overlap=20)
+    _touch(source)
+
+    again = IngestionManifest(str(tmp_path / "cache"))
+    again.load_documents(source, chunk=True, chunk_size=200, chunk_overlap=20)
+    assert again.stats.hits == 1 and again.stats.loads == 0
+    assert counted == {"sha256": 2, "load": 1}               # hashed once to confirm, not reloaded
+
+    # the refreshed mtime was persisted: the next run is back on the fast path
+    third = IngestionManifest(str(tmp_path / "cache"))
+    assert third.entries[IngestionManifest._key(source)].mtime_ns == os.stat(source).st_mtime_ns
+    third.load_documents(source, chunk=True, chunk_size=200, chunk_overlap=20)
+    assert third.stats.hits == 1 and counted["sha256"] == 2
+
+
+def test_same_size_edit_is_caught_by_the_hash(tmp_path, source, counted):
+    m = IngestionManifest(str(tmp_path / "cache"))
+    m.load_documents(source)
+    with open(source, "r+", encoding="utf-8") as fh:
+        fh.write("Q")                                         # same size, different bytes
+    _touch(source)
+    docs = m.load_documents(source)
+    assert m.stats.loads == 2 and m.stats.hits == 0
+    assert docs[0].page_content.startswith("Qaragraph 0")
+    assert counted["load"] == 2
+
+
+def test_size_change_reloads_without_the_fast_path_hash(tmp_path, source, counted):
+    m = IngestionManifest(str(tmp_path / "cache"))
+    m.load_documents(source)
+    with open(source, "a", encoding="utf-8") as fh:
+        fh.write("\n\nA new paragraph.")
+    m.load_documents(source)
+    assert m.stats.loads == 2
+    assert counted == {"sha256": 2, "load": 2}               # one hash per stored entry only
+
+
+def test_only_split_params_changed_resplits_cached_docs(tmp_path, source, counted):
+    m = IngestionManifest(str(tmp_path / "cache"))
+    small = m.load_documents(source, chunk=True, chunk_size=200, chunk_overlap=20)
+    large = m.load_documents(source, chunk=True, chunk_size=600, chunk_overlap=20)
+    assert m.stats.loads == 1 and m.stats.resplits == 1
+    assert counted["load"] == 1                               # file not parsed again
+    assert len(large) < len(small)
+
+    # the new split is what is cached now
+    again = IngestionManifest(str(tmp_path / "cache"))
+    cached = again.load_documents(source, chunk=True, chunk_size=600, chunk_overlap=20)
+    assert again.stats.hits == 1 and again.stats.resplits == 0
+    assert [d.page_content for d in cached] == [d.page_content for d in large]
+    again.load_documents(source, chunk=True, chunk_size=600, chunk_overlap=20, dedup=0.9)
+    assert again.stats.resplits == 1 and counted["load"] == 1
@@ -0,0 +1,80 @@
+# tests/test_metadata_filter.py
+# Filtered search gives the same rows with and without the metadata index,
+# and both agree with matches().
+
+import numpy as np
+import pytest
+
+from Embedding import HashEmbeddings
+from VectorDB import NumpyVectorStore, matches
+
+EMB = HashEmbeddings(32)
+
+METAS = [
+    {"source": "a.txt", "page": 1},
+    {"source": "a.txt", "page": None},
+    {"source": "b.txt"},
+    {"source": "b.txt", "page": 3, "tags": ["x", "y"]},
+    {"source": "c.pdf", "page": 2.0, "tags": ["y"]},
+    {"page": 7, "flag": True},
+    {"source": None, "page": 0, "flag": False},
+    {},
+]
+
+FILTERS = [
+    {"page": None},
+    {"page": {"$eq": None}},
+    {"page": {"$ne": None}},
+    {"page": {"$in": [None, 1]}},
+    {"page": {"$nin": [None, 3]}},
+    {"source": None},
+    {"source": {"$ne": "a.txt"}},
+    {"missing": None},
+    {"missing": {"$ne": None}},
+    {"tags": ["y"]},
+    {"source": ["a.txt"]},
+    {"source": {"$in": [["a.txt"], "b.txt"]}},
+    {"tags": {"$eq": ["x", "y"]}},
+    {"tags": {"$ne": ["y"]}},
+    {"tags": {"$in": [["y"], None]}},
+    {"page": {"$gte": 1, "$lt": 7}},
+    {"page": 2},
+    {"flag": True},
+    {"flag": 1},
+    {"$or": [{"page": None}, {"source": "c.pdf"}]},
+    {"$not": {"page": None}},
+]
+
+
+@pytest.fixture(scope="module")
+def stores():
+    texts = [f"row {i}" for i in range(len(METAS))]
+    plain = NumpyVectorStore.from_texts(texts, EMB, metadatas=METAS)
+    indexed = NumpyVectorStore.from_texts(texts, EMB, metadatas=METAS, metadata_index=True)
+    return plain, indexed
+
+
+@pytest.mark.parametrize("flt", FILTERS, ids=repr)
+def test_index_agrees_with_scan_and_matches(stores, flt):
+    plain, indexed = stores
+    expected = np.array([matches(m, flt) for m in METAS])
+    np.testing.assert_array_equal(plain.filter_mask(flt), expected)
+    np.testing.assert_array_equal(indexed.filter_mask(flt), expected)
+
+
+def test_filtered_search_same_rows(stores):
+    plain, indexed = stores
+    for flt in FILTERS:
+        a = [d.page_content for d in plain.similarity_search("row 3", k=8, filter=flt)]
+        b = [d.page_content for d in indexed.similarity_search("row 3", k=8, filter=flt)]
+        assert a == b, flt
+
+
+def test_index_after_delete_and_reload(tmp_path, stores):
+    _, indexed = stores
+    indexed.save_local(str(tmp_path))
+    loaded = NumpyVectorStore.load_local(str(tmp_path), EMB)
+    loaded.delete([loaded.similarity_search("row 1", k=1, filter={"page": None, "source": "a.txt"})[0].id])
+    expected = [matches(m, {"page": None}) for m in METAS]
+    expected[1] = False
+    np.testing.assert_array_equal(loaded.filter_mask({"page": None}), expected)
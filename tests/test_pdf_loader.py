@@ -0,0 +1,35 @@
+# tests/test_pdf_loader.py
+# PdfLoader stays single-process unless parallel extraction is requested.
+
+import os
+
+import pytest
+
+pytest.importorskip("pypdf")
+
+from contentLoader import pdf as pdf_module
+from contentLoader.loader import load_from_pdf
+
+PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Content", "attention.pdf")
+
+
+class _NoPool:
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("process pool started")
+
+
+@pytest.fixture
+def many_cpus(monkeypatch):
+    monkeypatch.setattr(pdf_module.os, "cpu_count", lambda: 64)
+    monkeypatch.setattr(pdf_module, "MIN_PAGES_PER_WORKER", 1)
+    monkeypatch.setattr(pdf_module, "ProcessPoolExecutor", _NoPool)
+
+
+def test_default_is_in_process(many_cpus):
+    docs = load_from_pdf(PDF)
+    assert docs and [d.metadata["page"] for d in docs] == list(range(len(docs)))
+
+
+def test_parallel_is_opt_in(many_cpus):
+    with pytest.raises(AssertionError, match="process pool"):
+        load_from_pdf(PDF, workers=None)
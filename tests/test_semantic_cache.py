@@ -0,0 +1,78 @@
+# tests/test_semantic_cache.py
+# SemanticCache must not replay an answer for the opposite action or another number.
+
+import re
+
+from cli.semantic_cache import SemanticCache, query_guard
+from Embedding import HashEmbeddings
+
+
+class BlindEmbeddings(HashEmbeddings):
+    """Worst case for the cache: ignores action words and numbers, so those queries embed identically."""
+
+    _DROP = re.compile(r"\b(on|off|open|close|lock|unlock|not|don't)\b|(?<!\w)[+-]?\d+\b")
+
+    def embed_query(self, text):
+        return super().embed_query(self._DROP.sub(" ", text.lower()))
+
+
+def _cache():
+    cache = SemanticCache(BlindEmbeddings(64), threshold=0.92)
+    cache.put("turn on the hall light", "hall light: on")
+    cache.put("set the thermostat to 21", "thermostat: 21")
+    cache.put("unlock the front door", "front door: unlocked")
+    return cache
+
+
+def test_paraphrase_with_same_action_hits():
+    cache = _cache()
+    found = cache.lookup("Turn the hall light on!")
+    assert found.entry is not None and found.entry.answer == "hall light: on"
+    assert cache.lookup("Set the thermostat to 21.").entry.answer == "thermostat: 21"
+
+
+def test_opposite_action_misses():
+    cache = _cache()
+    assert cache.lookup("turn off the hall light").entry is None
+    assert cache.lookup("lock the front door").entry is None
+    assert cache.lookup("don't unlock the front door").entry is None
+
+
+def test_different_number_misses():
+    cache = _cache()
+    assert cache.lookup("set the thermostat to 25").entry is None
+
+
+def test_signed_numbers_miss():
+    cache = _cache()
+    cache.put("set the freezer to -5", "freezer: -5")
+    cache.put("volume +3", "volume: +3")
+    assert cache.lookup("set the freezer to 5").entry is None
+    assert cache.lookup("set freezer to 5").entry is None
+    assert cache.lookup("volume 3").entry is None
+    assert cache.lookup("Set the freezer to -5.").entry.answer == "freezer: -5"
+    assert cache.lookup("volume +3!").entry.answer == "volume: +3"
+
+
+def test_exact_text_path_checks_guard():
+    cache = _cache()
+    cache.put("dim the lamp by 2.5", "lamp: -2.5")
+    assert cache.lookup("dim the lamp by 2 5").entry is None     # same normalized text, other numbers
+    found = cache.lookup("Dim the lamp by 2.5")
+    assert found.entry.answer == "lamp: -2.5" and cache.stats.exact_hits == 1
+
+
+def test_guard_prefers_matching_entry_among_similar():
+    cache = _cache()
+    cache.put("turn off the hall light", "hall light: off")
+    assert cache.lookup("turn the hall light off").entry.answer == "hall light: off"
+    assert cache.lookup("turn the hall light on").entry.answer == "hall light: on"
+
+
+def test_query_guard():
+    assert query_guard("Turn the light ON") == query_guard("turn on the light")
+    assert query_guard("don't open it")[0] == frozenset({"not", "open"})
+    assert query_guard("won\u2019t lock")[0] == frozenset({"not", "lock"})
+    assert query_guard("from 5 to 7")[1] == ("5", "7")
+    assert query_guard("to -5")[1] == ("-5",) and query_guard("by +3")[1] == ("+3",)
+    assert query_guard("pages 5-10")[1] == ("5", "10")
@@ -0,0 +1,48 @@
+# tests/test_splitters.py
+# split_auto honours SplitConfig.engine and .dedup on raw text.
+
+import os
+
+from TextSplitter import SplitConfig, split_auto, split_text_character
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _speech():
+    with open(os.path.join(ROOT, "Content", "speech.txt"), encoding="utf-8") as fh:
+        return fh.read()
+
+
+def test_split_auto_raw_text_uses_engine():
+    text = "\n\n".join(["alpha beta " * 20, "gamma delta " * 30, "alpha beta " * 20])
+    langchain = split_auto(text, SplitConfig(chunk_size=200, chunk_overlap=20))
+    span = split_auto(text, SplitConfig(chunk_size=200, chunk_overlap=20, engine="span"))
+    assert [d.page_content for d in span] == [d.page_content for d in langchain]
+
+
+def test_split_auto_raw_text_applies_dedup():
+    para = _speech().split("\n\n")[0].strip()
+    text = "\n\n".join([para, "something else entirely " * 5, para])
+    cfg = SplitConfig(chunk_size=max(len(para), 200) + 1, chunk_overlap=0)
+    plain = split_auto(text, cfg)
+    deduped = split_auto(text, SplitConfig(chunk_size=cfg.chunk_size, chunk_overlap=0, dedup=0.9))
+    assert [d.page_content for d in plain].count(para) == 2
+    assert [d.page_content for d in deduped].count(para) == 1
+    assert len(deduped) == len(plain) - 1
+
+
+def test_split_text_character_engines_agree_on_speech():
+    text = _speech()
+    a = split_text_character(text, separator=" ", chunk_size=300, chunk_overlap=30)
+    b = split_text_character(text, separator=" ", chunk_size=300, chunk_overlap=30, engine="span")
+    assert [d.page_content for d in a] == [d.page_content for d in b]
+
+
+def test_span_splitter_base_is_abstract():
+    import pytest
+    from TextSplitter.spans import RecursiveSpanSplitter, SpanSplitter
+
+    with pytest.raises(TypeError):
+        SpanSplitter(chunk_size=100, chunk_overlap=0)
+    spans = RecursiveSpanSplitter(chunk_size=100, chunk_overlap=0).split_spans(_speech())
+    assert spans and all(s.end - s.start <= 100 for s in spans)
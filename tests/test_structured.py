@@ -0,0 +1,66 @@
+# tests/test_structured.py
+# Structured routing on Content/Attendance.txt (Exit 17:23 .. 17:45, Entry 09:15 .. 09:31).
+
+import os
+
+import pytest
+
+from contentLoader.structured import StructuredQuery, detect_records, parse_time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def query():
+    path = os.path.join(ROOT, "Content", "Attendance.txt")
+    with open(path, encoding="utf-8") as fh:
+        table = detect_records(fh.read(), path)
+    assert table is not None and len(table) == 10
+    return StructuredQuery(table)
+
+
+def _ids(query, question):
+    hit = query.answer(question)
+    assert hit is not None, question
+    return [query.table.value("EmpID", r) for r in hit.rows]
+
+
+def test_parse_time_meridiem():
+    assert parse_time("5:30 pm") == parse_time("17:30")
+    assert parse_time("5pm") == parse_time("17:00")
+    assert parse_time("12:15 a.m.") == parse_time("00:15")
+    assert parse_time("12 PM") == parse_time("12:00")
+    assert parse_time("17:30 pm") is None
+    assert parse_time("5") is None
+
+
+def test_after_24h(query):
+    assert _ids(query, "who left after 17:30?") == ["004", "005", "006", "007", "008", "009", "010"]
+
+
+@pytest.mark.parametrize("question", ["who left after 5:30 pm?", "who left after 5:30PM", "who left after 5:30 p.m.?"])
+def test_after_pm_is_read_as_afternoon(query, question):
+    assert _ids(query, question) == ["004", "005", "006", "007", "008", "009", "010"]
+
+
+def test_am_and_bare_hour(query):
+    assert _ids(query, "who arrived after 9:20 am?") == ["009", "010"]
+    assert _ids(query, "who left before 5 pm?") == []
+    assert len(_ids(query, "who left after 5:30 am?")) == 10
+
+
+def test_between_with_meridiem(query):
+    assert _ids(query, "who entered between 9 am and 9:17 am?") == ["001", "002", "003", "004", "005"]
+
+
+def test_count(query):
+    assert query.answer("how many entered before 9:20").text.startswith("8 record(s)")
+
+
+def test_lookup_by_id_and_extreme(query):
+    assert query.answer("when did 003 leave?").text == "EmpID 003: Exit 17:30."
+    assert _ids(query, "who left last?") == ["010"]
+
+
+def test_unrelated_question_falls_back(query):
+    assert query.answer("what is the leave policy?") is None
@@ -0,0 +1,96 @@
+# tests/test_upsert.py
+# upsert_documents / sync_source / delete / compact on NumpyVectorStore.
+
+import pytest
+from langchain_core.documents import Document
+
+from Embedding import HashEmbeddings
+from VectorDB import NumpyVectorStore
+
+
+class CountingEmbeddings(HashEmbeddings):
+    def __init__(self, dim=32):
+        super().__init__(dim)
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def _docs(source="notes.txt", texts=("kitchen light at 7", "garage door at 22", "thermostat 21 at night")):
+    return [Document(id=f"{source}#{i}", page_content=t, metadata={"source": source, "i": i})
+            for i, t in enumerate(texts)]
+
+
+@pytest.fixture
+def store():
+    s = NumpyVectorStore(CountingEmbeddings(), compact_threshold=1.0)   # compact only when asked
+    s.upsert_documents(_docs())
+    s.upsert_documents(_docs("other.txt", ("porch camera motion",)))
+    s._embedding.embedded.clear()
+    return s
+
+
+def _check_id_map(store):
+    for id_, row in store._id_to_row.items():
+        assert store._chunks.id(row) == id_ and store.alive[row]
+    assert len(store._id_to_row) == len(store)
+
+
+def test_unchanged_chunks_are_not_embedded(store):
+    result = store.upsert_documents(_docs())
+    assert (result.unchanged, result.added, result.updated, result.embedded) == (3, 0, 0, 0)
+    assert store._embedding.embedded == [] and len(store) == 4
+
+
+def test_changed_text_is_reembedded(store):
+    docs = _docs()
+    docs[1] = Document(id=docs[1].id, page_content="garage door at 23", metadata=docs[1].metadata)
+    result = store.upsert_documents(docs)
+    assert (result.unchanged, result.updated, result.embedded) == (2, 1, 1)
+    assert store._embedding.embedded == ["garage door at 23"]
+    assert store.get_by_ids(["notes.txt#1"])[0].page_content == "garage door at 23"
+    assert len(store) == 4 and store._n_dead == 1
+    _check_id_map(store)
+
+
+def test_moved_chunk_reuses_vector(store):
+    docs = _docs(texts=("intro", "kitchen light at 7", "garage door at 22", "thermostat 21 at night"))
+    result = store.sync_source("notes.txt", docs)
+    assert result.embedded == 1 and result.reused == 3 and store._embedding.embedded == ["intro"]
+
+
+def test_sync_source_removes_stale_chunks(store):
+    result = store.sync_source("notes.txt", _docs(texts=("kitchen light at 7",)))
+    assert result.deleted == 2 and result.unchanged == 1 and result.embedded == 0
+    assert sorted(d.id for d in store.similarity_search("garage door", k=10)) == ["notes.txt#0", "other.txt#0"]
+    assert store.get_by_ids(["other.txt#0"])        # other sources untouched
+    _check_id_map(store)
+
+
+def test_search_skips_tombstoned_rows(store):
+    assert store.delete(["notes.txt#1"]) is True
+    assert store._n_dead == 1                          # tombstoned, not compacted
+    hits = store.similarity_search_with_score("garage door at 22", k=10)
+    assert "notes.txt#1" not in {d.id for d, _ in hits} and len(hits) == 3
+    many = store.similarity_search_many(["garage door at 22"], k=10)[0]
+    assert "notes.txt#1" not in {d.id for d in many}
+    assert store.delete(["notes.txt#1"]) is False
+
+
+def test_id_map_after_compact_and_reload(store, tmp_path):
+    store.delete(["notes.txt#0", "other.txt#0"])
+    store.upsert_documents(_docs("new.txt", ("hall lamp", "attic fan")))
+    store.compact()
+    assert store._n_dead == 0 and len(store) == 4
+    _check_id_map(store)
+    assert store.get_by_ids(["new.txt#1"])[0].page_content == "attic fan"
+
+    store.save_local(str(tmp_path))
+    loaded = NumpyVectorStore.load_local(str(tmp_path), CountingEmbeddings())
+    _check_id_map(loaded)
+    assert [d.page_content for d in loaded.get_by_ids(["notes.txt#2", "new.txt#0"])] == [
+        "thermostat 21 at night", "hall lamp"]
+    assert loaded.upsert_documents(_docs("new.txt", ("hall lamp", "attic fan"))).embedded == 0
+    assert loaded.similarity_search("attic fan", k=1)[0].id == "new.txt#1"
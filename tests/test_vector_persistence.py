@@ -0,0 +1,99 @@
+# tests/test_vector_persistence.py
+# save_local / load_local of the vector stores over folders written earlier.
+
+import numpy as np
+import pytest
+
+from Embedding import HashEmbeddings
+from VectorDB import IVFVectorStore, NumpyVectorStore, QuantizedVectorStore
+
+EMB = HashEmbeddings(32)
+
+
+def _texts(n, prefix="alpha"):
+    return [f"{prefix} {i}" for i in range(n)]
+
+
+def test_ivf_untrained_save_removes_stale_index(tmp_path):
+    trained = IVFVectorStore.from_texts(_texts(400), EMB, min_train=100)
+    trained.train()
+    trained.save_local(str(tmp_path))
+    assert (tmp_path / "ivf.npz").exists()
+
+    small = IVFVectorStore.from_texts(_texts(30) + ["zebra giraffe unique"], EMB, min_train=100)
+    small.save_local(str(tmp_path))
+    assert not (tmp_path / "ivf.npz").exists()
+
+    loaded = IVFVectorStore.load_local(str(tmp_path), EMB)
+    assert not loaded.is_trained and len(loaded) == 31
+    assert loaded.similarity_search("zebra giraffe unique", k=1)[0].page_content == "zebra giraffe unique"
+
+
+def test_ivf_load_rejects_index_for_other_rows(tmp_path):
+    trained = IVFVectorStore.from_texts(_texts(400), EMB, min_train=100)
+    trained.train()
+    trained.save_local(str(tmp_path / "big"))
+    IVFVectorStore.from_texts(_texts(31), EMB).save_local(str(tmp_path / "small"))
+    (tmp_path / "big" / "ivf.npz").rename(tmp_path / "small" / "ivf.npz")
+    with pytest.raises(ValueError, match="ivf.npz"):
+        IVFVectorStore.load_local(str(tmp_path / "small"), EMB)
+
+
+def test_ivf_trained_round_trip(tmp_path):
+    store = IVFVectorStore.from_texts(_texts(400), EMB, min_train=100)
+    store.train()
+    store.save_local(str(tmp_path))
+    loaded = IVFVectorStore.load_local(str(tmp_path), EMB)
+    assert loaded.is_trained
+    np.testing.assert_array_equal(loaded._assign, store._assign)
+
+
+@pytest.mark.parametrize("codec", ["int8", "pq"])
+def test_quantized_untrained_save_removes_stale_codes(tmp_path, codec):
+    trained = QuantizedVectorStore.from_texts(_texts(400), EMB, codec=codec, pq_m=8, min_train=100)
+    trained.train()
+    trained.save_local(str(tmp_path))
+    assert (tmp_path / "quant.npz").exists()
+
+    small = QuantizedVectorStore.from_texts(_texts(30) + ["zebra giraffe unique"], EMB, codec=codec, pq_m=8,
+                                            min_train=100)
+    small.save_local(str(tmp_path))
+    assert not (tmp_path / "quant.npz").exists()
+
+    loaded = QuantizedVectorStore.load_local(str(tmp_path), EMB, codec=codec, pq_m=8, min_train=100)
+    assert not loaded.is_trained and len(loaded) == 31
+    assert loaded.similarity_search("zebra giraffe unique", k=1)[0].page_content == "zebra giraffe unique"
+
+
+def test_quantized_load_rejects_codes_for_other_rows(tmp_path):
+    trained = QuantizedVectorStore.from_texts(_texts(400), EMB, min_train=100)
+    trained.train()
+    trained.save_local(str(tmp_path / "big"))
+    QuantizedVectorStore.from_texts(_texts(31), EMB).save_local(str(tmp_path / "small"))
+    (tmp_path / "big" / "quant.npz").rename(tmp_path / "small" / "quant.npz")
+    with pytest.raises(ValueError, match="quant.npz"):
+        QuantizedVectorStore.load_local(str(tmp_path / "small"), EMB)
+
+
+def test_quantized_trained_round_trip(tmp_path):
+    store = QuantizedVectorStore.from_texts(_texts(400), EMB, codec="pq", pq_m=8, min_train=100)
+    store.train()
+    store.save_local(str(tmp_path))
+    loaded = QuantizedVectorStore.load_local(str(tmp_path), EMB)
+    assert loaded.is_trained and loaded.codec == "pq"
+    np.testing.assert_array_equal(loaded.codes, store.codes)
+
+
+def test_non_lexical_save_removes_stale_bm25(tmp_path):
+    NumpyVectorStore.from_texts(_texts(20), EMB, lexical=True).save_local(str(tmp_path))
+    assert (tmp_path / "bm25.json").exists()
+    NumpyVectorStore.from_texts(_texts(5, "beta"), EMB).save_local(str(tmp_path))
+    assert not (tmp_path / "bm25.json").exists()
+    loaded = NumpyVectorStore.load_local(str(tmp_path), EMB)
+    assert loaded.bm25 is None and len(loaded) == 5
+
+
+def test_lexical_round_trip(tmp_path):
+    NumpyVectorStore.from_texts(_texts(20) + ["zebra giraffe"], EMB, lexical=True).save_local(str(tmp_path))
+    loaded = NumpyVectorStore.load_local(str(tmp_path), EMB)
+    assert loaded.lexical_search("zebra", k=1)[0][0].page_content == "zebra giraffe"
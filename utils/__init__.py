@@ -1,3 +1,29 @@
 from .pretty_print import print_docs_pretty
+from .documents import (
+    doc_to_dict,
+    doc_from_dict,
+    dump_documents,
+    read_documents,
+    content_hash,
+    chunk_id,
+    assign_chunk_ids,
+)
+from .http_cache import HttpCache, HttpCacheEntry, HttpCacheStats, CachedResponse, CacheMiss
+from . import instrument
 
-__all__ = ["print_docs_pretty"]
+__all__ = [
+    "print_docs_pretty",
+    "doc_to_dict",
+    "doc_from_dict",
+    "dump_documents",
+    "read_documents",
+    "content_hash",
+    "chunk_id",
+    "assign_chunk_ids",
+    "HttpCache",
+    "HttpCacheEntry",
+    "HttpCacheStats",
+    "CachedResponse",
+    "CacheMiss",
+    "instrument",
+]
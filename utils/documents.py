@@ -0,0 +1,77 @@
+# utils/documents.py
+# JSON (de)serialization for LangChain Documents -- no pickle involved --
+# plus stable chunk IDs.
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List
+
+
+def doc_to_dict(doc) -> Dict[str, Any]:
+    """Convert a Document (or anything with page_content/metadata) to a plain dict."""
+    data = {
+        "page_content": getattr(doc, "page_content", None) or "",
+        "metadata": dict(getattr(doc, "metadata", {}) or {}),
+    }
+    if getattr(doc, "id", None):
+        data["id"] = doc.id
+    return data
+
+
+def doc_from_dict(data: Dict[str, Any]):
+    """Rebuild a Document from `doc_to_dict` output."""
+    from langchain_core.documents import Document
+
+    return Document(id=data.get("id"), page_content=data.get("page_content", ""), metadata=data.get("metadata") or {})
+
+
+def content_hash(text: str) -> str:
+    """SHA-1 hex digest of a chunk's text."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def chunk_id(doc) -> str:
+    """
+    Stable chunk ID from source, position (page/row/start_index) and content hash.
+    The same chunk produced by a later run gets the same ID; any edit to its
+    text or a move to another position gives a new one.
+    """
+    meta = getattr(doc, "metadata", {}) or {}
+    key = "\x00".join(
+        str(meta.get(field, ""))
+        for field in ("source", "page", "row", "start_index")
+    )
+    key += "\x00" + content_hash(getattr(doc, "page_content", "") or "")
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def assign_chunk_ids(docs: Iterable) -> List:
+    """Set `doc.id` to `chunk_id(doc)` for every Document (in place) and return them as a list."""
+    out = list(docs)
+    for doc in out:
+        doc.id = chunk_id(doc)
+    return out
+
+
+def dump_documents(docs: Iterable, path: str) -> int:
+    """
+    Write Documents to `path` as JSON Lines (one Document per line).
+    The file is written to a temp name first and swapped in atomically.
+    Returns the number of Documents written.
+    """
+    tmp = f"{path}.tmp"
+    n = 0
+    with open(tmp, "w", encoding="utf-8") as fh:
+        for doc in docs:
+            fh.write(json.dumps(doc_to_dict(doc), ensure_ascii=False, default=str))
+            fh.write("\n")
+            n += 1
+    os.replace(tmp, path)
+    return n
+
+
+def read_documents(path: str) -> List:
+    """Read Documents written by `dump_documents`."""
+    with open(path, "r", encoding="utf-8") as fh:
+        return [doc_from_dict(json.loads(line)) for line in fh if line.strip()]
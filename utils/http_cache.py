@@ -0,0 +1,361 @@
+# utils/http_cache.py
+# On-disk HTTP cache with conditional requests (ETag / Last-Modified).
+#
+# Bodies are stored once per URL; re-fetches send If-None-Match /
+# If-Modified-Since and a 304 reuses the stored body. Anything derived from a
+# body (parsed Documents, split chunks) can be cached next to it, keyed by the
+# body's hash, so an unchanged page is neither downloaded nor re-split.
+
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .documents import dump_documents, read_documents
+
+INDEX_FILE = "index.json"
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL is not in the cache."""
+
+
+@dataclass
+class HttpCacheEntry:
+    url: str
+    body_sha1: str
+    size: int
+    status: int = 200
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+    encoding: Optional[str] = None
+    fetched: float = 0.0      # last time the origin confirmed the body (200 or 304)
+    accessed: float = 0.0     # last time the entry was served (LRU)
+    derived: List[str] = field(default_factory=list)   # derived/*.jsonl built from this body
+
+
+@dataclass
+class HttpCacheStats:
+    fetched: int = 0          # full 200 downloads
+    not_modified: int = 0     # 304s: body served from cache
+    offline_hits: int = 0     # served without contacting the origin
+    derived_hits: int = 0     # cached chunks/Documents reused
+    evictions: int = 0
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    content: bytes
+    status: int
+    encoding: Optional[str] = None
+    content_type: Optional[str] = None
+    body_sha1: str = ""
+    from_cache: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class HttpCache:
+    """
+    Conditional-request HTTP cache for the URL-based loaders and splitters.
+
+        cache = HttpCache(".http_cache", max_bytes=200 << 20, max_age=7 * 86400)
+        resp = cache.get(url)                               # 200 or revalidated 304
+        docs = cache.derive(url, ("html", 1), build_fn)     # chunks reused on 304
+
+    max_bytes : total stored body bytes; least recently used entries are evicted.
+    max_age   : seconds since the origin last confirmed an entry; older entries
+                are dropped and fetched again unconditionally (None = no limit).
+    offline   : never touch the network; serve from cache (regardless of age)
+                or raise CacheMiss.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = ".http_cache",
+        max_bytes: Optional[int] = 256 << 20,
+        max_age: Optional[float] = 30 * 86400.0,
+        offline: bool = False,
+        timeout: float = 20.0,
+        session=None,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.offline = offline
+        self.timeout = timeout
+        self.stats = HttpCacheStats()
+        self._session = session
+        self._lock = threading.RLock()
+        self._index_path = os.path.join(cache_dir, INDEX_FILE)
+        self.entries: Dict[str, HttpCacheEntry] = {}
+        self._dirty = False
+        self._batch_depth = 0
+        os.makedirs(os.path.join(cache_dir, "bodies"), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, "derived"), exist_ok=True)
+        self._read()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def _read(self) -> None:
+        if not os.path.exists(self._index_path):
+            return
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return  # corrupt index -> start empty; stale files are overwritten
+        self.entries = {url: HttpCacheEntry(**e) for url, e in data.items()}
+
+    def save(self) -> None:
+        with self._lock:
+            self._dirty = False
+            tmp = f"{self._index_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({url: asdict(e) for url, e in self.entries.items()}, fh, separators=(",", ":"))
+            os.replace(tmp, self._index_path)
+
+    def _changed(self) -> None:
+        """Persist the index now, or at the end of the enclosing batch()."""
+        self._dirty = True
+        if self._batch_depth == 0:
+            self.save()
+
+    @contextmanager
+    def batch(self) -> Iterator["HttpCache"]:
+        """Defer index writes until the block exits (one write per crawl, not per URL)."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._dirty:
+                    self.save()
+
+    def _body_path(self, body_sha1: str) -> str:
+        return os.path.join(self.cache_dir, "bodies", f"{body_sha1}.body")
+
+    def _derived_path(self, body_sha1: str, key: Hashable) -> str:
+        digest = hashlib.sha1(f"{body_sha1}\x00{key!r}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, "derived", f"{digest}.jsonl")
+
+    # ----------------------------
+    # Fetching
+    # ----------------------------
+    def _http(self):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    def _expired(self, entry: HttpCacheEntry, now: float) -> bool:
+        return self.max_age is not None and now - entry.fetched > self.max_age
+
+    def _from_entry(self, entry: HttpCacheEntry, now: float) -> Optional[CachedResponse]:
+        path = self._body_path(entry.body_sha1)
+        try:
+            with open(path, "rb") as fh:
+                content = fh.read()
+        except OSError:
+            return None
+        entry.accessed = now
+        return CachedResponse(entry.url, content, entry.status, entry.encoding,
+                              entry.content_type, entry.body_sha1, from_cache=True)
+
+    def get(self, url: str, timeout: Optional[float] = None) -> CachedResponse:
+        """
+        GET `url` through the cache. A cached entry is revalidated with a
+        conditional request; on 304 its stored body is returned. Raises for
+        HTTP errors (requests' raise_for_status) and CacheMiss in offline mode.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is not None and not self.offline and self._expired(entry, now):
+                self._drop(url)
+                entry = None
+
+        if self.offline:
+            cached = self._from_entry(entry, now) if entry is not None else None
+            if cached is None:
+                raise CacheMiss(f"Not in HTTP cache (offline mode): {url}")
+            self.stats.offline_hits += 1
+            return cached
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        resp = self._http().get(url, headers=headers, timeout=timeout or self.timeout)
+        if resp.status_code == 304 and entry is not None:
+            cached = self._from_entry(entry, now)
+            if cached is not None:
+                with self._lock:
+                    entry.fetched = now
+                    entry.etag = resp.headers.get("ETag", entry.etag)
+                    entry.last_modified = resp.headers.get("Last-Modified", entry.last_modified)
+                self.stats.not_modified += 1
+                self._changed()
+                return cached
+            # body file vanished: fetch it again unconditionally
+            resp = self._http().get(url, timeout=timeout or self.timeout)
+        resp.raise_for_status()
+        return self._store(url, resp, now)
+
+    def _store(self, url: str, resp, now: float) -> CachedResponse:
+        content = resp.content
+        body_sha1 = hashlib.sha1(content).hexdigest()
+        encoding = resp.encoding or getattr(resp, "apparent_encoding", None)
+        entry = HttpCacheEntry(
+            url=url,
+            body_sha1=body_sha1,
+            size=len(content),
+            status=resp.status_code,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            content_type=resp.headers.get("Content-Type"),
+            encoding=encoding,
+            fetched=now,
+            accessed=now,
+        )
+        path = self._body_path(body_sha1)
+        if not os.path.exists(path):
+            tmp = f"{path}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(content)
+            os.replace(tmp, path)
+        with self._lock:
+            old = self.entries.get(url)
+            self.entries[url] = entry
+            if old is not None:
+                if old.body_sha1 == body_sha1:
+                    entry.derived = old.derived   # same bytes (no validators): keep chunks
+                else:
+                    self._remove_files(old)
+            self.stats.fetched += 1
+            self._enforce_size()
+        self._changed()
+        return CachedResponse(url, content, resp.status_code, encoding,
+                              entry.content_type, body_sha1, from_cache=False)
+
+    # ----------------------------
+    # Derived artifacts (Documents / chunks)
+    # ----------------------------
+    def derive(
+        self,
+        url: str,
+        key: Hashable,
+        build: Callable[[CachedResponse], List[Any]],
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Documents built from `url`'s body by `build(response)`, cached per
+        (body hash, key). `key` must capture every parameter `build` depends on
+        (e.g. splitter settings, and the url itself if it ends up in the
+        Documents): other URLs serving the same bytes share the result. An
+        unchanged body (304, or identical 200) returns the stored Documents
+        without calling `build`.
+        """
+        resp = self.get(url, timeout=timeout)
+        path = self._derived_path(resp.body_sha1, key)
+        docs = None
+        if os.path.exists(path):
+            try:
+                docs = read_documents(path)
+                self.stats.derived_hits += 1
+            except (OSError, ValueError):
+                docs = None
+        if docs is None:
+            docs = build(resp)
+            dump_documents(docs, path)
+        with self._lock:
+            entry = self.entries.get(url)
+            name = os.path.basename(path)
+            if entry is not None and entry.body_sha1 == resp.body_sha1 and name not in entry.derived:
+                entry.derived.append(name)
+                self._changed()
+        return docs
+
+    # ----------------------------
+    # Limits / maintenance
+    # ----------------------------
+    def _remove_files(self, entry: HttpCacheEntry) -> None:
+        """Delete an entry's body and derived files, unless another URL shares the body (and so them)."""
+        derived, entry.derived = entry.derived, []
+        shared = [e for e in self.entries.values() if e is not entry and e.body_sha1 == entry.body_sha1]
+        if shared:
+            for name in derived:            # keep them reachable for cleanup with the survivor
+                if name not in shared[0].derived:
+                    shared[0].derived.append(name)
+            return
+        for name in derived:
+            try:
+                os.remove(os.path.join(self.cache_dir, "derived", name))
+            except OSError:
+                pass
+        try:
+            os.remove(self._body_path(entry.body_sha1))
+        except OSError:
+            pass
+
+    def _drop(self, url: str) -> None:
+        entry = self.entries.pop(url, None)
+        if entry is not None:
+            self._remove_files(entry)
+
+    def _enforce_size(self) -> None:
+        if self.max_bytes is None:
+            return
+        total = sum(e.size for e in self.entries.values())
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self.entries.items(), key=lambda kv: kv[1].accessed):
+            if total <= self.max_bytes or len(self.entries) == 1:
+                break
+            total -= entry.size
+            self._drop(url)
+            self.stats.evictions += 1
+
+    def prune(self) -> int:
+        """Drop entries past max_age and enforce max_bytes. Returns entries removed."""
+        now = time.time()
+        with self._lock:
+            before = len(self.entries)
+            for url in [u for u, e in self.entries.items() if self._expired(e, now)]:
+                self._drop(url)
+            self._enforce_size()
+            removed = before - len(self.entries)
+        self.save()
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached body and derived artifact."""
+        with self._lock:
+            for url in list(self.entries):
+                self._drop(url)
+        self.save()
@@ -0,0 +1,362 @@
+# utils/instrument.py
+# Lightweight pipeline instrumentation: timers, counters, histograms and
+# per-request traces, plus a cProfile / tracemalloc session helper.
+#
+# Disabled by default. While disabled, `timer()` returns a shared no-op
+# context manager and `@timed` functions cost one flag check, so the hooks can
+# stay in hot paths (load_documents, splitters, embedding, vector search).
+#
+#   from utils import instrument
+#   instrument.enable()
+#   with instrument.trace("query") as tr:
+#       with instrument.timer("vector.search"):
+#           ...
+#   print(tr.summary()); print(instrument.report())
+
+from __future__ import annotations
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+import functools
+import inspect
+import json
+import os
+import random
+import threading
+import time
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = False
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_histograms: Dict[str, "Histogram"] = {}
+_current: ContextVar[Optional["Trace"]] = ContextVar("instrument_trace", default=None)
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+# ----------------------------
+# Aggregates
+# ----------------------------
+class Histogram:
+    """count / total / min / max plus a bounded uniform sample for percentiles."""
+
+    __slots__ = ("count", "total", "min", "max", "_sample", "_cap", "_rng")
+
+    def __init__(self, sample_size: int = 4096):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._sample: List[float] = []
+        self._cap = sample_size
+        self._rng = random.Random(0)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._sample) < self._cap:
+            self._sample.append(value)
+        else:   # reservoir sampling keeps the sample uniform over all values
+            j = self._rng.randrange(self.count)
+            if j < self._cap:
+                self._sample[j] = value
+
+    def percentile(self, q: float) -> float:
+        if not self._sample:
+            return 0.0
+        ordered = sorted(self._sample)
+        return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+def count(name: str, n: float = 1) -> None:
+    """Add `n` to counter `name` (no-op while disabled)."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def observe(name: str, value: float) -> None:
+    """Record `value` in histogram `name` (no-op while disabled)."""
+    if not _enabled:
+        return
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(value)
+
+
+def stats() -> Dict[str, Any]:
+    """Aggregate counters and histograms (timers are histograms of seconds)."""
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "histograms": {name: h.summary() for name, h in sorted(_histograms.items())},
+        }
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def report() -> str:
+    """Aggregate stats as a text table, slowest total first (times in ms)."""
+    snap = stats()
+    lines = [f"{'name':<32} {'count':>7} {'total ms':>10} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9}"]
+    rows = sorted(snap["histograms"].items(), key=lambda kv: -kv[1].get("total", 0.0))
+    for name, h in rows:
+        if h["count"]:
+            lines.append(f"{name:<32} {h['count']:>7} {h['total'] * 1e3:>10.2f} {h['mean'] * 1e3:>9.3f} "
+                         f"{h['p50'] * 1e3:>9.3f} {h['p99'] * 1e3:>9.3f}")
+    for name, value in sorted(snap["counters"].items()):
+        lines.append(f"{name:<32} {value:>7g}")
+    return "\n".join(lines)
+
+
+# ----------------------------
+# Traces
+# ----------------------------
+@dataclass
+class Span:
+    name: str
+    start: float       # seconds since the trace started
+    seconds: float
+    depth: int
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Trace:
+    """Timed spans of one request, in the order they finished."""
+    name: str
+    started: float = field(default_factory=time.time)
+    seconds: float = 0.0
+    spans: List[Span] = field(default_factory=list)
+    _t0: float = field(default_factory=time.perf_counter, repr=False)
+    _depth: int = field(default=0, repr=False)
+
+    def by_name(self) -> Dict[str, float]:
+        """Total seconds per span name (inclusive: a span's time includes the spans nested in it)."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.seconds
+        return totals
+
+    def summary(self) -> str:
+        parts = [f"{name}={sec * 1e3:.1f}ms" for name, sec in sorted(self.by_name().items(), key=lambda kv: -kv[1])]
+        return f"[trace {self.name}] {self.seconds * 1e3:.1f}ms  " + "  ".join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "started": self.started,
+            "seconds": self.seconds,
+            "spans": [{"name": s.name, "start": s.start, "seconds": s.seconds, "depth": s.depth, **s.attrs}
+                      for s in self.spans],
+        }
+
+
+@contextmanager
+def trace(name: str = "request") -> Iterator[Optional[Trace]]:
+    """Collect the timers run inside the block into a Trace (None while disabled)."""
+    if not _enabled:
+        yield None
+        return
+    tr = Trace(name)
+    token = _current.set(tr)
+    try:
+        yield tr
+    finally:
+        _current.reset(token)
+        tr.seconds = time.perf_counter() - tr._t0
+        observe(f"trace.{name}", tr.seconds)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+# ----------------------------
+# Timers
+# ----------------------------
+class _Timer:
+    __slots__ = ("name", "attrs", "_start", "_trace")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self) -> "_Timer":
+        self._trace = _current.get()
+        if self._trace is not None:
+            self._trace._depth += 1
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter()
+        seconds = end - self._start
+        observe(self.name, seconds)
+        tr = self._trace
+        if tr is not None:
+            tr._depth -= 1
+            tr.spans.append(Span(self.name, self._start - tr._t0, seconds, tr._depth, self.attrs))
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NOOP = _NoopTimer()
+
+
+def timer(name: str, **attrs: Any):
+    """Context manager timing its block into histogram `name` (and the active trace)."""
+    if not _enabled:
+        return _NOOP
+    return _Timer(name, attrs)
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorator form of `timer`. Generator functions are timed over their whole
+    iteration (time spent inside the generator, not in the consumer).
+    """
+    def decorate(fn: F) -> F:
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def gen_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return (yield from fn(*args, **kwargs))
+                gen = fn(*args, **kwargs)
+                tr = _current.get()
+                first = time.perf_counter()
+                busy = 0.0
+                try:
+                    while True:
+                        start = time.perf_counter()
+                        try:
+                            item = next(gen)
+                        except StopIteration as stop:
+                            return stop.value
+                        finally:
+                            busy += time.perf_counter() - start
+                        yield item
+                finally:
+                    gen.close()
+                    observe(label, busy)
+                    if tr is not None:
+                        tr.spans.append(Span(label, first - tr._t0, busy, tr._depth))
+            return gen_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Timer(label, {}):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+# ----------------------------
+# Export / profiling
+# ----------------------------
+def export_json(path: str, traces: Optional[List[Trace]] = None) -> None:
+    """Write aggregate stats (and optional traces) to `path`."""
+    data: Dict[str, Any] = stats()
+    if traces is not None:
+        data["traces"] = [t.to_dict() for t in traces]
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2)
+
+
+@contextmanager
+def profile_session(out_dir: str = "profiles", memory: bool = True, top: int = 30) -> Iterator[str]:
+    """
+    Profile the block with cProfile (and tracemalloc if `memory`); enables
+    instrumentation for its duration. On exit writes to `out_dir`:
+
+      session.prof            cProfile stats (open with pstats / snakeviz)
+      session_cpu.txt         top functions by cumulative time
+      session_memory.txt      top allocation sites (tracemalloc)
+      session_stats.json      instrument.stats()
+    """
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    os.makedirs(out_dir, exist_ok=True)
+    was_enabled = _enabled
+    enable()
+    if memory:
+        tracemalloc.start()
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield out_dir
+    finally:
+        prof.disable()
+        prof.dump_stats(os.path.join(out_dir, "session.prof"))
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(top)
+        with open(os.path.join(out_dir, "session_cpu.txt"), "w", encoding="utf-8") as fh:
+            fh.write(buf.getvalue())
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(os.path.join(out_dir, "session_memory.txt"), "w", encoding="utf-8") as fh:
+                fh.write(f"current={current / 1e6:.2f}MB peak={peak / 1e6:.2f}MB\n")
+                for stat in snapshot.statistics("lineno")[:top]:
+                    fh.write(f"{stat}\n")
+        export_json(os.path.join(out_dir, "session_stats.json"))
+        if not was_enabled:
+            disable()
@@ -0,0 +1,36 @@
+# utils/lazy.py
+# PEP 562 lazy package attributes: a package lists which module provides each
+# public name, and the module is imported on first attribute access.
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
+
+import importlib
+
+
+def lazy_exports(
+    package: str,
+    namespace: Dict[str, Any],
+    modules: Mapping[str, Iterable[str]],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build a module-level (__getattr__, __dir__) pair.
+
+    `modules` maps a module name (relative ".loader" or absolute) to the public
+    names it provides. A resolved name is stored in `namespace` (the package's
+    globals()), so later lookups are plain attribute access.
+    """
+    where = {name: mod for mod, names in modules.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        mod = where.get(name)
+        if mod is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(mod, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(where))
+
+    return __getattr__, __dir__
@@ -1,6 +1,9 @@
 # utils/pretty_print.py
 from typing import Iterable
 
+from .instrument import timed
+
+@timed("print.docs_pretty")
 def print_docs_pretty(docs: Iterable, show_source: bool = True) -> None:
     """
     Nicely print LangChain Document objects line by line.